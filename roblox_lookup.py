@@ -1,24 +1,5575 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
-import requests
-from PIL import Image
-try:
-    from PIL import ImageTk
-    IMAGETK_AVAILABLE = True
-except ImportError:
-    ImageTk = None
-    IMAGETK_AVAILABLE = False
+import importlib
+import json
+import codecs
+import base64
+import gzip
 from io import BytesIO
-from datetime import datetime
+from collections import OrderedDict, deque
+from array import array
+import bisect
+import contextlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
 import threading
+import queue
 import re
-import webbrowser
-from difflib import SequenceMatcher
+import sys
+import os
+import zlib
+import math
+from urllib.parse import quote, unquote, urlsplit, parse_qs
+
+
+class _LazyModule:
+    """Stand-in for a module that is only imported on first attribute access"""
+    # (module name, seconds spent importing) for every lazy module loaded so far
+    load_times = []
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            _LazyModule.load_times.append((self._name, time.perf_counter() - started))
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+# Heavy modules are imported the first time they are actually used
+requests = _LazyModule('requests')
+Image = _LazyModule('PIL.Image')
+difflib = _LazyModule('difflib')
+webbrowser = _LazyModule('webbrowser')
+futures = _LazyModule('concurrent.futures')
+sqlite3 = _LazyModule('sqlite3')
+multiprocessing = _LazyModule('multiprocessing')
+_imagetk_module = None
+
+
+def _load_imagetk():
+    """Import PIL.ImageTk on demand, returns None if it is not available"""
+    global _imagetk_module
+    if _imagetk_module is None:
+        try:
+            _imagetk_module = _LazyModule('PIL.ImageTk')._load()
+        except ImportError:
+            _imagetk_module = False
+    return _imagetk_module or None
+
+
+class StartupTimer:
+    """Records how long it takes from import until the window is interactive"""
+    def __init__(self, origin):
+        self.origin = origin
+        self.marks = []
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+
+    def report(self):
+        """Return a human readable startup timing report"""
+        lines = ["Startup timing (ms since import):"]
+        previous = self.origin
+        for label, stamp in self.marks:
+            lines.append(f"  {label:<28}{(stamp - self.origin) * 1000:8.1f}  (+{(stamp - previous) * 1000:.1f})")
+            previous = stamp
+        if _LazyModule.load_times:
+            lines.append("Lazy imports:")
+            for name, seconds in _LazyModule.load_times:
+                lines.append(f"  {name:<28}{seconds * 1000:8.1f}")
+        return "\n".join(lines)
+
+    def summary_line(self):
+        """Return a single CSV line (timestamp, then ms per mark) for tracking over time"""
+        fields = [datetime.now().isoformat(timespec='seconds')]
+        fields.extend(f"{label}={(stamp - self.origin) * 1000:.1f}" for label, stamp in self.marks)
+        return ",".join(fields)
+
+
+class ApiError(Exception):
+    """Raised for HTTP error responses from the Roblox API"""
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class DeadlineExceeded(ApiError):
+    """Raised instead of sending a request once the lookup's time budget is used up"""
+
+
+class CircuitOpenError(ApiError):
+    """Raised without sending a request while an endpoint's circuit breaker is open"""
+    def __init__(self, message, endpoint):
+        super().__init__(message)
+        self.endpoint = endpoint
+
+
+class TransportError(ApiError):
+    """A request failed below the HTTP level (replayed connection errors, missing recordings)"""
+
+
+class ConnectionFailed(TransportError):
+    """The Roblox API could not be reached at all (no network, DNS failure, connection refused)"""
+
+
+class OfflineError(TransportError):
+    """Raised without sending a request while the Roblox API is known to be unreachable"""
+
+
+class Deadline:
+    """Total time budget for one lookup, shared by all of its stages"""
+    def __init__(self, seconds, expires_at=None, parent=None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if expires_at is None else expires_at
+        self.parent = parent
+    
+    def remaining(self):
+        remaining = max(0.0, self.expires_at - time.monotonic())
+        if self.parent is not None:
+            remaining = min(remaining, self.parent.remaining())
+        return remaining
+    
+    def expired(self):
+        return self.remaining() <= 0
+    
+    def cancel(self):
+        """Use up the budget now, including every share of it, so no further requests are sent"""
+        self.expires_at = time.monotonic()
+    
+    def share(self, fraction):
+        """Return a sub-deadline that may use at most fraction of the remaining budget"""
+        seconds = self.remaining() * fraction
+        return Deadline(seconds, expires_at=min(self.expires_at, time.monotonic() + seconds), parent=self)
+
+
+# JSON libraries tried in order when the decoder is 'auto'; the standard library is always available
+JSON_DECODERS = ('orjson', 'ujson', 'json')
+
+
+class JsonDecoder:
+    """Decodes response bodies with the fastest JSON library installed.
+    
+    The library is picked on first use so choosing it doesn't slow down startup.
+    """
+    def __init__(self, preferred='auto'):
+        self.preferred = preferred
+        self._name = None
+        self._loads = None
+    
+    def use(self, preferred):
+        """Switch to a named library ('auto' picks the fastest installed one)"""
+        self.preferred = preferred
+        self._name = None
+        self._loads = None
+    
+    def _select(self):
+        candidates = JSON_DECODERS if self.preferred == 'auto' else (self.preferred,)
+        for name in candidates:
+            try:
+                module = importlib.import_module(name)
+            except ImportError:
+                if self.preferred != 'auto':
+                    raise
+                continue
+            self._loads = module.loads
+            self._name = name
+            return
+    
+    @property
+    def name(self):
+        if self._loads is None:
+            self._select()
+        return self._name
+    
+    def loads(self, data):
+        if self._loads is None:
+            self._select()
+        return self._loads(data)
+
+
+json_decoder = JsonDecoder()
+_raw_decoder = json.JSONDecoder()
+
+
+class JsonArrayStream:
+    """Yields the items of one top-level array of a JSON object while the body is still arriving.
+    
+    Other top-level fields (such as nextPageCursor) are collected in fields as they
+    are passed over, so read them once iteration has finished. Items are decoded with
+    the standard library, which is the only one that can decode part of a buffer.
+    """
+    def __init__(self, chunks, key='data'):
+        self.key = key
+        self.fields = {}
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+    
+    def _fill(self):
+        """Read the next chunk into the buffer; False once the body has ended"""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buffer += self._text.decode(b'', final=True)
+            return False
+        # Only the unparsed tail is kept
+        self._buffer = self._buffer[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return True
+    
+    def _peek(self):
+        """Skip whitespace and return the next character, or '' at the end of the body"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+    
+    def _expect(self, chars):
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, got {char or 'end of body'!r}")
+        self._pos += 1
+        return char
+    
+    def _value(self):
+        """Decode the next complete JSON value, reading more chunks until it is complete"""
+        while True:
+            self._peek()
+            try:
+                value, end = _raw_decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut off by the end of the buffer (like "12" or "1.") may continue in the next chunk
+            if (isinstance(value, (int, float)) and (end == len(self._buffer) or self._buffer[end] in '.eE')
+                    and self._fill()):
+                continue
+            self._pos = end
+            return value
+    
+    def __iter__(self):
+        try:
+            self._expect('{')
+            if self._peek() == '}':
+                return
+            while True:
+                name = self._value()
+                self._expect(':')
+                if name == self.key and self._peek() == '[':
+                    self._pos += 1
+                    if self._peek() == ']':
+                        self._pos += 1
+                    else:
+                        while True:
+                            yield self._value()
+                            if self._expect(',]') == ']':
+                                break
+                else:
+                    self.fields[name] = self._value()
+                if self._expect(',}') == '}':
+                    break
+        finally:
+            self.close()
+    
+    def close(self):
+        """Stop reading the body; a streamed network response releases its connection"""
+        close = getattr(self._chunks, 'close', None)
+        if close:
+            close()
+
+
+class ApiResponse:
+    """Minimal response object returned by RobloxApiClient.
+    
+    A streamed response has no content until its chunks have been read; iter_items
+    parses a list endpoint's items while they download.
+    """
+    __slots__ = ('url', 'status_code', 'headers', '_content', '_chunks', 'from_cache')
+    
+    def __init__(self, url, status_code, headers, content, from_cache=False, chunks=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self._content = content
+        self._chunks = chunks
+        self.from_cache = from_cache
+    
+    @property
+    def content(self):
+        if self._chunks is not None:
+            for _ in self.iter_chunks():
+                pass
+        return self._content
+    
+    def iter_chunks(self, chunk_size=65536):
+        """Yield the body in chunks, straight off the network for a streamed response"""
+        if self._chunks is None:
+            for start in range(0, len(self._content), chunk_size):
+                yield self._content[start:start + chunk_size]
+            return
+        chunks, self._chunks = self._chunks, None
+        received = []
+        try:
+            for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+            # Only what was read before the caller stopped
+            self._content = b''.join(received)
+    
+    def iter_items(self, key='data'):
+        """Stream the items of the body's top-level key array"""
+        return JsonArrayStream(self.iter_chunks(), key)
+    
+    def json(self):
+        return json_decoder.loads(self.content)
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ApiError(f"HTTP {self.status_code} for {self.url}", self.status_code)
+
+
+class HttpTransport:
+    """Sends requests over one pooled requests.Session"""
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock()
+    
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                self._session.mount("https://", adapter)
+            return self._session
+    
+    def request(self, method, url, params=None, json=None, headers=None, timeout=10, stream=False):
+        try:
+            raw = self.session.request(method, url, params=params, json=json, headers=headers, timeout=timeout,
+                                       stream=stream)
+        except requests.ConnectionError as e:
+            # Includes connect timeouts; a read timeout means the server was reached, so it is left as is
+            raise ConnectionFailed(f"Could not reach {urlsplit(url).netloc}: {e}") from e
+        if stream and raw.status_code == 200:
+            return ApiResponse(url, raw.status_code, dict(raw.headers), None, chunks=self._iter_body(raw))
+        # Error bodies are small, so they are always read straight away
+        return ApiResponse(url, raw.status_code, dict(raw.headers), raw.content)
+    
+    @staticmethod
+    def _iter_body(raw, chunk_size=65536):
+        try:
+            yield from raw.iter_content(chunk_size)
+        finally:
+            raw.close()
+    
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+CASSETTE_VERSION = 1
+# Response headers kept in cassettes; the rest are dropped to keep them compact
+CASSETTE_HEADERS = ('ETag', 'Last-Modified', 'Content-Type')
+
+
+def _cassette_key(method, url, params, body):
+    """Key that identifies a request in a cassette"""
+    return json.dumps([method, url, sorted((params or {}).items()), body],
+                      sort_keys=True, separators=(',', ':'), default=str)
+
+
+class RecordingTransport:
+    """Passes requests to another transport and records every exchange to a cassette.
+    
+    A cassette is gzipped NDJSON: a header line, then one line per request with the
+    method, URL, params, JSON body, status, a few headers, the body and the latency.
+    """
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._file.write(json.dumps({'cassette': CASSETTE_VERSION,
+                                     'recorded': datetime.now().isoformat(timespec='seconds')}) + "\n")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+    
+    def request(self, method, url, params=None, json=None, headers=None, timeout=10, stream=False):
+        # Streamed bodies are read in full here so they can be recorded
+        entry = {'method': method, 'url': url, 'params': params, 'body': json,
+                 'at': round(time.monotonic() - self._started, 4)}
+        started = time.perf_counter()
+        try:
+            response = self.inner.request(method, url, params=params, json=json, headers=headers, timeout=timeout,
+                                          stream=stream)
+        except Exception as e:
+            entry['latency'] = round(time.perf_counter() - started, 4)
+            entry['error'] = f"{type(e).__name__}: {e}"
+            self._write(entry)
+            raise
+        entry['latency'] = round(time.perf_counter() - started, 4)
+        entry['status'] = response.status_code
+        entry['headers'] = {k: v for k, v in response.headers.items() if k in CASSETTE_HEADERS}
+        try:
+            entry['text'] = response.content.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['b64'] = base64.b64encode(response.content).decode('ascii')
+        self._write(entry)
+        return response
+    
+    def _write(self, entry):
+        line = json.dumps(entry, separators=(',', ':'))
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self.inner.close()
+
+
+class ReplayTransport:
+    """Answers requests from a cassette instead of the network.
+    
+    Repeated requests are answered in recorded order; once a request's recordings
+    run out, the last one is reused. speed scales the recorded latencies (1.0 is
+    the original timing, 2.0 twice as fast); None replays as fast as possible.
+    """
+    def __init__(self, path, speed=None):
+        self.path = path
+        self.speed = speed
+        self._queues = {}
+        self._last = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with gzip.open(path, 'rt', encoding='utf-8') as cassette:
+            header = json.loads(cassette.readline())
+            if header.get('cassette') != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette format in {path}")
+            for line in cassette:
+                entry = json.loads(line)
+                key = _cassette_key(entry['method'], entry['url'], entry['params'], entry['body'])
+                self._queues.setdefault(key, deque()).append(entry)
+                self._last[key] = entry
+    
+    def request(self, method, url, params=None, json=None, headers=None, timeout=10, stream=False):
+        key = _cassette_key(method, url, params, json)
+        with self._lock:
+            queue = self._queues.get(key)
+            entry = queue.popleft() if queue else self._last.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if entry is None:
+            raise TransportError(f"No recorded response for {method} {url}")
+        if self.speed:
+            delay = entry['latency'] / self.speed
+            if delay > timeout:
+                time.sleep(timeout)
+                raise TransportError(f"Replayed timeout for {method} {url}")
+            time.sleep(delay)
+        if 'error' in entry:
+            raise TransportError(f"Replayed error: {entry['error']}")
+        content = base64.b64decode(entry['b64']) if 'b64' in entry else entry['text'].encode('utf-8')
+        return ApiResponse(url, entry['status'], dict(entry['headers']), content)
+    
+    def close(self):
+        pass
+
+
+class DiskCache:
+    """GET responses kept in a SQLite file that several processes can share.
+    
+    Each thread gets its own connection; WAL mode lets readers carry on while
+    another process writes.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, status INTEGER, "
+            "headers TEXT, content BLOB, fetched_at REAL)")
+    
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+    
+    def get(self, key):
+        """Return (status, headers, content, fetched_at) or None"""
+        row = self._connection().execute(
+            "SELECT status, headers, content, fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), bytes(row[2]), row[3]
+    
+    def put(self, key, status, headers, content):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, status, json.dumps(headers), content, time.time()))
+    
+    def touch(self, key):
+        """Mark a response as fetched just now (it was revalidated)"""
+        self._connection().execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+    
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class CachingTransport:
+    """Answers GETs from a DiskCache while they are younger than max_age seconds.
+    
+    Older entries are revalidated with their ETag/Last-Modified, and fresh 200
+    responses are stored. Bodies are read in full so they can be cached.
+    """
+    def __init__(self, inner, cache, max_age=6 * 3600):
+        self.inner = inner
+        self.cache = cache
+        self.max_age = max_age
+        self.hits = 0
+        self.requests = 0
+    
+    def request(self, method, url, params=None, json=None, headers=None, timeout=10, stream=False):
+        if method != 'GET':
+            self.requests += 1
+            return self.inner.request(method, url, params=params, json=json, headers=headers, timeout=timeout)
+        key = _cassette_key(method, url, params, None)
+        cached = self.cache.get(key)
+        if cached and time.time() - cached[3] < self.max_age:
+            self.hits += 1
+            return ApiResponse(url, cached[0], cached[1], cached[2], from_cache=True)
+        
+        headers = dict(headers or {})
+        if cached:
+            if cached[1].get('ETag'):
+                headers.setdefault('If-None-Match', cached[1]['ETag'])
+            if cached[1].get('Last-Modified'):
+                headers.setdefault('If-Modified-Since', cached[1]['Last-Modified'])
+        self.requests += 1
+        response = self.inner.request(method, url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and cached:
+            self.cache.touch(key)
+            return ApiResponse(url, cached[0], cached[1], cached[2], from_cache=True)
+        if response.status_code == 200:
+            self.cache.put(key, 200, {k: v for k, v in response.headers.items() if k in CASSETTE_HEADERS},
+                           response.content)
+        return response
+    
+    def close(self):
+        self.cache.close()
+        self.inner.close()
+
+
+# Latency samples kept per endpoint, and how many are needed before timeouts adapt
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+# Adaptive timeout is the endpoint's p99 latency times this factor, but never below the minimum
+ADAPTIVE_TIMEOUT_FACTOR = 3.0
+MIN_ADAPTIVE_TIMEOUT = 1.0
+
+
+def _endpoint_template(url):
+    """Group URLs by endpoint: host and path with IDs, GUIDs and hashes replaced by {id}"""
+    host_path = url.split('?', 1)[0].split('://', 1)[-1]
+    return re.sub(r'/(\d+|[0-9a-fA-F-]{16,})(?=/|$)', '/{id}', host_path)
+
+
+class LatencyTracker:
+    """Rolling latency distribution for one endpoint"""
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+            self.requests += 1
+    
+    def record_failure(self, seconds, timeout):
+        """Count a failed attempt that ran into its timeout as taking that long; quick errors say nothing of latency"""
+        if seconds >= timeout * 0.9:
+            self.record(min(seconds, timeout))
+    
+    def percentile(self, percent):
+        """Return the given latency percentile, or None until there are enough samples"""
+        with self._lock:
+            if len(self.samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+    
+    def timeout(self, default):
+        """Timeout derived from the p99 latency, capped by the call site's default"""
+        p99 = self.percentile(99)
+        if p99 is None:
+            return default
+        return min(default, max(MIN_ADAPTIVE_TIMEOUT, p99 * ADAPTIVE_TIMEOUT_FACTOR))
+
+
+# Consecutive failures that open an endpoint's circuit, and how long it then stays open
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 30.0
+# Trial requests let through while half-open; a success closes the circuit again
+CIRCUIT_HALF_OPEN_TRIALS = 1
+# Besides network errors and 5xx, "not found"/"not allowed" count as endpoint failures, but only
+# on endpoints without an ID in the path; on users/{id} they just mean that user doesn't exist
+CIRCUIT_MISSING_ENDPOINT_STATUSES = {404, 405}
+# A 429 isn't a failure but backpressure: the rate limiter pauses for the response's Retry-After
+# (or this many seconds), capped at RATE_LIMIT_MAX_BACKOFF
+RATE_LIMIT_BACKOFF = 1.0
+RATE_LIMIT_MAX_BACKOFF = 30.0
+
+# When a request can't connect, one probe to another Roblox host checks whether the network
+# is down or just that host. If the probe can't connect either, every request fails at once
+# (callers fall back to saved data) while a background probe checks every few seconds
+# whether Roblox is reachable again.
+OFFLINE_PROBE_INTERVAL = 5.0
+OFFLINE_PROBE_URLS = ("https://users.roblox.com/v1/users/1", "https://friends.roblox.com/v1/users/1/friends/count")
+OFFLINE_PROBE_TIMEOUT = 3.0
+
+
+class CircuitBreaker:
+    """Fails fast for an endpoint that keeps failing, then probes it again after a cool-down"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+    
+    def __init__(self, threshold=CIRCUIT_FAILURE_THRESHOLD, cooldown=CIRCUIT_COOLDOWN,
+                 half_open_trials=CIRCUIT_HALF_OPEN_TRIALS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.half_open_trials = half_open_trials
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trials = 0
+        self._lock = threading.Lock()
+    
+    def allow(self):
+        """Return True if a request may be sent now"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self.trials = 0
+            if self.state == self.HALF_OPEN:
+                if self.trials >= self.half_open_trials:
+                    return False
+                self.trials += 1
+            return True
+    
+    def release(self):
+        """Give back a half-open trial that was allowed but never sent"""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self.trials > 0:
+                self.trials -= 1
+    
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trials = 0
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.trials = 0
+
+
+def _is_endpoint_failure(status_code, url):
+    if status_code >= 500:
+        return True
+    return status_code in CIRCUIT_MISSING_ENDPOINT_STATUSES and '{id}' not in _endpoint_template(url)
+
+
+class RateLimiter:
+    """Token bucket shared by every request a client sends: rate requests per second, bursts up to burst"""
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self, now):
+        """Take a token if there is one; returns 0, or how long until the next one"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+    
+    def acquire(self, timeout=None):
+        """Take one token, waiting at most timeout seconds; False if none became available in time"""
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            wait = self._take(now)
+            if not wait:
+                return True
+            if give_up is not None and now + wait > give_up:
+                return False
+            time.sleep(wait)
+    
+    def back_off(self, seconds):
+        """Hand out no tokens for the next seconds, as the server asked"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._updated) * self.rate, -seconds * self.rate)
+            self._updated = now
+
+
+class SharedRateLimiter(RateLimiter):
+    """Token bucket in shared memory, so every worker process draws from one global budget.
+    
+    Create it before starting the processes and pass it to them.
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        # [tokens, last update]; time.monotonic() is the same clock in every process
+        self._state = multiprocessing.Array('d', [float(self.burst), time.monotonic()])
+    
+    def _take(self, now):
+        state = self._state
+        with state.get_lock():
+            # Another process may have stamped a slightly later time than this one read
+            tokens = min(self.burst, state[0] + max(0.0, now - state[1]) * self.rate)
+            state[1] = max(state[1], now)
+            if tokens >= 1:
+                state[0] = tokens - 1
+                return 0
+            state[0] = tokens
+            return (1 - tokens) / self.rate
+    
+    def back_off(self, seconds):
+        state = self._state
+        with state.get_lock():
+            now = time.monotonic()
+            tokens = min(self.burst, state[0] + max(0.0, now - state[1]) * self.rate)
+            state[0] = min(tokens, -seconds * self.rate)
+            state[1] = max(state[1], now)
+
+
+class RobloxApiClient:
+    """Shared HTTP client for all Roblox API calls.
+    
+    Requests go through a transport (the network, or a cassette recorder/player).
+    The client keeps one connection pool and remembers ETag/Last-Modified validators for GET
+    responses, so repeated requests for unchanged resources are answered with a
+    304 and served from the local copy.
+    
+    Latency is tracked per endpoint template. Timeouts follow each endpoint's p99,
+    and a GET still running after the endpoint's p95 gets a hedged duplicate; the
+    first response wins and the other one is discarded. Each endpoint also has a
+    circuit breaker, so an endpoint that keeps failing is skipped immediately
+    instead of waiting out its timeout on every call. When a request fails to
+    connect at all and a probe to another host can't connect either, the client
+    is offline: every request raises OfflineError at once until a background
+    probe reaches Roblox again. An optional rate limiter
+    caps how many requests per second the client sends in total.
+    """
+    def __init__(self, transport=None, max_cached=2048, hedging=True, rate_limiter=None):
+        self.transport = transport or HttpTransport()
+        self.rate_limiter = rate_limiter
+        self._validators = OrderedDict()  # cache key -> (etag, last_modified, headers, content)
+        self._validators_lock = threading.Lock()
+        self.max_cached = max_cached
+        self._local = threading.local()
+        self.hedging = hedging
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
+        self._trackers = {}
+        self._breakers = {}
+        self._trackers_lock = threading.Lock()
+        self.offline_since = None  # epoch seconds of going offline, None while online
+        self._confirm_lock = threading.Lock()  # held while probing whether a connection failure means offline
+        self._probe = None
+        self._offline_lock = threading.Lock()
+    
+    @property
+    def online(self):
+        return self.offline_since is None
+    
+    def _check_online(self, url):
+        if self.offline_since is not None:
+            raise OfflineError(f"Roblox is unreachable; not requesting {url}")
+    
+    def _connect_failed(self, url):
+        """A request couldn't connect; go offline if a probe to another host can't connect either"""
+        # Concurrent failures wait for nothing: the probe already running decides for all of them
+        if self.offline_since is not None or not self._confirm_lock.acquire(blocking=False):
+            return
+        try:
+            host = urlsplit(url).netloc
+            probe_url = next(probe for probe in OFFLINE_PROBE_URLS if urlsplit(probe).netloc != host)
+            timeout = OFFLINE_PROBE_TIMEOUT
+            deadline = self.current_deadline()
+            if deadline is not None:
+                timeout = max(0.05, min(timeout, deadline.remaining()))
+            try:
+                self.transport.request('GET', probe_url, timeout=timeout)
+            except ConnectionFailed:
+                self._went_offline()
+            except Exception:
+                # The probe reached something (a read timeout, say), so the network isn't down
+                pass
+        finally:
+            self._confirm_lock.release()
+    
+    def _went_offline(self):
+        """Fail requests fast from now on, and start probing for the network to come back"""
+        with self._offline_lock:
+            if self.offline_since is None:
+                self.offline_since = time.time()
+            if self._probe is None:
+                self._probe = threading.Thread(target=self._probe_until_online, daemon=True, name="offline-probe")
+                self._probe.start()
+    
+    def _probe_until_online(self):
+        while True:
+            time.sleep(OFFLINE_PROBE_INTERVAL)
+            try:
+                self.transport.request('GET', OFFLINE_PROBE_URLS[0], timeout=OFFLINE_PROBE_TIMEOUT)
+            except Exception:
+                continue
+            # Any answer, even an error status, means Roblox can be reached again
+            with self._offline_lock:
+                self.offline_since = None
+                self._probe = None
+            return
+    
+    def breaker(self, url):
+        """Return the circuit breaker for the endpoint a URL belongs to"""
+        template = _endpoint_template(url)
+        with self._trackers_lock:
+            breaker = self._breakers.get(template)
+            if breaker is None:
+                breaker = self._breakers[template] = CircuitBreaker()
+            return breaker
+    
+    @contextmanager
+    def circuit_log(self):
+        """Collect the endpoints this thread skipped because their circuit was open"""
+        previous = getattr(self._local, 'rejected', None)
+        rejected = self._local.rejected = []
+        try:
+            yield rejected
+        finally:
+            self._local.rejected = previous
+    
+    def _check_circuit(self, url):
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            endpoint = _endpoint_template(url)
+            rejected = getattr(self._local, 'rejected', None)
+            if rejected is not None:
+                rejected.append(endpoint)
+            raise CircuitOpenError(f"Circuit open for {endpoint}", endpoint)
+        return breaker
+    
+    def _record_outcome(self, breaker, url, response=None):
+        """Tell the endpoint's breaker how a request went; response is None if it failed to complete"""
+        if response is None or _is_endpoint_failure(response.status_code, url):
+            breaker.record_failure()
+        elif response.status_code == 429:
+            # Too many requests says nothing about the endpoint's health; slow every request down instead
+            breaker.release()
+            self._back_off(response)
+        else:
+            breaker.record_success()
+    
+    def _back_off(self, response):
+        if self.rate_limiter is None:
+            return
+        try:
+            seconds = float(response.headers.get('Retry-After', RATE_LIMIT_BACKOFF))
+        except (TypeError, ValueError):
+            seconds = RATE_LIMIT_BACKOFF  # an HTTP date; not worth parsing
+        self.rate_limiter.back_off(min(max(seconds, 0.0), RATE_LIMIT_MAX_BACKOFF))
+    
+    def tracker(self, url):
+        """Return the latency tracker for the endpoint a URL belongs to"""
+        template = _endpoint_template(url)
+        with self._trackers_lock:
+            tracker = self._trackers.get(template)
+            if tracker is None:
+                tracker = self._trackers[template] = LatencyTracker()
+            return tracker
+    
+    def latency_report(self):
+        """Return per-endpoint latency percentiles and hedging counts as text"""
+        lines = [f"{'endpoint':<60}{'n':>6}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'hedged':>8}{'won':>6}"
+                 f"  circuit"]
+        with self._trackers_lock:
+            trackers = sorted(self._trackers.items())
+            breakers = dict(self._breakers)
+        for template, tracker in trackers:
+            with tracker._lock:
+                ordered = sorted(tracker.samples)
+            if not ordered:
+                continue
+            p50, p95, p99 = (ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in (50, 95, 99))
+            lines.append(f"{template:<60}{tracker.requests:>6}{p50 * 1000:>8.0f}{p95 * 1000:>8.0f}"
+                         f"{p99 * 1000:>8.0f}{tracker.hedges:>8}{tracker.hedge_wins:>6}"
+                         f"  {breakers[template].state if template in breakers else '-'}")
+        return "\n".join(lines)
+    
+    @contextmanager
+    def deadline(self, deadline):
+        """Cap the timeouts of all requests made by this thread to the given deadline"""
+        previous = getattr(self._local, 'deadline', None)
+        self._local.deadline = deadline
+        try:
+            yield deadline
+        finally:
+            self._local.deadline = previous
+    
+    def current_deadline(self):
+        return getattr(self._local, 'deadline', None)
+    
+    def _timeout(self, timeout, url):
+        deadline = self.current_deadline()
+        if deadline is None:
+            return timeout
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Lookup deadline exceeded before requesting {url}")
+        return min(timeout, remaining)
+    
+    def _acquire_rate(self, url, timeout):
+        """Wait for the rate limiter, but no longer than the request itself could take"""
+        if self.rate_limiter is None:
+            return
+        deadline = self.current_deadline()
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        if not self.rate_limiter.acquire(timeout):
+            raise ApiError(f"Rate limit: no request budget left for {url} within {timeout:.1f}s", 429)
+    
+    def _admit(self, url, timeout):
+        """Pass a request through the circuit breaker and then the rate limiter; returns (tracker, breaker, timeout)"""
+        self._check_online(url)
+        tracker = self.tracker(url)
+        # The circuit comes first, so a request it rejects spends no rate-limit budget
+        breaker = self._check_circuit(url)
+        try:
+            self._acquire_rate(url, tracker.timeout(timeout))
+            timeout = self._timeout(tracker.timeout(timeout), url)
+        except Exception:
+            breaker.release()
+            raise
+        return tracker, breaker, timeout
+    
+    @staticmethod
+    def _cache_key(url, params):
+        if not params:
+            return url
+        return url + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    
+    def get(self, url, params=None, timeout=10, conditional=True, stream=False):
+        """GET a URL, revalidating a previously seen response when the server supports it.
+        
+        A streamed GET is never revalidated or hedged, since its body is read by the caller.
+        """
+        if stream:
+            conditional = False
+        key = self._cache_key(url, params)
+        headers = {}
+        cached = None
+        if conditional:
+            with self._validators_lock:
+                cached = self._validators.get(key)
+                if cached:
+                    self._validators.move_to_end(key)
+            if cached:
+                etag, last_modified = cached[0], cached[1]
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+        
+        tracker, breaker, timeout = self._admit(url, timeout)
+        try:
+            raw = self._send_get(url, params, headers, timeout, tracker, stream)
+        except Exception as e:
+            self._record_outcome(breaker, url)
+            if isinstance(e, ConnectionFailed):
+                self._connect_failed(url)
+            raise
+        self._record_outcome(breaker, url, raw)
+        if raw.status_code == 304 and cached:
+            return ApiResponse(url, 200, cached[2], cached[3], from_cache=True)
+        
+        response = raw
+        if conditional and raw.status_code == 200:
+            etag = raw.headers.get('ETag')
+            last_modified = raw.headers.get('Last-Modified')
+            if etag or last_modified:
+                with self._validators_lock:
+                    self._validators[key] = (etag, last_modified, response.headers, response.content)
+                    self._validators.move_to_end(key)
+                    while len(self._validators) > self.max_cached:
+                        self._validators.popitem(last=False)
+        return response
+    
+    def post(self, url, json=None, timeout=10):
+        tracker, breaker, timeout = self._admit(url, timeout)
+        started = time.perf_counter()
+        try:
+            raw = self.transport.request('POST', url, json=json, timeout=timeout)
+        except Exception as e:
+            tracker.record_failure(time.perf_counter() - started, timeout)
+            self._record_outcome(breaker, url)
+            if isinstance(e, ConnectionFailed):
+                self._connect_failed(url)
+            raise
+        tracker.record(time.perf_counter() - started)
+        self._record_outcome(breaker, url, raw)
+        return raw
+    
+    def _timed_get(self, tracker, url, params, headers, timeout, stream=False):
+        started = time.perf_counter()
+        try:
+            raw = self.transport.request('GET', url, params=params, headers=headers, timeout=timeout, stream=stream)
+        except Exception:
+            # Timeouts count too, or the p95/p99 would only drop as the endpoint slows down
+            tracker.record_failure(time.perf_counter() - started, timeout)
+            raise
+        tracker.record(time.perf_counter() - started)
+        return raw
+    
+    def _send_get(self, url, params, headers, timeout, tracker, stream=False):
+        """Send a GET, hedging it with a duplicate once it runs past the endpoint's p95"""
+        hedge_after = tracker.percentile(95) if self.hedging and not stream else None
+        if hedge_after is None or hedge_after >= timeout:
+            return self._timed_get(tracker, url, params, headers, timeout, stream)
+        
+        if self._hedge_executor is None:
+            with self._hedge_lock:
+                if self._hedge_executor is None:
+                    # Sized for the requests of several lookups running at once, plus their duplicates
+                    self._hedge_executor = futures.ThreadPoolExecutor(max_workers=64, thread_name_prefix="hedge")
+        primary = self._hedge_executor.submit(self._timed_get, tracker, url, params, headers, timeout)
+        done, _ = futures.wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+        if self.rate_limiter is not None and not self.rate_limiter.acquire(0):
+            # No spare budget for a duplicate; keep waiting on the original
+            return primary.result()
+        
+        with tracker._lock:
+            tracker.hedges += 1
+        backup = self._hedge_executor.submit(self._timed_get, tracker, url, params, headers,
+                                             max(0.1, timeout - hedge_after))
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with tracker._lock:
+                            tracker.hedge_wins += 1
+                    # The slower request can't be aborted mid-flight; its response is just dropped
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                error = future.exception()
+        raise error
+
+
+def _parse_timestamp(value):
+    """Parse an ISO 8601 timestamp from the API into epoch seconds (None if missing or invalid)"""
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+    except (ValueError, TypeError):
+        # Python < 3.11 can't parse fractional seconds with more than 6 digits
+        try:
+            return int(datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp())
+        except (ValueError, TypeError):
+            return None
+
+
+class _Record:
+    """Base for the compact record types; rows can be read like dicts by the result tables"""
+    __slots__ = ()
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+    
+    def __getitem__(self, key):
+        return getattr(self, key)
+    
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+    
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+    
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class UserRecord(_Record):
+    """Profile of one user; created is in epoch seconds"""
+    __slots__ = ('id', 'name', 'display_name', 'description', 'created', 'is_banned', 'verified')
+    
+    def __init__(self, id, name, display_name=None, description="", created=None, is_banned=False, verified=False):
+        self.id = id
+        self.name = name
+        self.display_name = display_name
+        self.description = description
+        self.created = created
+        self.is_banned = is_banned
+        self.verified = verified
+    
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get('id'), data.get('name', ''), data.get('displayName'), data.get('description') or "",
+                   _parse_timestamp(data.get('created')), data.get('isBanned', False),
+                   data.get('hasVerifiedBadge', False))
+
+
+class SocialCounts(_Record):
+    """Friends, followers, following and badges counts; None where a count is unavailable"""
+    __slots__ = ('friends', 'followers', 'following', 'badges')
+    
+    def __init__(self, friends=None, followers=None, following=None, badges=None):
+        self.friends = friends
+        self.followers = followers
+        self.following = following
+        self.badges = badges
+    
+    @property
+    def complete(self):
+        """False if any count is missing because its request failed"""
+        return None not in (self.friends, self.followers, self.following, self.badges)
+
+
+# userPresenceType values returned by the presence API
+PRESENCE_TYPES = {0: 'Offline', 1: 'Online', 2: 'InGame', 3: 'InStudio', 4: 'Invisible'}
+
+
+class PresenceRecord(_Record):
+    """Where a user currently is"""
+    __slots__ = ('presence', 'last_location', 'universe_id', 'place_id', 'current_game')
+    
+    def __init__(self, presence, last_location=None, universe_id=None, place_id=None, current_game=None):
+        self.presence = presence
+        self.last_location = last_location
+        self.universe_id = universe_id
+        self.place_id = place_id
+        self.current_game = current_game
+    
+    @classmethod
+    def from_json(cls, data):
+        presence_type = data.get('userPresenceType', 'Unknown')
+        return cls(PRESENCE_TYPES.get(presence_type, presence_type), data.get('lastLocation', 'Unknown'),
+                   data.get('universeId'), data.get('placeId'))
+
+
+class GroupRecord(_Record):
+    """A group membership with the user's rank in it"""
+    __slots__ = ('id', 'name', 'member_count', 'rank')
+    
+    def __init__(self, id, name, member_count=0, rank=None):
+        self.id = id
+        self.name = name
+        self.member_count = member_count
+        self.rank = rank
+    
+    @classmethod
+    def from_json(cls, group_role):
+        group = group_role.get('group') or {}
+        return cls(group.get('id'), group.get('name'), group.get('memberCount', 0),
+                   (group_role.get('role') or {}).get('rank'))
+
+
+class GameRecord(_Record):
+    """A game (universe) created by a user; created is in epoch seconds"""
+    __slots__ = ('id', 'name', 'root_place_id', 'playing', 'visits', 'created')
+    
+    def __init__(self, id, name, root_place_id=None, playing=0, visits=0, created=None):
+        self.id = id
+        self.name = name
+        self.root_place_id = root_place_id
+        self.playing = playing
+        self.visits = visits
+        self.created = created
+    
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get('id'), data.get('name'), (data.get('rootPlace') or {}).get('id'),
+                   data.get('playing') or 0, data.get('placeVisits', data.get('visits')) or 0,
+                   _parse_timestamp(data.get('created')))
+
+
+class AltCandidate(_Record):
+    """A possible alt account with its score and the reasons behind it"""
+    __slots__ = ('username', 'id', 'score', 'reasons')
+    
+    def __init__(self, username, id, score, reasons):
+        self.username = username
+        self.id = id
+        self.score = score
+        self.reasons = reasons
+
+
+class ResultPage(list):
+    """One page of a cursor-paginated list; next_cursor is None on the last page.
+    
+    complete is False when a request for the page or its details failed, so it may be empty or missing stats.
+    """
+    def __init__(self, items=(), next_cursor=None, complete=True):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.complete = complete
+
+
+# How long each part of a user snapshot stays fresh before incremental refresh refetches it
+FIELD_REFRESH_INTERVALS = {
+    'profile': 24 * 3600,       # created date never changes, name/description rarely do
+    'avatar': 6 * 3600,
+    'social': 3600,             # friends/followers/following/badges counts
+    'groups': 6 * 3600,         # group count and owned groups (group roles)
+    'games': 6 * 3600,
+    'alt_accounts': 24 * 3600,
+    'presence': 0,              # always refetched
+}
+
+
+# Default total time budget for one lookup, in seconds
+DEFAULT_LOOKUP_DEADLINE = 3.0
+
+# Named lookup profiles and the stages each one runs; the profile stage always runs,
+# and a skipped stage can be loaded on its own later
+LOOKUP_STAGES = ('profile', 'social', 'presence', 'groups', 'games', 'avatar', 'alt_accounts')
+LOOKUP_PROFILES = {
+    'quick': ('profile', 'avatar'),
+    'social': ('profile', 'avatar', 'social', 'presence', 'groups'),
+    'full': ('profile', 'social', 'presence', 'groups', 'games', 'avatar'),
+    'full+alts': LOOKUP_STAGES,
+}
+DEFAULT_LOOKUP_PROFILE = 'full'
+
+
+def lookup_profile_options(name):
+    """(check_alts, skip) arguments of lookup_user for a LOOKUP_PROFILES name"""
+    stages = LOOKUP_PROFILES[name]
+    return 'alt_accounts' in stages, tuple(stage for stage in LOOKUP_STAGES if stage not in stages)
+
+
+# Fraction of the budget left after resolving the user ID that each stage may use.
+# Stages run in parallel; the cheap core stages get the whole budget, while slow
+# optional ones stop a little earlier so there is headroom to render the answer.
+STAGE_BUDGET_SHARES = {
+    'profile': 1.0,
+    'social': 0.9,
+    'presence': 0.9,
+    'groups': 0.9,
+    'games': 0.8,
+    'avatar': 0.8,
+    'alt_accounts': 0.9,
+}
+
+
+# Snapshot fields that are a single record
+SNAPSHOT_RECORDS = {'profile': UserRecord, 'social': SocialCounts, 'presence': PresenceRecord}
+
+
+def _encode_snapshot(field, value):
+    """JSON-ready form of one snapshot field, for the snapshot file"""
+    if field in SNAPSHOT_RECORDS:
+        return value.to_dict()
+    if field == 'groups':
+        return {'groups_count': value['groups_count'],
+                'owned_groups': [group.to_dict() for group in value['owned_groups']]}
+    if field == 'games':
+        return {'games': [game.to_dict() for game in value], 'next_cursor': getattr(value, 'next_cursor', None)}
+    if field == 'alt_accounts':
+        return [alt.to_dict() for alt in value]
+    if field == 'avatar':
+        image = value.get('image')
+        return {'url': value.get('url'), 'image': base64.b64encode(image).decode('ascii') if image else None}
+    raise ValueError(f"Unknown snapshot field {field!r}")
+
+
+def _decode_snapshot(field, data):
+    """Rebuild a snapshot field saved by _encode_snapshot"""
+    if field in SNAPSHOT_RECORDS:
+        return SNAPSHOT_RECORDS[field].from_dict(data)
+    if field == 'groups':
+        return {'groups_count': data['groups_count'],
+                'owned_groups': [GroupRecord.from_dict(group) for group in data['owned_groups']]}
+    if field == 'games':
+        return ResultPage((GameRecord.from_dict(game) for game in data['games']), data.get('next_cursor'))
+    if field == 'alt_accounts':
+        return [AltCandidate.from_dict(alt) for alt in data]
+    if field == 'avatar':
+        return {'url': data['url'], 'image': base64.b64decode(data['image']) if data.get('image') else None}
+    raise ValueError(f"Unknown snapshot field {field!r}")
+
+
+class _SqliteFile:
+    """Per-thread connections to one SQLite file, whose tables are created on first use.
+    
+    Nothing is opened until the first query, so creating a store costs nothing at startup.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+    
+    def _create_schema(self, connection):
+        pass
+    
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(connection)
+                    connection.commit()
+                    self._schema_ready = True
+        return connection
+
+
+class UserSnapshotStore(_SqliteFile):
+    """Keeps the last fetched value of every field per user, with its fetch time.
+    
+    With a path, every field is also saved to that SQLite file and read back the first
+    time a user is asked for, so the last known data outlives the app and can still be
+    shown while Roblox is unreachable.
+    """
+    def __init__(self, intervals=None, path=None):
+        super().__init__(path)
+        self.intervals = dict(FIELD_REFRESH_INTERVALS if intervals is None else intervals)
+        self._snapshots = {}  # user_id -> {field: (value, fetched_at)}
+        self._user_ids = {}   # lowercase username -> user_id
+        self._loaded = set()  # users whose saved fields have been read
+        self._lock = threading.Lock()
+    
+    def _create_schema(self, connection):
+        connection.execute("CREATE TABLE IF NOT EXISTS snapshots "
+                           "(user_id INTEGER NOT NULL, field TEXT NOT NULL, fetched_at REAL NOT NULL, "
+                           "value TEXT NOT NULL, PRIMARY KEY (user_id, field)) WITHOUT ROWID")
+    
+    def _entry(self, user_id, field):
+        """(value, fetched_at) of a stored field, or None; saved fields are read on a user's first use"""
+        with self._lock:
+            if self.path is None or user_id in self._loaded:
+                return self._snapshots.get(user_id, {}).get(field)
+        saved = {}
+        try:
+            rows = self._connection().execute("SELECT field, fetched_at, value FROM snapshots WHERE user_id = ?",
+                                              (user_id,)).fetchall()
+            for saved_field, fetched_at, value in rows:
+                try:
+                    saved[saved_field] = (_decode_snapshot(saved_field, json.loads(value)), fetched_at)
+                except (ValueError, KeyError, TypeError):
+                    continue  # saved by a version with a different layout
+        except Exception as e:
+            print(f"Error reading saved snapshots: {e}")
+        with self._lock:
+            self._loaded.add(user_id)
+            entries = self._snapshots.setdefault(user_id, {})
+            for saved_field, entry in saved.items():
+                if saved_field not in entries or entries[saved_field][1] < entry[1]:
+                    entries[saved_field] = entry
+            return entries.get(field)
+    
+    def remember_user_id(self, username, user_id):
+        with self._lock:
+            self._user_ids[username.lower()] = user_id
+    
+    def known_user_id(self, username):
+        with self._lock:
+            return self._user_ids.get(username.lower())
+    
+    def get_fresh(self, user_id, field, now=None):
+        """Return (True, value) if the stored field is still within its refresh interval"""
+        entry = self._entry(user_id, field)
+        if entry is None:
+            return False, None
+        value, fetched_at = entry
+        now = time.time() if now is None else now
+        if now - fetched_at < self.intervals.get(field, 0):
+            return True, value
+        return False, None
+    
+    def get_stale(self, user_id, field):
+        """Return (value, fetched_at) of the stored field however old it is, or (None, None)"""
+        return self._entry(user_id, field) or (None, None)
+    
+    def put(self, user_id, field, value):
+        fetched_at = time.time()
+        with self._lock:
+            self._snapshots.setdefault(user_id, {})[field] = (value, fetched_at)
+        if self.path:
+            try:
+                connection = self._connection()
+                connection.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                                   (user_id, field, fetched_at,
+                                    json.dumps(_encode_snapshot(field, value), separators=(',', ':'))))
+                connection.commit()
+            except Exception as e:
+                print(f"Error saving snapshot: {e}")
+    
+    def fetch(self, user_id, field, fetcher, reuse=True):
+        """Return the stored field when fresh (and reuse is on), otherwise fetch and store it.
+        
+        Returns (value, reused).
+        """
+        if reuse:
+            fresh, value = self.get_fresh(user_id, field)
+            if fresh:
+                return value, True
+        value = fetcher()
+        if value is not None:
+            self.put(user_id, field, value)
+        return value, False
+
+
+# MinHash signature of a username's trigrams, split into LSH bands: two names share a
+# bucket in some band with high probability once their trigram sets' Jaccard
+# similarity is above about (1 / bands) ** (1 / rows), here roughly 0.22
+MINHASH_BANDS = 20
+MINHASH_ROWS = 2
+_MINHASH_PRIME = (1 << 61) - 1
+_minhash_params = None
+
+
+def _username_base(name):
+    """Username with digits, underscores and dashes removed, the usual variations between alts"""
+    return re.sub(r'[0-9_\-]', '', name.lower())
+
+
+def _trigrams(text):
+    padded = f"^{text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _lsh_buckets(base):
+    """LSH bucket keys for a base name, one per band; none for an empty base"""
+    global _minhash_params
+    if _minhash_params is None:
+        import random
+        rng = random.Random(0x5EED)  # fixed so stored buckets stay valid across runs
+        _minhash_params = [(rng.randrange(1, _MINHASH_PRIME), rng.randrange(_MINHASH_PRIME))
+                           for _ in range(MINHASH_BANDS * MINHASH_ROWS)]
+    hashes = [zlib.crc32(trigram.encode('utf-8')) for trigram in _trigrams(base)]
+    if not hashes:
+        return []
+    signature = [min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in _minhash_params]
+    buckets = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+        buckets.append((band << 32) | zlib.crc32(",".join(map(str, rows)).encode('ascii')))
+    return buckets
+
+
+class SimilarUsername(_Record):
+    """A username from the index that resembles the one searched for"""
+    __slots__ = ('id', 'name', 'similarity', 'same_base')
+    
+    def __init__(self, id, name, similarity, same_base=False):
+        self.id = id
+        self.name = name
+        self.similarity = similarity
+        self.same_base = same_base
+
+
+class UsernameIndex(_SqliteFile):
+    """Every username the tool has resolved, kept in SQLite and indexed for similarity search.
+    
+    Names are indexed by base name (exact match) and by MinHash LSH buckets over
+    the base name's trigrams, so a query only reads the few names sharing a bucket
+    instead of scanning them all. Candidates are then checked with difflib.
+    The same file also keeps each user's creation time once their profile has been
+    fetched, and the friendships seen in friend lists. Several threads and
+    processes can share one file.
+    """
+    def _create_schema(self, connection):
+        connection.execute("CREATE TABLE IF NOT EXISTS usernames "
+                           "(id INTEGER PRIMARY KEY, name TEXT NOT NULL, base TEXT NOT NULL, created INTEGER)")
+        if 'created' not in [column[1] for column in connection.execute("PRAGMA table_info(usernames)")]:
+            connection.execute("ALTER TABLE usernames ADD COLUMN created INTEGER")
+        connection.execute("CREATE INDEX IF NOT EXISTS usernames_base ON usernames (base)")
+        connection.execute("CREATE TABLE IF NOT EXISTS username_buckets "
+                           "(bucket INTEGER NOT NULL, id INTEGER NOT NULL, PRIMARY KEY (bucket, id)) WITHOUT ROWID")
+        connection.execute("CREATE TABLE IF NOT EXISTS friendships "
+                           "(user_id INTEGER NOT NULL, friend_id INTEGER NOT NULL, "
+                           "PRIMARY KEY (user_id, friend_id)) WITHOUT ROWID")
+        connection.execute("CREATE TABLE IF NOT EXISTS group_members "
+                           "(user_id INTEGER NOT NULL, group_id INTEGER NOT NULL, "
+                           "PRIMARY KEY (user_id, group_id)) WITHOUT ROWID")
+        connection.execute("CREATE TABLE IF NOT EXISTS groups "
+                           "(id INTEGER PRIMARY KEY, name TEXT, member_count INTEGER)")
+        connection.execute("CREATE TABLE IF NOT EXISTS group_memberships_fetched "
+                           "(user_id INTEGER PRIMARY KEY, fetched_at REAL NOT NULL)")
+    
+    def add(self, users):
+        """Index (user_id, username) pairs; renamed users are re-indexed under their new name"""
+        users = {int(user_id): name for user_id, name in users if user_id and name}
+        if not users:
+            return
+        connection = self._connection()
+        placeholders = ",".join("?" * len(users))
+        known = dict(connection.execute(f"SELECT id, name FROM usernames WHERE id IN ({placeholders})",
+                                        list(users)))
+        changed = [(user_id, name) for user_id, name in users.items() if known.get(user_id) != name]
+        if not changed:
+            return
+        with connection:
+            for user_id, name in changed:
+                base = _username_base(name)
+                old_base = _username_base(known[user_id]) if user_id in known else ''
+                if old_base:
+                    connection.execute("DELETE FROM username_buckets WHERE id = ? AND bucket IN (%s)"
+                                       % ",".join("?" * MINHASH_BANDS),
+                                       [user_id] + _lsh_buckets(old_base))
+                connection.execute("INSERT INTO usernames (id, name, base) VALUES (?, ?, ?) "
+                                   "ON CONFLICT (id) DO UPDATE SET name = excluded.name, base = excluded.base",
+                                   (user_id, name, base))
+                if base:
+                    connection.executemany("INSERT OR IGNORE INTO username_buckets VALUES (?, ?)",
+                                           [(bucket, user_id) for bucket in _lsh_buckets(base)])
+    
+    def set_created(self, dates):
+        """Store (user_id, created) pairs for indexed users; returns the ids that had no date yet"""
+        connection = self._connection()
+        added = []
+        with connection:
+            for user_id, created in dates:
+                cursor = connection.execute("UPDATE usernames SET created = ? WHERE id = ? AND created IS NULL",
+                                            (created, user_id))
+                if cursor.rowcount:
+                    added.append(user_id)
+        return added
+    
+    def all_names(self):
+        """Every indexed username"""
+        return (row[0] for row in self._connection().execute("SELECT name FROM usernames WHERE name IS NOT NULL"))
+    
+    def created_dates(self):
+        """All known (created, user_id) pairs in creation order"""
+        return self._connection().execute(
+            "SELECT created, id FROM usernames WHERE created IS NOT NULL ORDER BY created, id")
+    
+    def created(self, user_ids):
+        """Map of user_id -> creation time for the given users that have one"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        return dict(self._connection().execute(
+            f"SELECT id, created FROM usernames WHERE created IS NOT NULL AND id IN ({','.join('?' * len(user_ids))})",
+            user_ids))
+    
+    def add_friends(self, user_id, friend_ids):
+        """Remember friendships, stored in both directions"""
+        edges = [(user_id, friend_id) for friend_id in friend_ids if friend_id]
+        if not edges:
+            return
+        connection = self._connection()
+        with connection:
+            connection.executemany("INSERT OR IGNORE INTO friendships VALUES (?, ?)",
+                                   edges + [(friend_id, user_id) for user_id, friend_id in edges])
+    
+    def friends_of(self, user_id):
+        return {row[0] for row in self._connection().execute(
+            "SELECT friend_id FROM friendships WHERE user_id = ?", (user_id,))}
+    
+    def save_memberships(self, user_id, groups, fetched_at):
+        """Replace a user's stored group memberships with a freshly fetched list of GroupRecords"""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM group_members WHERE user_id = ?", (user_id,))
+            connection.executemany("INSERT OR IGNORE INTO group_members VALUES (?, ?)",
+                                   [(user_id, group.id) for group in groups])
+            connection.executemany("INSERT OR REPLACE INTO groups VALUES (?, ?, ?)",
+                                   [(group.id, group.name, group.member_count) for group in groups])
+            connection.execute("INSERT OR REPLACE INTO group_memberships_fetched VALUES (?, ?)",
+                               (user_id, fetched_at))
+    
+    def memberships(self):
+        """Stored memberships as (user_id, fetched_at, [(group_id, member_count), ...])"""
+        connection = self._connection()
+        groups = {}
+        for user_id, group_id, member_count in connection.execute(
+                "SELECT m.user_id, m.group_id, g.member_count FROM group_members m "
+                "LEFT JOIN groups g ON g.id = m.group_id"):
+            groups.setdefault(user_id, []).append((group_id, member_count))
+        for user_id, fetched_at in connection.execute("SELECT user_id, fetched_at FROM group_memberships_fetched"):
+            yield user_id, fetched_at, groups.get(user_id, [])
+    
+    def find(self, name):
+        """(user_id, created) for a username, or None if it isn't indexed"""
+        return self._connection().execute(
+            "SELECT id, created FROM usernames WHERE base = ? AND lower(name) = ?",
+            (_username_base(name), name.lower())).fetchone()
+    
+    def names(self, user_ids):
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        return dict(self._connection().execute(
+            f"SELECT id, name FROM usernames WHERE id IN ({','.join('?' * len(user_ids))})", user_ids))
+    
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM usernames").fetchone()[0]
+    
+    def similar(self, name, limit=20, min_similarity=0.6, exclude=()):
+        """Indexed usernames that share name's base or are at least min_similarity alike, best first"""
+        base = _username_base(name)
+        if not base:
+            return []
+        buckets = _lsh_buckets(base)
+        rows = self._connection().execute(
+            "SELECT u.id, u.name, u.base FROM username_buckets b JOIN usernames u ON u.id = b.id "
+            f"WHERE b.bucket IN ({','.join('?' * len(buckets))}) "
+            "UNION SELECT id, name, base FROM usernames WHERE base = ?", buckets + [base]).fetchall()
+        name = name.lower()
+        matches = []
+        for user_id, candidate, candidate_base in rows:
+            if user_id in exclude or candidate.lower() == name:
+                continue
+            similarity = difflib.SequenceMatcher(None, name, candidate.lower()).ratio()
+            same_base = candidate_base == base
+            if same_base or similarity >= min_similarity:
+                matches.append(SimilarUsername(user_id, candidate, similarity, same_base))
+        matches.sort(key=lambda match: (match.same_base, match.similarity), reverse=True)
+        return matches[:limit]
+    
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class CreationDateIndex:
+    """Creation times of every indexed user in two sorted parallel arrays, for time-window queries.
+    
+    Takes 16 bytes per user. It is loaded from the username index on first use, and
+    dates added later are merged in before the next query.
+    """
+    def __init__(self, username_index=None):
+        self.username_index = username_index
+        self._times = None
+        self._ids = None
+        self._pending = []
+        self._lock = threading.Lock()
+    
+    def add(self, user_id, created):
+        with self._lock:
+            self._pending.append((created, user_id))
+    
+    def _merge(self):
+        if self._times is None:
+            self._times, self._ids = array('q'), array('q')
+            if self.username_index is not None:
+                for created, user_id in self.username_index.created_dates():
+                    self._times.append(created)
+                    self._ids.append(user_id)
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if len(pending) > len(self._times) // 8:
+            # Cheaper to rebuild both arrays than to insert one by one
+            merged = sorted(set(zip(self._times, self._ids)).union(pending))
+            self._times = array('q', (created for created, _ in merged))
+            self._ids = array('q', (user_id for _, user_id in merged))
+            return
+        for created, user_id in pending:
+            low = bisect.bisect_left(self._times, created)
+            high = bisect.bisect_right(self._times, created)
+            if user_id not in self._ids[low:high]:
+                self._times.insert(high, created)
+                self._ids.insert(high, user_id)
+    
+    def __len__(self):
+        with self._lock:
+            self._merge()
+            return len(self._times)
+    
+    def between(self, start, end):
+        """(created, user_id) of every account created from start to end (epoch seconds), oldest first"""
+        with self._lock:
+            self._merge()
+            low = bisect.bisect_left(self._times, start)
+            high = bisect.bisect_right(self._times, end)
+            return list(zip(self._times[low:high], self._ids[low:high]))
+    
+    def near(self, created, seconds, limit=None):
+        """Accounts created within seconds of created, closest first"""
+        found = self.between(created - seconds, created + seconds)
+        found.sort(key=lambda entry: abs(entry[0] - created))
+        return found[:limit] if limit else found
+
+
+class UsernamePrefixIndex:
+    """Every indexed username in one sorted array, for instant prefix completion.
+    
+    Sorted lowercase keys answer a prefix with two binary searches, like walking a trie,
+    without a node per character. Loaded from the username index on first use; names
+    added later are merged in before the next query.
+    """
+    def __init__(self, username_index=None):
+        self.username_index = username_index
+        self._keys = None
+        self._names = None
+        self._pending = []
+        self._lock = threading.Lock()
+    
+    def add(self, names):
+        with self._lock:
+            self._pending.extend(name for name in names if name)
+    
+    def _merge(self):
+        if self._keys is None:
+            names = self.username_index.all_names() if self.username_index is not None else ()
+            self._pending.extend(names)
+            self._keys, self._names = [], []
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if len(pending) > len(self._keys) // 8:
+            # Cheaper to rebuild than to insert one by one
+            merged = dict(zip(self._keys, self._names))
+            merged.update((name.lower(), name) for name in pending)
+            self._keys = sorted(merged)
+            self._names = [merged[key] for key in self._keys]
+            return
+        for name in pending:
+            key = name.lower()
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                self._names[position] = name  # keep the latest capitalisation
+            else:
+                self._keys.insert(position, key)
+                self._names.insert(position, name)
+    
+    def __len__(self):
+        with self._lock:
+            self._merge()
+            return len(self._keys)
+    
+    def complete(self, prefix, limit=8):
+        """Up to limit known usernames starting with prefix (ignoring case), in alphabetical order"""
+        key = prefix.lower()
+        if not key:
+            return []
+        with self._lock:
+            self._merge()
+            low = bisect.bisect_left(self._keys, key)
+            high = bisect.bisect_left(self._keys, key + '\uffff', low, min(len(self._keys), low + limit))
+            return self._names[low:high]
+
+
+def _group_weight(member_count):
+    """How much sharing a group says about two accounts: 1.0 for a one-member group, about 0.17 for a million"""
+    return 1 / math.log10(max(member_count or 0, 1) + 9)
+
+
+# Total rarity weight of shared groups needed for one or two points of alt score
+GROUP_OVERLAP_WEAK = 0.5
+GROUP_OVERLAP_STRONG = 1.0
+
+
+class GroupMembershipIndex:
+    """Group memberships of looked-up users and checked friends as an inverted index.
+    
+    Keeps group id -> member ids and user id -> group ids as integer sets, so the
+    groups two accounts share are one set intersection. Memberships are saved to
+    the user index file when there is one and loaded from it on first use.
+    """
+    def __init__(self, username_index=None):
+        self.username_index = username_index
+        self._members = {}        # group_id -> set of user ids
+        self._groups = {}         # user_id -> set of group ids
+        self._member_counts = {}  # group_id -> member count reported by Roblox
+        self._fetched = {}        # user_id -> when their memberships were fetched
+        self._loaded = username_index is None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for user_id, fetched_at, groups in self.username_index.memberships():
+            self._store(user_id, groups, fetched_at)
+    
+    def _store(self, user_id, groups, fetched_at):
+        for group_id in self._groups.get(user_id, ()):
+            self._members.get(group_id, set()).discard(user_id)
+        self._groups[user_id] = {group_id for group_id, _ in groups}
+        for group_id, member_count in groups:
+            self._members.setdefault(group_id, set()).add(user_id)
+            self._member_counts[group_id] = member_count
+        self._fetched[user_id] = fetched_at
+    
+    def set_memberships(self, user_id, groups):
+        """Record the GroupRecords a user was just fetched with"""
+        fetched_at = time.time()
+        with self._lock:
+            self._load()
+            self._store(user_id, [(group.id, group.member_count) for group in groups], fetched_at)
+        if self.username_index is not None:
+            self.username_index.save_memberships(user_id, groups, fetched_at)
+    
+    def fresh_groups(self, user_id, max_age):
+        """The user's group ids if fetched within max_age seconds, otherwise None"""
+        with self._lock:
+            self._load()
+            if time.time() - self._fetched.get(user_id, 0) < max_age:
+                return set(self._groups[user_id])
+        return None
+    
+    def overlap(self, user_id, other_id):
+        """(rarity weight, shared group ids) of the groups two users are both in"""
+        with self._lock:
+            self._load()
+            shared = self._groups.get(user_id, set()) & self._groups.get(other_id, set())
+            return sum(_group_weight(self._member_counts.get(group_id)) for group_id in shared), shared
+    
+    def co_members(self, user_id, min_weight=GROUP_OVERLAP_WEAK):
+        """Other indexed users whose shared groups with the user weigh at least min_weight: {id: weight}"""
+        weights = {}
+        with self._lock:
+            self._load()
+            for group_id in self._groups.get(user_id, ()):
+                weight = _group_weight(self._member_counts.get(group_id))
+                for member_id in self._members.get(group_id, ()):
+                    if member_id != user_id:
+                        weights[member_id] = weights.get(member_id, 0) + weight
+        return {member_id: weight for member_id, weight in weights.items() if weight >= min_weight}
+
+
+# Social stats kept by the history store, in column order; presence is kept as its userPresenceType
+HISTORY_FIELDS = ('friends', 'followers', 'following', 'badges', 'groups', 'presence')
+# Points per user kept as plain rows before they are packed into one columnar block
+HISTORY_BLOCK_SIZE = 64
+_PRESENCE_CODES = {name: code for code, name in PRESENCE_TYPES.items()}
+
+
+def _encode_deltas(values):
+    """Pack integers as zigzag varints of the difference from the previous one"""
+    packed = bytearray()
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        delta = delta * 2 if delta >= 0 else -delta * 2 - 1
+        while delta >= 0x80:
+            packed.append((delta & 0x7f) | 0x80)
+            delta >>= 7
+        packed.append(delta)
+    return bytes(packed)
+
+
+def _decode_deltas(packed):
+    """Unpack what _encode_deltas packed into an array of integers"""
+    values = array('q')
+    value = delta = shift = 0
+    for byte in packed:
+        delta |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        value += delta >> 1 if not delta & 1 else -(delta >> 1) - 1
+        values.append(value)
+        delta = shift = 0
+    return values
+
+
+class StatsPoint(_Record):
+    """A user's social stats at one time (epoch seconds); None where a stat wasn't fetched"""
+    __slots__ = ('at',) + HISTORY_FIELDS
+    
+    def __init__(self, at, friends=None, followers=None, following=None, badges=None, groups=None,
+                 presence=None):
+        self.at = at
+        self.friends = friends
+        self.followers = followers
+        self.following = following
+        self.badges = badges
+        self.groups = groups
+        self.presence = presence
+
+
+class StatsHistory(_SqliteFile):
+    """Time series of every user's social stats, appended to on each lookup.
+    
+    The latest points of a user are plain rows; every HISTORY_BLOCK_SIZE of them are
+    packed into one block with a column per stat, each delta-encoded as varints, so
+    a point takes about ten bytes and a range query only decodes the blocks and
+    columns it needs. Blocks are keyed by (user, first time), which is the per-user
+    index range queries use. Missing stats are stored as -1. It lives in the user
+    index file, and several threads and processes can share it.
+    """
+    def _create_schema(self, connection):
+        columns = ", ".join(f"{field} BLOB NOT NULL" for field in HISTORY_FIELDS)
+        connection.execute("CREATE TABLE IF NOT EXISTS stats_blocks "
+                           "(user_id INTEGER NOT NULL, first_at INTEGER NOT NULL, last_at INTEGER NOT NULL, "
+                           f"count INTEGER NOT NULL, times BLOB NOT NULL, {columns}, "
+                           "PRIMARY KEY (user_id, first_at)) WITHOUT ROWID")
+        columns = ", ".join(f"{field} INTEGER" for field in HISTORY_FIELDS)
+        connection.execute("CREATE TABLE IF NOT EXISTS stats_recent "
+                           f"(user_id INTEGER NOT NULL, at INTEGER NOT NULL, {columns}, "
+                           "PRIMARY KEY (user_id, at)) WITHOUT ROWID")
+    
+    def record(self, user_id, values, at=None):
+        """Append the stats just fetched for a user ({field: value}, presence as its name).
+        
+        Returns {field: (previous value, value, previous time)} for every stat that was
+        recorded before, which is what changed since the last check.
+        """
+        at = int(at if at is not None else time.time())
+        row = [values.get(field) for field in HISTORY_FIELDS]
+        row[HISTORY_FIELDS.index('presence')] = _PRESENCE_CODES.get(values.get('presence'))
+        if all(value is None for value in row):
+            return {}
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            # A point recorded in the same second is part of the last check, so it counts as previous
+            previous = self._latest(connection, user_id, at + 1)
+            placeholders = ", ".join("?" * len(HISTORY_FIELDS))
+            merged = ", ".join(f"{field} = COALESCE(excluded.{field}, {field})" for field in HISTORY_FIELDS)
+            connection.execute(f"INSERT INTO stats_recent (user_id, at, {', '.join(HISTORY_FIELDS)}) "
+                               f"VALUES (?, ?, {placeholders}) ON CONFLICT (user_id, at) DO UPDATE SET {merged}",
+                               [user_id, at] + row)
+            count = connection.execute("SELECT COUNT(*) FROM stats_recent WHERE user_id = ?",
+                                       (user_id,)).fetchone()[0]
+            if count >= HISTORY_BLOCK_SIZE:
+                self._pack(connection, user_id)
+        changes = {}
+        for field, value in zip(HISTORY_FIELDS, row):
+            if value is not None and field in previous:
+                old, old_at = previous[field]
+                if field == 'presence':
+                    old, value = PRESENCE_TYPES.get(old, old), PRESENCE_TYPES.get(value, value)
+                changes[field] = (old, value, old_at)
+        return changes
+    
+    def _pack(self, connection, user_id):
+        """Move a user's recent rows into one columnar block"""
+        rows = connection.execute(f"SELECT at, {', '.join(HISTORY_FIELDS)} FROM stats_recent "
+                                  "WHERE user_id = ? ORDER BY at", (user_id,)).fetchall()
+        columns = [_encode_deltas(-1 if value is None else value for value in column) for column in zip(*rows)]
+        connection.execute(f"INSERT OR REPLACE INTO stats_blocks (user_id, first_at, last_at, count, times, "
+                           f"{', '.join(HISTORY_FIELDS)}) VALUES (?, ?, ?, ?, {', '.join('?' * len(columns))})",
+                           [user_id, rows[0][0], rows[-1][0], len(rows)] + columns)
+        connection.execute("DELETE FROM stats_recent WHERE user_id = ?", (user_id,))
+    
+    def _latest(self, connection, user_id, before):
+        """{field: (value, time)} of the most recent known value of each stat before a time"""
+        found = {}
+        rows = connection.execute(f"SELECT at, {', '.join(HISTORY_FIELDS)} FROM stats_recent "
+                                  "WHERE user_id = ? AND at < ? ORDER BY at DESC", (user_id, before))
+        for row in rows:
+            for field, value in zip(HISTORY_FIELDS, row[1:]):
+                if value is not None and field not in found:
+                    found[field] = (value, row[0])
+            if len(found) == len(HISTORY_FIELDS):
+                return found
+        blocks = connection.execute(f"SELECT times, {', '.join(HISTORY_FIELDS)} FROM stats_blocks "
+                                    "WHERE user_id = ? AND first_at < ? ORDER BY first_at DESC", (user_id, before))
+        for times, *columns in blocks:
+            times = _decode_deltas(times)
+            for field, column in zip(HISTORY_FIELDS, columns):
+                if field in found:
+                    continue
+                for at, value in zip(reversed(times), reversed(_decode_deltas(column))):
+                    if at < before and value >= 0:
+                        found[field] = (value, at)
+                        break
+            if len(found) == len(HISTORY_FIELDS):
+                break
+        return found
+    
+    def series(self, user_id, start=0, end=None, fields=HISTORY_FIELDS):
+        """(times, {field: values}) of a user's points from start to end, oldest first; None where missing"""
+        end = end if end is not None else time.time()
+        times = []
+        columns = {field: [] for field in fields}
+        connection = self._connection()
+        blocks = connection.execute(f"SELECT times, {', '.join(fields)} FROM stats_blocks "
+                                    "WHERE user_id = ? AND first_at <= ? AND last_at >= ? ORDER BY first_at",
+                                    (user_id, end, start))
+        for block_times, *packed in blocks:
+            block_times = _decode_deltas(block_times)
+            low = bisect.bisect_left(block_times, start)
+            high = bisect.bisect_right(block_times, end)
+            times.extend(block_times[low:high])
+            for field, column in zip(fields, packed):
+                columns[field].extend(value if value >= 0 else None for value in _decode_deltas(column)[low:high])
+        rows = connection.execute(f"SELECT at, {', '.join(fields)} FROM stats_recent "
+                                  "WHERE user_id = ? AND at BETWEEN ? AND ? ORDER BY at", (user_id, start, end))
+        for at, *values in rows:
+            times.append(at)
+            for field, value in zip(fields, values):
+                columns[field].append(value)
+        if 'presence' in columns:
+            columns['presence'] = [PRESENCE_TYPES.get(code, code) for code in columns['presence']]
+        return times, columns
+    
+    def downsample(self, user_id, start=0, end=None, interval=86400):
+        """One StatsPoint per interval that has points, holding each stat's last value in it, oldest first"""
+        times, columns = self.series(user_id, start, end)
+        buckets = {}
+        for index, at in enumerate(times):
+            bucket = buckets.get(at // interval * interval)
+            if bucket is None:
+                bucket = buckets[at // interval * interval] = {}
+            for field in HISTORY_FIELDS:
+                value = columns[field][index]
+                if value is not None:
+                    bucket[field] = value
+        return [StatsPoint(at, **bucket) for at, bucket in buckets.items()]
+    
+    def points(self, user_id):
+        """How many points are kept for a user"""
+        connection = self._connection()
+        packed = connection.execute("SELECT COALESCE(SUM(count), 0) FROM stats_blocks WHERE user_id = ?",
+                                    (user_id,)).fetchone()[0]
+        return packed + connection.execute("SELECT COUNT(*) FROM stats_recent WHERE user_id = ?",
+                                           (user_id,)).fetchone()[0]
+    
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class _NullProfiler:
+    """Profiler used when profiling is off; every stage is the same shared no-op context"""
+    _stage = contextlib.nullcontext()
+    
+    def stage(self, name):
+        return self._stage
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class StageProfiler:
+    """Records wall and CPU time for each stage of one lookup or server search.
+    
+    cprofile=True runs every stage under its own cProfile profiler (stages run on
+    worker threads, which a single profiler would not see) and merges the results.
+    From Python 3.12 only one profiler can be active at a time, but it sees every
+    thread, so the whole run gets one instead; a run that starts while another is
+    being profiled goes without. trace_memory=True records allocations with
+    tracemalloc between start() and finish().
+    """
+    def __init__(self, name, cprofile=False, trace_memory=False):
+        self.name = name
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.stages = []  # (name, start offset, wall seconds, cpu seconds)
+        self._profiles = []
+        self._run_profile = None  # the one profiler of the whole run, from Python 3.12
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+        self.memory_snapshot = None
+        self.memory_peak = None
+        self.started = None
+        self.finished = None
+    
+    def start(self):
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self._started_tracing = True
+        if self.cprofile and sys.version_info >= (3, 12):
+            self._run_profile = self._start_profile()
+        self.started = time.perf_counter()
+        return self
+    
+    def finish(self):
+        self.finished = time.perf_counter()
+        if self._run_profile is not None:
+            self._run_profile.disable()
+            with self._lock:
+                self._profiles.append(self._run_profile)
+            self._run_profile = None
+        if self.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                self.memory_snapshot = tracemalloc.take_snapshot()
+                self.memory_peak = tracemalloc.get_traced_memory()[1]
+                if self._started_tracing:
+                    tracemalloc.stop()
+        return self
+    
+    @staticmethod
+    def _start_profile():
+        """A new enabled cProfile profiler, or None if another profiler is already active"""
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            print(f"cProfile skipped: {e}")
+            return None
+        return profile
+    
+    @contextmanager
+    def stage(self, name):
+        if self.started is None:
+            self.start()
+        profile = None
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            # Nested stages are already covered by the outer stage's profiler
+            if self.cprofile and sys.version_info < (3, 12) and not getattr(self._local, 'profiling', False):
+                profile = self._start_profile()
+                self._local.profiling = profile is not None
+            yield
+        finally:
+            wall = time.perf_counter() - wall_started
+            cpu = time.thread_time() - cpu_started
+            if profile is not None:
+                profile.disable()
+                self._local.profiling = False
+            with self._lock:
+                self.stages.append((name, wall_started - self.started, wall, cpu))
+                if profile is not None:
+                    self._profiles.append(profile)
+    
+    def waterfall(self, width=40):
+        """Return the stages as a text waterfall, ordered by start time.
+        
+        Repeated stages (such as one per scanned server) are merged into one row
+        spanning from the first start to the last end, with summed wall and CPU time.
+        """
+        total = (self.finished or time.perf_counter()) - self.started
+        merged = {}  # name -> [first start, last end, wall, cpu, count]
+        with self._lock:
+            stages = sorted(self.stages, key=lambda stage: stage[1])
+        for name, offset, wall, cpu in stages:
+            row = merged.setdefault(name, [offset, offset + wall, 0.0, 0.0, 0])
+            row[1] = max(row[1], offset + wall)
+            row[2] += wall
+            row[3] += cpu
+            row[4] += 1
+        lines = [f"{self.name}: {total * 1000:.0f} ms wall",
+                 f"{'stage':<18}{'start':>7}{'wall':>7}{'cpu':>7}  (ms)"]
+        scale = width / total if total > 0 else 0
+        for name, (start, end, wall, cpu, count) in merged.items():
+            label = f"{name} x{count}" if count > 1 else name
+            bar = " " * int(start * scale) + "█" * max(1, int((end - start) * scale))
+            lines.append(f"{label:<18}{start * 1000:>7.0f}{wall * 1000:>7.0f}{cpu * 1000:>7.0f}  |{bar}")
+        return "\n".join(lines)
+    
+    def report(self, top=25):
+        """Return the waterfall plus the cProfile and tracemalloc results that were captured"""
+        sections = [self.waterfall()]
+        if self._profiles:
+            import io
+            import pstats
+            buffer = io.StringIO()
+            stats = pstats.Stats(self._profiles[0], stream=buffer)
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+            stats.sort_stats('cumulative').print_stats(top)
+            sections.append("cProfile (all stages, by cumulative time):\n" + buffer.getvalue().strip())
+        if self.memory_snapshot is not None:
+            lines = [f"tracemalloc: peak {self.memory_peak / 1024:.0f} KiB, top allocation sites:"]
+            for stat in self.memory_snapshot.statistics('lineno')[:10]:
+                lines.append(f"  {stat}")
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+
+# How many accounts ranked from the user index alt detection checks besides the friends,
+# and how many of the accounts created closest in time the ranking considers
+INDEX_ALT_CANDIDATES = 10
+RANK_WINDOW_CANDIDATES = 500
+# Alt score at which an account is reported. A full profile (creation date, description)
+# or a candidate's groups are only fetched when they could lift its score to this.
+ALT_SCORE_THRESHOLD = 4
+DEFAULT_USERNAME_INDEX = os.path.join(os.path.expanduser("~"), ".roblox_lookup", "usernames.sqlite3")
+
+# Stats history shown after a lookup: how far back, and the length of each row
+HISTORY_DAYS = 90
+HISTORY_INTERVAL = 24 * 3600
+
+# Typing in the username field: names offered by autocomplete, the pause before the typed
+# name is speculatively prefetched, and the budget of one prefetch
+AUTOCOMPLETE_LIMIT = 8
+PREFETCH_DELAY_MS = 400
+PREFETCH_DEADLINE = 5.0
+USERNAME_PATTERN = re.compile(r'[A-Za-z0-9_]{3,20}')
+
+# Owned games per page, and universes per games multiget request when refreshing their stats
+OWNED_GAMES_PAGE_SIZE = 50
+GAME_STATS_BATCH_SIZE = 50
+
+# Server sweeps: user IDs / player tokens per thumbnails request, server list pages
+# (of 100 servers) read per universe, and the headshot size both sides are compared at
+SWEEP_BATCH_SIZE = 100
+SWEEP_MAX_PAGES = 50
+SWEEP_HEADSHOT_SIZE = "150x150"
+
+# Connection lists the exporter streams: list -> (URL, page size, items key, next page cursor key)
+CONNECTION_LISTS = {
+    'friends': ("https://friends.roblox.com/v1/users/{}/friends/find", 50, 'PageItems', 'NextCursor'),
+    'followers': ("https://friends.roblox.com/v1/users/{}/followers", 100, 'data', 'nextPageCursor'),
+    'followings': ("https://friends.roblox.com/v1/users/{}/followings", 100, 'data', 'nextPageCursor'),
+}
+# Columns of an export, user IDs per multi-ID users request, and the pages fetched
+# ahead of the file writer before fetching waits for it
+EXPORT_FIELDS = ('id', 'name', 'display_name', 'verified')
+USERS_BATCH_SIZE = 100
+EXPORT_QUEUE_PAGES = 4
+
+
+class LookupFailed(Exception):
+    """Raised when a lookup can't produce any result for the user"""
+
+
+class LookupEngine:
+    """Fetches and combines Roblox user data, independent of the GUI.
+    
+    Holds the shared API client, the per-user snapshots and the thread pool the
+    lookup stages run on, so the same engine can back the Tk app or a headless run.
+    """
+    def __init__(self, client=None, snapshots=None, max_workers=8, username_index=None):
+        self.client = client or RobloxApiClient()
+        # Snapshots are kept in the user index file too, so the last known data survives restarts
+        self.snapshots = snapshots or UserSnapshotStore(path=username_index.path if username_index is not None else None)
+        self.username_index = username_index
+        self.creation_index = CreationDateIndex(username_index) if username_index is not None else None
+        self.prefix_index = UsernamePrefixIndex(username_index) if username_index is not None else None
+        self.group_index = GroupMembershipIndex(username_index)
+        self.history = StatsHistory(username_index.path) if username_index is not None else None
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    @property
+    def executor(self):
+        """Thread pool that runs the stages of a lookup in parallel (created on first use)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                                thread_name_prefix="lookup")
+        return self._executor
+    
+    def _index_usernames(self, pairs):
+        """Remember (user_id, name) pairs in the username index and the autocomplete prefix index"""
+        self.username_index.add(pairs)
+        self.prefix_index.add(name for _, name in pairs)
+    
+    def complete_username(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """Known usernames starting with prefix, answered locally without any requests"""
+        if self.prefix_index is None:
+            return []
+        return self.prefix_index.complete(prefix, limit)
+    
+    def prefetch_user(self, username, deadline):
+        """Speculatively resolve a username and warm its profile and avatar snapshots.
+        
+        Cancel it with deadline.cancel(); requests not sent by then are skipped and
+        nothing half-fetched is kept. Returns True if the user was found.
+        """
+        check_alts, skip = lookup_profile_options('quick')
+        try:
+            self.lookup_user(username, incremental=True, check_alts=check_alts, skip=skip, deadline=deadline)
+        except LookupFailed:
+            return False
+        return True
+    
+    def lookup_user(self, username, incremental=False, check_alts=False,
+                    deadline_seconds=DEFAULT_LOOKUP_DEADLINE, on_status=None, profiler=None, skip=(), deadline=None,
+                    stale=False):
+        """Look up everything about a user within the deadline.
+        
+        Returns (user_info, additional_info, avatar); raises LookupFailed when the
+        user can't be resolved or their profile can't be fetched. Pass a
+        StageProfiler to record the timing of every stage, and stage names in skip
+        to leave those stages out (the profile is always fetched). A Deadline passed
+        as deadline replaces deadline_seconds and lets the caller cancel the lookup.
+        With stale, stages that have a snapshot of any age answer from it at once, and
+        additional_info['stale'] maps those stages to when they were fetched, so the
+        caller can show them and revalidate them afterwards. Snapshots are served the
+        same way whenever Roblox is unreachable.
+        """
+        profiler = profiler or NULL_PROFILER
+        deadline = deadline or Deadline(deadline_seconds)
+        snapshots = self.snapshots
+        reused = []
+        refreshed = []
+        timed_out = set()
+        degraded = {}  # stage -> endpoints skipped because their circuit was open
+        stale_stages = {}  # stage -> when the snapshot served instead of fetching was fetched
+        
+        def serve_stale(name):
+            """Answer a stage from its snapshot however old; (True, value) if there is one"""
+            value, fetched_at = snapshots.get_stale(user_id, name)
+            if value is None:
+                return False, None
+            stale_stages[name] = fetched_at
+            return True, value
+        
+        def saved_user_id():
+            user_id = snapshots.known_user_id(username)
+            if not user_id and self.username_index is not None:
+                # Any username resolved before is in the index, which saves a round trip
+                found = self.username_index.find(username)
+                user_id = found[0] if found else None
+            return user_id
+        
+        # Step 1: Get user ID from username (user IDs never change)
+        user_id = saved_user_id() if incremental or stale or not self.client.online else None
+        if not user_id:
+            with self.client.deadline(deadline), profiler.stage('resolve'):
+                user_id = self.get_user_id(username)
+            if not user_id and not self.client.online:
+                user_id = saved_user_id()
+        if not user_id:
+            if deadline.expired():
+                raise LookupFailed(f"Timed out resolving '{username}'")
+            if not self.client.online:
+                raise LookupFailed(f"Roblox is unreachable and '{username}' hasn't been looked up before")
+            raise LookupFailed(f"User '{username}' not found")
+        snapshots.remember_user_id(username, user_id)
+        
+        def run_stage(name, fetcher, stage_deadline):
+            """Run one stage within its budget, reusing a fresh snapshot field when allowed"""
+            if incremental:
+                fresh, value = snapshots.get_fresh(user_id, name)
+                if fresh:
+                    reused.append(name)
+                    if name == 'games' and value and self.client.online:
+                        # The game list rarely changes but its player counts do; one multiget refreshes them
+                        with self.client.deadline(stage_deadline), profiler.stage('game stats'):
+                            self.refresh_game_stats(value)
+                    return value
+            if stale or not self.client.online:
+                found, value = serve_stale(name)
+                if found:
+                    return value
+            with self.client.deadline(stage_deadline), self.client.circuit_log() as rejected, profiler.stage(name):
+                value = fetcher()
+            if not self.client.online:
+                # The network went down during this lookup; what the stage got is empty or partial
+                found, saved = serve_stale(name)
+                if found:
+                    return saved
+            if rejected:
+                # Partial as well; an open circuit skipped part of this stage
+                degraded[name] = sorted(set(rejected))
+            elif stage_deadline.expired():
+                # Possibly partial, so show it but don't keep it as the user's snapshot
+                timed_out.add(name)
+            elif value is not None and self.client.online and getattr(value, 'complete', True):
+                # A result missing data because a request failed is shown but never kept as fresh
+                snapshots.put(user_id, name, value)
+            refreshed.append(name)
+            return value
+        
+        # Group count and owned groups come from a single group roles request
+        def fetch_groups():
+            group_roles = self.get_group_roles(user_id)
+            if group_roles is None:
+                return None
+            return {'groups_count': len(group_roles),
+                    'owned_groups': self.get_owned_groups(user_id, group_roles)}
+        
+        # Alt detection needs the profile, so it waits for that stage first
+        def fetch_alts():
+            profile = stage_futures['profile'].result(timeout=deadline.remaining())
+            if not profile:
+                return None
+            # Shared groups are scored against the user's memberships, which the groups stage fetches
+            if 'groups' in stage_futures:
+                futures.wait([stage_futures['groups']], timeout=deadline.remaining())
+            if on_status:
+                on_status("Analyzing friends for alt accounts...")
+            return self.detect_alt_accounts(user_id, profile)
+        
+        # Steps 2-7 run in parallel, each limited to its share of the remaining budget
+        stages = [
+            ('profile', lambda: self.get_user_info(user_id)),
+            ('social', lambda: self.get_social_counts(user_id)),
+            ('presence', lambda: self.get_presence_info(user_id)),
+            ('groups', fetch_groups),
+            ('games', lambda: self.get_owned_games(user_id)),
+            ('avatar', lambda: self.get_avatar(user_id)),
+        ]
+        if check_alts:
+            stages.append(('alt_accounts', fetch_alts))
+        stage_futures = {}
+        skipped = set() if check_alts else {'alt_accounts'}
+        for name, fetcher in stages:
+            if name in skip and name != 'profile':
+                skipped.add(name)
+                continue
+            stage_futures[name] = self.executor.submit(run_stage, name, fetcher,
+                                                       deadline.share(STAGE_BUDGET_SHARES[name]))
+        
+        done, _ = futures.wait(stage_futures.values(), timeout=deadline.remaining())
+        results = {}
+        for name, future in stage_futures.items():
+            if future in done and future.exception() is None:
+                results[name] = future.result()
+            else:
+                timed_out.add(name)
+                results[name] = None
+        
+        user_info = results['profile']
+        if not user_info:
+            if not self.client.online:
+                raise LookupFailed(f"Roblox is unreachable and no saved profile of '{username}' is available")
+            if 'profile' not in timed_out:
+                raise LookupFailed("Failed to fetch user information")
+            user_info = UserRecord(user_id, username)
+        
+        groups = results.get('groups') or {}
+        additional_info = {
+            'social': results.get('social'),
+            'presence': results.get('presence'),
+            'groups_count': groups.get('groups_count'),
+            'owned_groups': groups.get('owned_groups', []),
+            'owned_games': results.get('games') or [],
+            'alt_accounts': results.get('alt_accounts') or [],
+            'timed_out': timed_out,
+            'degraded': dict(degraded),
+            'skipped': skipped,
+            'stale': dict(stale_stages),
+            'offline': not self.client.online,
+        }
+        avatar = results.get('avatar')
+        
+        if incremental:
+            additional_info['refresh_summary'] = (f"reused {', '.join(reused) or 'nothing'}; "
+                                                  f"refreshed {', '.join(refreshed) or 'nothing'}")
+        
+        if self.history is not None and self.client.online:
+            # Only stats fetched in full just now are new points; reused snapshots were recorded before
+            fetched = set(refreshed) - timed_out - set(degraded)
+            values = {}
+            if 'social' in fetched and additional_info['social']:
+                values.update(additional_info['social'].to_dict())
+            if 'groups' in fetched:
+                values['groups'] = additional_info['groups_count']
+            if 'presence' in fetched and additional_info['presence']:
+                values['presence'] = additional_info['presence'].presence
+            try:
+                additional_info['changes'] = self.history.record(user_id, values)
+            except Exception as e:
+                print(f"Error recording stats history: {e}")
+        
+        return user_info, additional_info, avatar
+    
+    def get_user_id(self, username):
+        """Get user ID from username"""
+        try:
+            url = "https://users.roblox.com/v1/usernames/users"
+            payload = {
+                "usernames": [username],
+                "excludeBannedUsers": False
+            }
+            response = self.client.post(url, json=payload, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get("data") and len(data["data"]) > 0:
+                user = data["data"][0]
+                if self.username_index is not None:
+                    self._index_usernames([(user["id"], user.get("name"))])
+                return user["id"]
+            return None
+        except Exception as e:
+            print(f"Error getting user ID: {e}")
+            return None
+    
+    def get_user_info(self, user_id):
+        """Get basic user information as a UserRecord"""
+        try:
+            url = f"https://users.roblox.com/v1/users/{user_id}"
+            response = self.client.get(url, timeout=10)
+            response.raise_for_status()
+            user = UserRecord.from_json(response.json())
+            if self.username_index is not None:
+                self._index_usernames([(user.id, user.name)])
+                if user.created is not None and self.username_index.set_created([(user.id, user.created)]):
+                    self.creation_index.add(user.id, user.created)
+            return user
+        except Exception as e:
+            print(f"Error getting user info: {e}")
+            return None
+    
+    def get_additional_user_info(self, user_id):
+        """Get additional user information like friends count, badges, etc."""
+        group_roles = self.get_group_roles(user_id)
+        return {
+            'social': self.get_social_counts(user_id),
+            'groups_count': len(group_roles) if group_roles is not None else None,
+            'presence': self.get_presence_info(user_id),
+        }
+    
+    def get_social_counts(self, user_id):
+        """Get friends, followers, following and badges counts"""
+        counts = SocialCounts()
+        endpoints = [
+            ('friends', f"https://friends.roblox.com/v1/users/{user_id}/friends/count"),
+            ('followers', f"https://friends.roblox.com/v1/users/{user_id}/followers/count"),
+            ('following', f"https://friends.roblox.com/v1/users/{user_id}/followings/count"),
+            ('badges', f"https://badges.roblox.com/v1/users/{user_id}/badges/count"),
+        ]
+        for key, url in endpoints:
+            try:
+                response = self.client.get(url, timeout=10)
+                if response.status_code == 200:
+                    setattr(counts, key, response.json().get('count', 0))
+            except:
+                pass
+        return counts
+    
+    def get_group_roles(self, user_id):
+        """Get the user's group memberships as GroupRecords, or None on failure"""
+        try:
+            url = f"https://groups.roblox.com/v1/users/{user_id}/groups/roles"
+            response = self.client.get(url, timeout=10)
+            if response.status_code == 200:
+                groups = [GroupRecord.from_json(group_role) for group_role in response.json().get('data', [])]
+                self.group_index.set_memberships(user_id, groups)
+                return groups
+        except Exception as e:
+            print(f"Error getting group roles: {e}")
+        return None
+    
+    def group_memberships(self, user_id):
+        """Ids of the groups a user is in, from the membership index while fresh, otherwise fetched"""
+        groups = self.group_index.fresh_groups(user_id, FIELD_REFRESH_INTERVALS['groups'])
+        if groups is None and self.get_group_roles(user_id) is not None:
+            groups = self.group_index.fresh_groups(user_id, FIELD_REFRESH_INTERVALS['groups'])
+        return groups or set()
+    
+    def stats_history(self, user_id, days=HISTORY_DAYS, interval=HISTORY_INTERVAL):
+        """The user's recorded social stats over the last days, one StatsPoint per interval; sends no requests"""
+        if self.history is None:
+            return []
+        return self.history.downsample(user_id, time.time() - days * 86400, interval=interval)
+    
+    def known_friends(self, user_id):
+        """Friends of a user seen by earlier alt checks, sorted by name; sends no requests"""
+        if self.username_index is None:
+            return []
+        names = self.username_index.names(self.username_index.friends_of(user_id))
+        return sorted((UserRecord(friend_id, name) for friend_id, name in names.items()),
+                      key=lambda friend: (friend.name or '').lower())
+    
+    def get_presence_info(self, user_id):
+        """Get the user's presence, last location and current game as a PresenceRecord"""
+        try:
+            url = f"https://presence.roblox.com/v1/presence/users"
+            payload = {"userIds": [user_id]}
+            response = self.client.post(url, json=payload, timeout=10)
+            if response.status_code == 200:
+                presence_data = response.json().get('userPresences', [])
+                if presence_data:
+                    presence = PresenceRecord.from_json(presence_data[0])
+                    
+                    # Get current game if user is playing
+                    if presence.presence in ('InGame', 'InStudio'):
+                        if presence.universe_id:
+                            # Get game name from universe ID
+                            game_name = self.get_game_name(presence.universe_id)
+                            if game_name:
+                                presence.current_game = f"{game_name} (Universe: {presence.universe_id})"
+                            else:
+                                presence.current_game = f"Universe: {presence.universe_id}"
+                        elif presence.place_id:
+                            presence.current_game = f"Place: {presence.place_id}"
+                    return presence
+        except Exception as e:
+            print(f"Error getting presence: {e}")
+        return None
+    
+    def get_game_name(self, universe_id):
+        """Get game name from universe ID"""
+        try:
+            url = f"https://games.roblox.com/v1/games?universeIds={universe_id}"
+            response = self.client.get(url, timeout=5)
+            if response.status_code == 200:
+                data = response.json().get('data', [])
+                if data:
+                    return data[0].get('name', None)
+        except Exception as e:
+            print(f"Error getting game name: {e}")
+        return None
+    
+    def get_owned_groups(self, user_id, group_roles=None):
+        """Get groups owned by the user, reusing already fetched group roles if given"""
+        if group_roles is None:
+            group_roles = self.get_group_roles(user_id) or []
+        return [group for group in group_roles if group.rank == 255]  # Owner rank
+    
+    def get_owned_games(self, user_id, cursor=None):
+        """Get one page of the games/experiences created by the user, with current stats"""
+        owned_games = ResultPage(complete=False)
+        try:
+            url = f"https://games.roblox.com/v2/users/{user_id}/games"
+            params = {"accessFilter": "2", "limit": str(OWNED_GAMES_PAGE_SIZE), "sortOrder": "Asc"}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(url, params=params, timeout=10, stream=True)
+            if response.status_code == 200:
+                page = response.iter_items('data')
+                games = [GameRecord.from_json(game) for game in page]
+                owned_games = ResultPage(games, page.fields.get('nextPageCursor'))
+        except Exception as e:
+            print(f"Error getting owned games: {e}")
+        # The list endpoint has no player counts, so fill them in for the whole page at once
+        if not self.refresh_game_stats(owned_games):
+            owned_games.complete = False
+        return owned_games
+    
+    def refresh_game_stats(self, games):
+        """Update the visits and player counts of GameRecords in place, GAME_STATS_BATCH_SIZE per request.
+        
+        Returns False if a request failed, leaving some games with their old counts.
+        """
+        by_id = {game.id: game for game in games}
+        ids = list(by_id)
+        refreshed = True
+        for start in range(0, len(ids), GAME_STATS_BATCH_SIZE):
+            try:
+                response = self.client.get("https://games.roblox.com/v1/games", params={
+                    "universeIds": ",".join(str(universe_id) for universe_id in ids[start:start + GAME_STATS_BATCH_SIZE])
+                }, timeout=10)
+                response.raise_for_status()
+                for data in response.json().get('data', []):
+                    game = by_id.get(data.get('id'))
+                    if game is not None:
+                        game.playing = data.get('playing') or 0
+                        game.visits = data.get('visits') or game.visits
+            except Exception as e:
+                print(f"Error refreshing game stats: {e}")
+                refreshed = False
+        return refreshed
+    
+    def detect_alt_accounts(self, user_id, user_info):
+        """Detect possible alt accounts by analyzing friends, and similar usernames outside the friend list"""
+        potential_alts = []
+        try:
+            # Get friends list (limited to first 100 for performance)
+            url = f"https://friends.roblox.com/v1/users/{user_id}/friends?userSort=0&limit=100"
+            response = self.client.get(url, timeout=15, stream=True)
+            if response.status_code != 200:
+                return None
+            
+            # Take the first 50 friends as the list downloads (limited for performance)
+            deadline = self.client.current_deadline()
+            friends = response.iter_items('data')
+            seen = []
+            for checked, friend in enumerate(friends):
+                if checked >= 50 or (deadline is not None and deadline.expired()):
+                    friends.close()
+                    break
+                seen.append(friend)
+            if self.username_index is not None:
+                self.username_index.add_friends(user_id, [friend.get('id') for friend in seen])
+            
+            # Shared groups only count if the user is in any, so otherwise no candidate's groups are fetched
+            user_groups = self.group_memberships(user_id)
+            
+            # All candidates' profiles come from one multi-ID request instead of one request per friend
+            candidates = [(friend, None) for friend in seen]
+            if self.username_index is not None:
+                # Accounts beyond the friends checked above that the indexes rank as likely alts
+                checked_ids = {friend.get('id') for friend in seen}
+                candidates += [({'id': ranked.id, 'name': ranked.username}, "Found in the user index") for ranked in
+                               self.rank_alt_candidates(user_info, limit=INDEX_ALT_CANDIDATES, exclude=checked_ids)]
+            profiles = self._candidate_profiles([data for data, _ in candidates])
+            notes = {data.get('id'): note for data, note in candidates if data.get('id') in profiles}
+            
+            def score(candidate_id):
+                return self._score_alt_candidate(user_info, profiles[candidate_id], notes[candidate_id])
+            
+            # Points a check could still add once its request is made
+            profile_points = (3 if user_info.created is not None else 0) + (2 if user_info.description else 0)
+            group_points = 2 if user_groups else 0
+            
+            # Full profiles, in parallel, for candidates the creation date and description could still lift
+            scores = {candidate_id: score(candidate_id) for candidate_id in notes}
+            missing = [candidate_id for candidate_id, alt in scores.items()
+                       if profiles[candidate_id].created is None
+                       and alt.score < ALT_SCORE_THRESHOLD <= alt.score + profile_points + group_points]
+            for candidate_id, profile in zip(missing, self._run_all(self.get_user_info, missing)):
+                if profile is not None:
+                    profiles[candidate_id] = profile
+                    scores[candidate_id] = score(candidate_id)
+            
+            # Then groups, in parallel, for candidates shared groups could still lift that aren't in the index yet
+            if group_points and not (deadline is not None and deadline.expired()):
+                missing = [candidate_id for candidate_id, alt in scores.items()
+                           if alt.score < ALT_SCORE_THRESHOLD <= alt.score + group_points
+                           and self.group_index.fresh_groups(candidate_id, FIELD_REFRESH_INTERVALS['groups']) is None]
+                self._run_all(self.group_memberships, missing)
+                for candidate_id in missing:
+                    scores[candidate_id] = score(candidate_id)
+            potential_alts = [alt for alt in scores.values() if alt.score >= ALT_SCORE_THRESHOLD]
+            
+            # Sort by score (highest first)
+            potential_alts.sort(key=lambda alt: alt.score, reverse=True)
+            
+        except Exception as e:
+            print(f"Error detecting alt accounts: {e}")
+            return None
+        
+        return potential_alts
+    
+    def _candidate_profiles(self, candidates):
+        """UserRecords for alt candidates given as friend list items ({'id', 'name', ...}), by id.
+        
+        Names come from one users request per USERS_BATCH_SIZE candidates, which also
+        drops deleted accounts. That endpoint has no creation dates or descriptions, so
+        those are taken from the friend list items where it has them and otherwise from
+        the user index; any still missing are left for detect_alt_accounts to fetch.
+        """
+        by_id = {data.get('id'): data for data in candidates if data.get('id')}
+        users = self.get_users(by_id)
+        known_created = self.username_index.created(by_id) if self.username_index is not None else {}
+        listed_created = []
+        profiles = {}
+        for candidate_id, user in users.items():
+            data = by_id.get(candidate_id, {})
+            created = _parse_timestamp(data.get('created'))
+            if created is not None:
+                listed_created.append((candidate_id, created))
+            else:
+                created = known_created.get(candidate_id)
+            profiles[candidate_id] = UserRecord(candidate_id, user.name or data.get('name') or '', user.display_name,
+                                                data.get('description') or "", created, verified=user.verified)
+        if self.username_index is not None and listed_created:
+            for candidate_id in self.username_index.set_created(listed_created):
+                self.creation_index.add(candidate_id, dict(listed_created)[candidate_id])
+        return profiles
+    
+    def _run_all(self, function, items):
+        """function(item) for every item, in parallel on the executor under this thread's deadline; results in order.
+        
+        Items no worker has started yet are run on this thread instead, so a stage
+        waiting here can't deadlock a pool whose workers are all busy with stages.
+        """
+        deadline = self.client.current_deadline()
+        
+        def call(item):
+            with self.client.deadline(deadline):
+                return function(item)
+        
+        submitted = [self.executor.submit(call, item) for item in items]
+        return [call(item) if future.cancel() else future.result() for future, item in zip(submitted, items)]
+    
+    def _score_alt_candidate(self, user_info, candidate_info, note=None):
+        """Score one account against the user as an AltCandidate; sends no requests.
+        
+        Shared groups only count once both accounts' groups are in the group index.
+        """
+        user_created = user_info.created
+        user_username = (user_info.name or '').lower()
+        user_description = (user_info.description or '').lower()
+        candidate_id = candidate_info.id
+        candidate_name = (candidate_info.name or '').lower()
+        candidate_created = candidate_info.created
+        candidate_description = (candidate_info.description or '').lower()
+        
+        score = 0
+        reasons = [note] if note else []
+        
+        # Check 1: Similar creation date (within 30 days)
+        if user_created is not None and candidate_created is not None:
+            days_diff = abs(user_created - candidate_created) // 86400
+            if days_diff <= 30:
+                score += 3
+                reasons.append(f"Created {days_diff} days apart")
+        
+        # Check 2: Similar username patterns
+        similarity = difflib.SequenceMatcher(None, user_username, candidate_name).ratio()
+        if similarity > 0.6:
+            score += 2
+            reasons.append(f"Similar username ({similarity:.0%} match)")
+        
+        # Check 3: Common username patterns (numbers, underscores, etc.)
+        user_base = _username_base(user_username)
+        candidate_base = _username_base(candidate_name)
+        if user_base and candidate_base and user_base == candidate_base:
+            score += 3
+            reasons.append("Same base username with variations")
+        
+        # Check 4: Similar descriptions
+        if user_description and candidate_description:
+            desc_similarity = difflib.SequenceMatcher(None, user_description[:50], candidate_description[:50]).ratio()
+            if desc_similarity > 0.7:
+                score += 2
+                reasons.append("Similar description")
+        
+        # Check 5: Shared groups, weighted by how rare each group is
+        weight, shared = self.group_index.overlap(user_info.id, candidate_id)
+        if weight >= GROUP_OVERLAP_WEAK:
+            score += 2 if weight >= GROUP_OVERLAP_STRONG else 1
+            reasons.append(f"Shares {len(shared)} group(s) (rarity weight {weight:.1f})")
+        
+        return AltCandidate(candidate_info.name, candidate_id, score, reasons)
+    
+    def rank_alt_candidates(self, user_info, window_days=30, limit=20, exclude=()):
+        """Rank possible alts across every indexed account without any API requests.
+        
+        Combines username similarity, creation within window_days of the user,
+        shared groups, friendship and mutual friends; returns AltCandidates, best first.
+        """
+        index = self.username_index
+        if index is None:
+            return []
+        friends = index.friends_of(user_info.id)
+        similar = {match.id: match for match in index.similar(user_info.name or '', limit=200)}
+        nearby = {}
+        if user_info.created is not None:
+            nearby = {candidate_id: created for created, candidate_id in
+                      self.creation_index.near(user_info.created, window_days * 86400, limit=RANK_WINDOW_CANDIDATES)}
+        co_members = self.group_index.co_members(user_info.id)
+        candidates = (set(similar) | set(nearby) | set(co_members) | friends) - {user_info.id} - set(exclude)
+        created = index.created(candidates - set(nearby))
+        created.update(nearby)
+        names = index.names(candidates)
+        
+        ranked = []
+        for candidate_id in candidates:
+            score = 0
+            reasons = []
+            if user_info.created is not None and candidate_id in created:
+                days_diff = abs(user_info.created - created[candidate_id]) // 86400
+                if days_diff <= window_days:
+                    score += 3
+                    reasons.append(f"Created {days_diff} days apart")
+            match = similar.get(candidate_id)
+            if match and match.similarity > 0.6:
+                score += 2
+                reasons.append(f"Similar username ({match.similarity:.0%} match)")
+            if match and match.same_base:
+                score += 3
+                reasons.append("Same base username with variations")
+            weight = co_members.get(candidate_id, 0)
+            if weight:
+                score += 2 if weight >= GROUP_OVERLAP_STRONG else 1
+                reasons.append(f"Shares groups (rarity weight {weight:.1f})")
+            if candidate_id in friends:
+                score += 1
+                reasons.append("Friends with the user")
+            # Mutual friends only count once something else already points at the account
+            if score >= 3:
+                mutual = len(friends & index.friends_of(candidate_id))
+                if mutual >= 2:
+                    score += 1
+                    reasons.append(f"{mutual} mutual friends")
+            if score >= 4:
+                ranked.append(AltCandidate(names.get(candidate_id), candidate_id, score, reasons))
+        ranked.sort(key=lambda alt: alt.score, reverse=True)
+        return ranked[:limit]
+    
+    def get_avatar_url(self, user_id):
+        """Get user avatar URL using current Roblox API"""
+        try:
+            # Updated endpoint: /v1/users/avatar instead of /v1/users/avatar-headshot
+            url = f"https://thumbnails.roblox.com/v1/users/avatar?userIds={user_id}&size=150x150&format=Png&isCircular=false"
+            response = self.client.get(url, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            if data.get("data") and len(data["data"]) > 0:
+                return data["data"][0]["imageUrl"]
+        except Exception as e:
+            print(f"Error getting avatar: {e}")
+        return None
+    
+    def get_avatar(self, user_id):
+        """Get the avatar URL and download the image so the UI thread never blocks on it"""
+        avatar_url = self.get_avatar_url(user_id)
+        if not avatar_url:
+            return None
+        avatar = {'url': avatar_url, 'image': None}
+        try:
+            response = self.client.get(avatar_url, timeout=10)
+            response.raise_for_status()
+            avatar['image'] = response.content
+        except (requests.RequestException, ApiError) as e:
+            print(f"Avatar fetch error: {e}")
+            avatar['error'] = str(e)
+        return avatar
+    
+    def search_servers(self, game_id, username, on_progress=None, profiler=None):
+        """Search a game's public servers for a user.
+        
+        Returns (result_text, server_rows); on_progress receives progress messages.
+        """
+        progress = on_progress or (lambda message: None)
+        profiler = profiler or NULL_PROFILER
+        # Get user ID (user IDs never change, so reuse one resolved earlier)
+        user_id = self.snapshots.known_user_id(username)
+        if not user_id:
+            with profiler.stage('resolve'):
+                user_id = self.get_user_id(username)
+        if not user_id:
+            return f"Error: User '{username}' not found", []
+        self.snapshots.remember_user_id(username, user_id)
+        
+        # Get game servers
+        progress("Fetching server list...")
+        
+        with profiler.stage('servers'):
+            servers = self.get_game_servers(game_id)
+        if not servers:
+            return "No servers found or error fetching servers", []
+        
+        total_servers = len(servers)
+        progress(f"Found {total_servers} servers. Checking player lists...")
+        
+        # First, verify user is actually in this game using presence API
+        with profiler.stage('presence'):
+            presence_info = self.check_user_presence_in_game(user_id, game_id)
+        user_in_game = presence_info and presence_info.get('in_game')
+        
+        if not user_in_game:
+            return f"✗ User is not currently playing this game (Universe ID: {game_id})", []
+        
+        # Check each server for the user
+        found_servers = []
+        checked = 0
+        
+        for server in servers:
+            checked += 1
+            # Progress updates are merged by the UI queue, so every server can report
+            progress(f"Checked {checked}/{total_servers} servers...")
+            
+            server_id = server.get('id')
+            server_token = server.get('token')  # Some APIs use token instead of id
+            with profiler.stage('scan server'):
+                user_found = self._server_has_user(server, user_id, game_id)
+            
+            if user_found:
+                found_servers.append({
+                    'server_id': server_id or server_token or 'N/A',
+                    'player_count': server.get('playing', server.get('playerCount', 0)),
+                    'max_players': server.get('maxPlayers', server.get('maxPlayers', 'N/A')),
+                    'fps': server.get('fps', 'N/A'),
+                    'ping': server.get('ping', 'N/A')
+                })
+        
+        # Update result
+        if found_servers:
+            result_text = f"✓ Found user in {len(found_servers)} server(s)"
+            server_rows = found_servers
+        else:
+            # Alternative approach: If user is confirmed in game, show all servers as potential matches
+            if user_in_game and total_servers > 0:
+                result_text = f"⚠ User is confirmed to be in this game (Universe ID: {game_id})\n"
+                result_text += f"but Roblox API doesn't provide player lists for privacy reasons.\n"
+                result_text += f"Found {total_servers} public server(s). User is likely in one of these.\n"
+                result_text += "Click a server to copy its ID."
+                server_rows = [{
+                    'server_id': server.get('id') or server.get('token') or 'N/A',
+                    'player_count': server.get('playing', server.get('playerCount', 0)),
+                    'max_players': server.get('maxPlayers', 'N/A'),
+                    'fps': round(server['fps'], 1) if isinstance(server.get('fps'), (int, float)) else 'N/A',
+                    'ping': server.get('ping', 'N/A')
+                } for server in servers]
+            else:
+                server_rows = []
+                result_text = f"✗ User not found in any of the {total_servers} checked servers.\n\n"
+                if user_in_game:
+                    result_text += f"Note: User is confirmed to be in this game (Universe ID: {game_id}), "
+                    result_text += "but could not be found in public server player lists.\n"
+                    result_text += "Possible reasons:\n"
+                    result_text += "  • User is in a private/VIP server\n"
+                    result_text += "  • Roblox API doesn't provide full player lists for privacy\n"
+                    result_text += "  • Server player data format differs from expected\n"
+                else:
+                    result_text += "Note: The user might be in a private server, or the server list may be incomplete."
+        
+        return result_text, server_rows
+    
+    def _server_has_user(self, server, user_id, game_id):
+        """Check whether a server's player data contains the user"""
+        server_id = server.get('id')
+        server_token = server.get('token')  # Some APIs use token instead of id
+        
+        # Check if user is in this server using multiple methods
+        user_found = False
+        
+        # Method 1: Check playerTokens - these might be user IDs or session tokens
+        player_tokens = server.get('playerTokens', [])
+        if player_tokens:
+            # playerTokens could be:
+            # 1. Direct user IDs (as integers)
+            # 2. Session tokens (strings) that need resolution
+            # 3. User IDs as strings
+            for token in player_tokens:
+                try:
+                    # Try direct integer comparison
+                    if isinstance(token, int) and token == int(user_id):
+                        user_found = True
+                        break
+                    # Try string to int conversion
+                    elif isinstance(token, str) and token.isdigit():
+                        if int(token) == int(user_id):
+                            user_found = True
+                            break
+                    # Try as string comparison
+                    elif str(token) == str(user_id):
+                        user_found = True
+                        break
+                except (ValueError, TypeError):
+                    # If token format is unexpected, try to resolve it
+                    resolved_id = self.resolve_player_token(token)
+                    if resolved_id and int(resolved_id) == int(user_id):
+                        user_found = True
+                        break
+        
+        # Method 2: Check if server data includes player list with user IDs
+        if not user_found:
+            player_list = server.get('players', [])
+            if player_list:
+                for player in player_list:
+                    # Try different possible keys for user ID
+                    player_id = (player.get('id') or 
+                               player.get('userId') or 
+                               player.get('user_id') or
+                               player.get('Id'))
+                    if player_id and str(player_id) == str(user_id):
+                        user_found = True
+                        break
+        
+        # Method 3: Try to get players from server endpoint
+        if not user_found and (server_id or server_token):
+            players = self.get_server_players(server_id or server_token, game_id)
+            if players:
+                for player in players:
+                    # Handle both dict and direct ID formats
+                    if isinstance(player, dict):
+                        player_id = (player.get('id') or 
+                                   player.get('userId') or 
+                                   player.get('user_id') or
+                                   player.get('Id'))
+                    else:
+                        # If player is just an ID/token
+                        player_id = player
+        
+                    if player_id and str(player_id) == str(user_id):
+                        user_found = True
+                        break
+        
+        # Method 4: Try to use game place endpoint to get player info
+        # Some games expose player data through their place page
+        if not user_found and (server_id or server_token):
+            place_players = self.get_place_players(game_id, server_id or server_token)
+            if place_players:
+                for player in place_players:
+                    player_id = (player.get('id') or 
+                               player.get('userId') or 
+                               player.get('user_id'))
+                    if player_id and str(player_id) == str(user_id):
+                        user_found = True
+                        break
+        return user_found
+    
+    def get_game_servers(self, universe_id):
+        """Get list of public servers for a game"""
+        servers = []
+        try:
+            url = f"https://games.roblox.com/v1/games/{universe_id}/servers/Public"
+            params = {
+                "sortOrder": "Asc",
+                "limit": "100"  # Get up to 100 servers
+            }
+            response = self.client.get(url, params=params, timeout=10, stream=True)
+            if response.status_code == 200:
+                servers = list(response.iter_items('data'))
+                # Debug: Print first server structure to understand data format
+                if servers and len(servers) > 0:
+                    print(f"DEBUG: First server structure keys: {servers[0].keys()}")
+                    print(f"DEBUG: First server playerTokens type: {type(servers[0].get('playerTokens'))}")
+        except Exception as e:
+            print(f"Error getting game servers: {e}")
+        return servers
+    
+    def get_server_players(self, server_id, universe_id=None):
+        """Get list of players in a specific server"""
+        try:
+            # Try different possible endpoints
+            endpoints = []
+            if universe_id:
+                endpoints.append(f"https://games.roblox.com/v1/games/{universe_id}/servers/{server_id}")
+            endpoints.extend([
+                f"https://games.roblox.com/v1/games/servers/{server_id}",
+                f"https://games.roblox.com/v1/games/{server_id}/servers",
+            ])
+            
+            for url in endpoints:
+                try:
+                    response = self.client.get(url, timeout=5)
+                    if response.status_code == 200:
+                        data = response.json()
+                        # Try different possible keys for player data
+                        players = (data.get('players') or 
+                                 data.get('data', {}).get('players') or
+                                 data.get('playerTokens') or
+                                 data.get('data', {}).get('playerTokens') or
+                                 [])
+                        if players:
+                            return players if isinstance(players, list) else []
+                except:
+                    continue
+        except Exception as e:
+            print(f"Error getting server players: {e}")
+        return None
+    
+    def resolve_player_token(self, token):
+        """Try to resolve a player token to a user ID"""
+        # Player tokens might already be user IDs, or we might need to resolve them
+        # For now, return the token as-is if it looks like a number
+        try:
+            if isinstance(token, (int, str)) and str(token).isdigit():
+                return int(token)
+        except:
+            pass
+        return None
+    
+    def check_user_presence_in_game(self, user_id, universe_id):
+        """Check if user is currently in a specific game"""
+        try:
+            url = f"https://presence.roblox.com/v1/presence/users"
+            payload = {"userIds": [user_id]}
+            response = self.client.post(url, json=payload, timeout=5)
+            if response.status_code == 200:
+                presence_data = response.json().get('userPresences', [])
+                if presence_data:
+                    presence = presence_data[0]
+                    # Check if user is in the game (universeId matches)
+                    if str(presence.get('universeId')) == str(universe_id):
+                        return {'in_game': True, 'presence': presence}
+        except Exception as e:
+            print(f"Error checking presence: {e}")
+        return None
+    
+    def get_place_players(self, universe_id, server_id):
+        """Try to get players from game place endpoint (alternative method)"""
+        try:
+            # Try to get place ID from universe
+            url = f"https://games.roblox.com/v1/games?universeIds={universe_id}"
+            response = self.client.get(url, timeout=5)
+            if response.status_code == 200:
+                data = response.json().get('data', [])
+                if data:
+                    place_id = data[0].get('rootPlaceId')
+                    if place_id:
+                        # Try to get player info from place (this may not work due to privacy)
+                        place_url = f"https://www.roblox.com/games/{place_id}"
+                        # Note: This would require web scraping which violates ToS
+                        # So we'll skip this approach
+                        pass
+        except Exception as e:
+            print(f"Error getting place players: {e}")
+        return None
+    
+    def get_user_ids(self, usernames):
+        """Resolve many usernames at once; returns {lowercase username: (user_id, name)}"""
+        resolved = {}
+        missing = []
+        for username in usernames:
+            user_id = self.snapshots.known_user_id(username)
+            if user_id:
+                resolved[username.lower()] = (user_id, username)
+            elif username.lower() not in resolved:
+                missing.append(username)
+        for start in range(0, len(missing), SWEEP_BATCH_SIZE):
+            try:
+                response = self.client.post("https://users.roblox.com/v1/usernames/users", json={
+                    "usernames": missing[start:start + SWEEP_BATCH_SIZE],
+                    "excludeBannedUsers": False
+                }, timeout=10)
+                response.raise_for_status()
+                users = response.json().get("data", [])
+            except Exception as e:
+                print(f"Error getting user IDs: {e}")
+                continue
+            for user in users:
+                name = user.get("name") or user.get("requestedUsername")
+                requested = user.get("requestedUsername") or name
+                resolved[requested.lower()] = (user["id"], name)
+                self.snapshots.remember_user_id(requested, user["id"])
+            if self.username_index is not None:
+                self._index_usernames([(user["id"], user.get("name")) for user in users])
+        return resolved
+    
+    def get_users(self, user_ids):
+        """Profiles of many users from the multi-ID users endpoint, USERS_BATCH_SIZE per request; {id: UserRecord}"""
+        ids = list(user_ids)
+        users = {}
+        for start in range(0, len(ids), USERS_BATCH_SIZE):
+            try:
+                response = self.client.post("https://users.roblox.com/v1/users", json={
+                    "userIds": ids[start:start + USERS_BATCH_SIZE],
+                    "excludeBannedUsers": False
+                }, timeout=10)
+                response.raise_for_status()
+                for data in response.json().get("data", []):
+                    users[data["id"]] = UserRecord(data["id"], data.get("name"), data.get("displayName"),
+                                                   verified=data.get("hasVerifiedBadge", False))
+            except Exception as e:
+                print(f"Error getting users: {e}")
+        if self.username_index is not None and users:
+            self._index_usernames([(user.id, user.name) for user in users.values()])
+        return users
+    
+    def iter_connection_pages(self, user_id, kind, cursor=None):
+        """Yield (rows, next cursor) for each page of a user's friends, followers or followings, from cursor on.
+        
+        Rows are dicts with the EXPORT_FIELDS; names are None where the list leaves them
+        out. Errors are raised, so an export can stop and resume from its last cursor.
+        """
+        url, limit, items_key, cursor_key = CONNECTION_LISTS[kind]
+        url = url.format(user_id)
+        while True:
+            params = {"limit": str(limit)}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(url, params=params, timeout=10, stream=True)
+            response.raise_for_status()
+            page = response.iter_items(items_key)
+            rows = [{'id': item.get('id'), 'name': item.get('name') or None,
+                     'display_name': item.get('displayName') or None, 'verified': item.get('hasVerifiedBadge')}
+                    for item in page]
+            cursor = page.fields.get(cursor_key)
+            yield rows, cursor
+            if not cursor:
+                return
+    
+    def get_headshot_urls(self, user_ids):
+        """Get headshot image URLs for many users, SWEEP_BATCH_SIZE per request; returns {user_id: url}"""
+        urls = {}
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), SWEEP_BATCH_SIZE):
+            try:
+                response = self.client.get("https://thumbnails.roblox.com/v1/users/avatar-headshot", params={
+                    "userIds": ",".join(str(user_id) for user_id in user_ids[start:start + SWEEP_BATCH_SIZE]),
+                    "size": SWEEP_HEADSHOT_SIZE,
+                    "format": "Png",
+                    "isCircular": "false"
+                }, timeout=10)
+                response.raise_for_status()
+                for item in response.json().get("data", []):
+                    if item.get("imageUrl"):
+                        urls[item["targetId"]] = item["imageUrl"]
+            except Exception as e:
+                print(f"Error getting headshots: {e}")
+        return urls
+    
+    def resolve_token_headshots(self, tokens):
+        """Resolve up to SWEEP_BATCH_SIZE server player tokens to headshot image URLs; returns {token: url}"""
+        payload = [{
+            "requestId": token,
+            "token": token,
+            "type": "AvatarHeadShot",
+            "size": SWEEP_HEADSHOT_SIZE,
+            "format": "Png",
+            "isCircular": False
+        } for token in tokens]
+        try:
+            response = self.client.post("https://thumbnails.roblox.com/v1/batch", json=payload, timeout=10)
+            response.raise_for_status()
+            return {item["requestId"]: item["imageUrl"] for item in response.json().get("data", [])
+                    if item.get("imageUrl")}
+        except Exception as e:
+            print(f"Error resolving player tokens: {e}")
+            return {}
+    
+    def iter_game_servers(self, universe_id, max_pages=SWEEP_MAX_PAGES):
+        """Yield every public server of a game, following nextPageCursor for up to max_pages pages"""
+        url = f"https://games.roblox.com/v1/games/{universe_id}/servers/Public"
+        cursor = None
+        for _ in range(max_pages):
+            params = {"sortOrder": "Asc", "limit": "100"}
+            if cursor:
+                params["cursor"] = cursor
+            try:
+                response = self.client.get(url, params=params, timeout=10, stream=True)
+                if response.status_code != 200:
+                    print(f"Error getting game servers: HTTP {response.status_code}")
+                    return
+                page = response.iter_items('data')
+                yield from page
+            except Exception as e:
+                print(f"Error getting game servers: {e}")
+                return
+            cursor = page.fields.get('nextPageCursor')
+            if not cursor:
+                return
+    
+    def sweep_servers(self, usernames, universe_ids, on_progress=None, profiler=None):
+        """Search the public servers of many games for many users in one pass.
+        
+        The targets' headshots are fetched once and every server's player tokens are
+        resolved in batches and looked up in a dict of those headshots, so the cost grows
+        with the number of servers and not with the number of targets.
+        Returns (result_text, hit_rows).
+        """
+        progress = on_progress or (lambda message: None)
+        profiler = profiler or NULL_PROFILER
+        with profiler.stage('resolve'):
+            resolved = self.get_user_ids(usernames)
+        if not resolved:
+            return "Error: none of the users were found", []
+        with profiler.stage('headshots'):
+            headshots = self.get_headshot_urls(user_id for user_id, _ in resolved.values())
+        targets_by_id = {user_id: name for user_id, name in resolved.values()}
+        targets_by_headshot = {url: user_id for user_id, url in headshots.items()}
+        
+        hits = {}  # (user_id, universe_id, server_id) -> row
+        counts = {'servers': 0, 'players': 0}
+        
+        def add_hit(user_id, universe_id, server):
+            row = {
+                'username': targets_by_id[user_id],
+                'user_id': user_id,
+                'universe_id': universe_id,
+                'server_id': server.get('id') or 'N/A',
+                'player_count': server.get('playing', 0),
+                'max_players': server.get('maxPlayers', 'N/A'),
+                'fps': round(server['fps'], 1) if isinstance(server.get('fps'), (int, float)) else 'N/A',
+                'ping': server.get('ping', 'N/A')
+            }
+            hits.setdefault((user_id, universe_id, row['server_id']), row)
+        
+        def flush(universe_id, pending):
+            with profiler.stage('match'):
+                urls = self.resolve_token_headshots(list(pending))
+            for token, url in urls.items():
+                user_id = targets_by_headshot.get(url)
+                if user_id is not None:
+                    for server in pending[token]:
+                        add_hit(user_id, universe_id, server)
+        
+        for universe_id in universe_ids:
+            pending = {}  # player token -> servers it was seen in
+            with profiler.stage('servers'):
+                for server in self.iter_game_servers(universe_id):
+                    counts['servers'] += 1
+                    for token in server.get('playerTokens') or []:
+                        counts['players'] += 1
+                        # Some servers list plain user IDs instead of tokens
+                        if str(token).isdigit() and int(token) in targets_by_id:
+                            add_hit(int(token), universe_id, server)
+                        else:
+                            pending.setdefault(token, []).append(server)
+                    for player in server.get('players') or []:
+                        player_id = player.get('id') or player.get('userId')
+                        if player_id in targets_by_id:
+                            add_hit(player_id, universe_id, server)
+                    if len(pending) >= SWEEP_BATCH_SIZE:
+                        flush(universe_id, pending)
+                        pending = {}
+                    progress(f"Universe {universe_id}: checked {counts['servers']} servers, "
+                             f"{counts['players']} players, {len(hits)} hits...")
+            if pending:
+                flush(universe_id, pending)
+        
+        rows = sorted(hits.values(), key=lambda row: (row['username'].lower(), str(row['universe_id'])))
+        found = {row['user_id'] for row in rows}
+        result_text = (f"{'✓' if rows else '✗'} Found {len(found)} of {len(targets_by_id)} user(s) in "
+                       f"{len(rows)} server(s); checked {counts['servers']} servers and "
+                       f"{counts['players']} players across {len(universe_ids)} universe(s)")
+        not_found = [name for name in usernames if name.lower() not in resolved]
+        if not_found:
+            result_text += f"\nUnknown usernames: {', '.join(not_found)}"
+        no_headshot = sorted(name for user_id, name in targets_by_id.items() if user_id not in headshots)
+        if no_headshot:
+            result_text += f"\nNo headshot to match (only found if listed by user ID): {', '.join(no_headshot)}"
+        return result_text, rows
+
+
+class ConnectionExport:
+    """Streams a user's friends, followers or followings into an NDJSON or CSV file.
+    
+    Pages are fetched on a background thread at most EXPORT_QUEUE_PAGES ahead of the
+    writer, so memory stays the same however long the list is and a slow disk holds
+    fetching back. After each page the file is flushed and the next cursor is saved
+    with the file size to FILE.cursor. Running the same export again resumes from
+    there, cutting off anything written after the save. The cursor file is removed
+    once the list is complete.
+    """
+    def __init__(self, engine, user_id, kind, path, csv_format=None, enrich=False):
+        if kind not in CONNECTION_LISTS:
+            raise ValueError(f"Unknown list {kind!r}; choose from {', '.join(CONNECTION_LISTS)}")
+        self.engine = engine
+        self.user_id = user_id
+        self.kind = kind
+        self.path = path
+        self.state_path = path + ".cursor"
+        self.csv_format = path.lower().endswith('.csv') if csv_format is None else csv_format
+        self.enrich = enrich
+        self.count = 0
+        self.pages = 0
+        self.resumed = False
+        self.finished = False
+    
+    def _load_state(self):
+        """The saved cursor state of an interrupted run of this same export, or None"""
+        try:
+            with open(self.state_path, encoding='utf-8') as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return None
+        if state.get('user_id') != self.user_id or state.get('kind') != self.kind or not os.path.exists(self.path):
+            return None
+        return state
+    
+    def _save_state(self, output, cursor):
+        output.flush()
+        state = {'user_id': self.user_id, 'kind': self.kind, 'cursor': cursor, 'count': self.count,
+                 'size': output.tell()}
+        with open(self.state_path + ".tmp", 'w', encoding='utf-8') as state_file:
+            json.dump(state, state_file)
+        os.replace(self.state_path + ".tmp", self.state_path)
+    
+    def _fetch_pages(self, cursor, pages, halt):
+        """Fetch (and enrich) pages into the bounded queue; put() blocks while the writer is behind"""
+        try:
+            for rows, next_cursor in self.engine.iter_connection_pages(self.user_id, self.kind, cursor):
+                if self.enrich and rows:
+                    profiles = self.engine.get_users(row['id'] for row in rows)
+                    for row in rows:
+                        profile = profiles.get(row['id'])
+                        if profile is not None:
+                            row.update(name=profile.name, display_name=profile.display_name,
+                                       verified=profile.verified)
+                pages.put((rows, next_cursor))
+                if halt.is_set():
+                    break
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(None)
+    
+    def run(self, on_progress=None, stop=None):
+        """Export until the list ends or stop (a threading.Event) is set; returns the rows written so far"""
+        import csv
+        
+        state = self._load_state()
+        cursor = None
+        if state:
+            with open(self.path, 'r+b') as partial:
+                partial.truncate(state['size'])
+            cursor, self.count, self.resumed = state['cursor'], state['count'], True
+        halt = threading.Event()
+        pages = queue.Queue(maxsize=EXPORT_QUEUE_PAGES)
+        fetcher = threading.Thread(target=self._fetch_pages, args=(cursor, pages, halt), daemon=True,
+                                   name=f"export-{self.kind}")
+        fetcher.start()
+        ended = False
+        try:
+            with open(self.path, 'a' if state else 'w', encoding='utf-8', newline='') as output:
+                writer = csv.DictWriter(output, EXPORT_FIELDS) if self.csv_format else None
+                if writer and not state:
+                    writer.writeheader()
+                while not (stop is not None and stop.is_set()):
+                    item = pages.get()
+                    if item is None:
+                        ended = self.finished = True
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    rows, cursor = item
+                    if writer:
+                        writer.writerows(rows)
+                    else:
+                        output.writelines(json.dumps(row, separators=(',', ':')) + "\n" for row in rows)
+                    self.count += len(rows)
+                    self.pages += 1
+                    if cursor:
+                        self._save_state(output, cursor)
+                    if on_progress:
+                        on_progress(self.count, cursor)
+        finally:
+            halt.set()
+            # Unblock the fetcher if it is waiting for room in the queue
+            while not ended:
+                ended = pages.get() is None
+        if self.finished and os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        return self.count
+
+
+# Thumbnail tiles: IDs per thumbnails request, how long a request waits for others to join
+# its batch, tile edge in pixels and the memory budget for decoded tiles
+THUMBNAIL_BATCH_SIZE = 100
+THUMBNAIL_BATCH_WINDOW = 0.05
+THUMBNAIL_TILE_SIZE = 60
+THUMBNAIL_CACHE_BYTES = 8 * 1024 * 1024
+THUMBNAIL_ENDPOINTS = {
+    'user': ("https://thumbnails.roblox.com/v1/users/avatar-headshot", "userIds"),
+    'game': ("https://thumbnails.roblox.com/v1/games/icons", "universeIds"),
+}
+
+
+class ImageCache:
+    """LRU cache of decoded PIL images whose total pixel data stays under max_bytes"""
+    def __init__(self, max_bytes=THUMBNAIL_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _cost(image):
+        width, height = image.size
+        return width * height * len(image.getbands())
+    
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+    
+    def put(self, key, image):
+        cost = self._cost(image)
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self.size -= self._cost(old)
+            if cost > self.max_bytes:
+                return
+            self._images[key] = image
+            self.size += cost
+            while self.size > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= self._cost(evicted)
+    
+    def __len__(self):
+        return len(self._images)
+
+
+class ThumbnailService:
+    """Loads user headshots and game icons for many tiles with few requests.
+    
+    Requests made within THUMBNAIL_BATCH_WINDOW of each other are sent as one multi-ID
+    thumbnails call. Images are downloaded and decoded to tile size on worker threads and
+    kept in a bounded ImageCache. Callbacks run on a worker thread and receive a PIL
+    image, or None when there is no thumbnail.
+    """
+    def __init__(self, client, tile_size=THUMBNAIL_TILE_SIZE, cache_bytes=THUMBNAIL_CACHE_BYTES, max_workers=4):
+        self.client = client
+        self.tile_size = tile_size
+        self.cache = ImageCache(cache_bytes)
+        self.max_workers = max_workers
+        self.batches = 0   # thumbnails API calls made
+        self._waiting = {}  # (kind, target_id) -> callbacks waiting for the image
+        self._queued = {kind: [] for kind in THUMBNAIL_ENDPOINTS}  # IDs not sent yet, oldest first
+        self._condition = threading.Condition()
+        self._executor = None
+        self._batcher = None
+    
+    def request(self, kind, target_id, callback):
+        """Call callback(image) once the thumbnail is loaded; cached ones are delivered at once"""
+        key = (kind, target_id)
+        image = self.cache.get(key)
+        if image is not None:
+            callback(image)
+            return
+        with self._condition:
+            callbacks = self._waiting.get(key)
+            if callbacks is not None:
+                callbacks.append(callback)
+                return
+            self._waiting[key] = [callback]
+            self._queued[kind].append(target_id)
+            if self._batcher is None:
+                self._executor = futures.ThreadPoolExecutor(max_workers=self.max_workers)
+                self._batcher = threading.Thread(target=self._run_batcher, daemon=True)
+                self._batcher.start()
+            self._condition.notify()
+    
+    def discard(self, kind, target_id, callback):
+        """Withdraw a callback; the ID is dropped from its batch if nobody else waits and it wasn't sent"""
+        key = (kind, target_id)
+        with self._condition:
+            callbacks = self._waiting.get(key)
+            if not callbacks or callback not in callbacks:
+                return
+            callbacks.remove(callback)
+            if not callbacks and target_id in self._queued[kind]:
+                self._queued[kind].remove(target_id)
+                del self._waiting[key]
+    
+    def _run_batcher(self):
+        while True:
+            with self._condition:
+                while not any(self._queued.values()):
+                    self._condition.wait()
+            # Give the rest of the visible tiles a moment to join the batch
+            time.sleep(THUMBNAIL_BATCH_WINDOW)
+            batches = []
+            with self._condition:
+                for kind, queued in self._queued.items():
+                    while queued:
+                        batches.append((kind, queued[:THUMBNAIL_BATCH_SIZE]))
+                        del queued[:THUMBNAIL_BATCH_SIZE]
+            for kind, target_ids in batches:
+                self._executor.submit(self._fetch_batch, kind, target_ids)
+    
+    def _fetch_batch(self, kind, target_ids):
+        url, id_param = THUMBNAIL_ENDPOINTS[kind]
+        image_urls = {}
+        try:
+            self.batches += 1
+            response = self.client.get(url, params={
+                id_param: ",".join(str(target_id) for target_id in target_ids),
+                "size": "150x150",
+                "format": "Png",
+                "isCircular": "false"
+            }, timeout=10)
+            response.raise_for_status()
+            image_urls = {item.get("targetId"): item.get("imageUrl") for item in response.json().get("data", [])}
+        except Exception as e:
+            print(f"Error getting thumbnails: {e}")
+        for target_id in target_ids:
+            if image_urls.get(target_id):
+                self._executor.submit(self._load_image, kind, target_id, image_urls[target_id])
+            else:
+                self._deliver((kind, target_id), None)
+    
+    def _load_image(self, kind, target_id, image_url):
+        image = None
+        try:
+            # Images are cached decoded, so keep the raw bytes out of the client's revalidation cache
+            response = self.client.get(image_url, timeout=10, conditional=False)
+            response.raise_for_status()
+            image = Image.open(BytesIO(response.content)).convert('RGBA')
+            image = image.resize((self.tile_size, self.tile_size), Image.Resampling.LANCZOS)
+            self.cache.put((kind, target_id), image)
+        except Exception as e:
+            print(f"Error loading thumbnail: {e}")
+        self._deliver((kind, target_id), image)
+    
+    def _deliver(self, key, image):
+        with self._condition:
+            callbacks = self._waiting.pop(key, [])
+        for callback in callbacks:
+            try:
+                callback(image)
+            except Exception as e:
+                print(f"Error delivering thumbnail: {e}")
+
+
+# Defaults for the lookup service (--serve) and for clients using it as a backend (--backend)
+DEFAULT_SERVICE_PORT = 8765
+DEFAULT_SERVICE_RATE_LIMIT = 10  # Roblox API requests per second, shared by every client of the service
+SERVICE_TIMEOUT_MARGIN = 5       # extra seconds a backend client waits beyond the lookup deadline
+SERVICE_SEARCH_TIMEOUT = 120
+SERVICE_MAX_DEADLINE = 60        # longer deadlines asked for are cut to this, so no request holds a worker for long
+# A request joins an identical one in flight only if that one's deadline ends at most this many
+# seconds before its own; otherwise it would get an answer cut short by the other's smaller budget
+SERVICE_COALESCE_SLACK = 0.25
+
+
+def _encode_lookup(user_info, additional_info, avatar):
+    """Turn a lookup result into JSON-ready data (the lookup service's wire format)"""
+    def records(items):
+        return [item.to_dict() for item in items]
+    
+    social = additional_info.get('social')
+    presence = additional_info.get('presence')
+    payload = {
+        'user': user_info.to_dict(),
+        'social': social.to_dict() if social else None,
+        'presence': presence.to_dict() if presence else None,
+        'groups_count': additional_info.get('groups_count'),
+        'owned_groups': records(additional_info.get('owned_groups', [])),
+        'owned_games': records(additional_info.get('owned_games', [])),
+        'owned_games_cursor': getattr(additional_info.get('owned_games'), 'next_cursor', None),
+        'alt_accounts': records(additional_info.get('alt_accounts', [])),
+        'timed_out': sorted(additional_info.get('timed_out', ())),
+        'skipped': sorted(additional_info.get('skipped', ())),
+        'degraded': additional_info.get('degraded', {}),
+        'stale': additional_info.get('stale', {}),
+        'offline': additional_info.get('offline', False),
+        'refresh_summary': additional_info.get('refresh_summary'),
+        'changes': ({field: list(change) for field, change in additional_info['changes'].items()}
+                    if 'changes' in additional_info else None),
+        'avatar': None,
+    }
+    if avatar:
+        image = avatar.get('image')
+        payload['avatar'] = {'url': avatar.get('url'), 'error': avatar.get('error'),
+                             'image': base64.b64encode(image).decode('ascii') if image else None}
+    return payload
+
+
+def _decode_lookup(payload):
+    """Rebuild (user_info, additional_info, avatar) from the lookup service's wire format"""
+    social = payload.get('social')
+    presence = payload.get('presence')
+    additional_info = {
+        'social': SocialCounts.from_dict(social) if social else None,
+        'presence': PresenceRecord.from_dict(presence) if presence else None,
+        'groups_count': payload.get('groups_count'),
+        'owned_groups': [GroupRecord.from_dict(group) for group in payload.get('owned_groups', [])],
+        'owned_games': ResultPage((GameRecord.from_dict(game) for game in payload.get('owned_games', [])),
+                                  payload.get('owned_games_cursor')),
+        'alt_accounts': [AltCandidate.from_dict(alt) for alt in payload.get('alt_accounts', [])],
+        'timed_out': set(payload.get('timed_out', [])),
+        'skipped': set(payload.get('skipped', [])),
+        'degraded': payload.get('degraded') or {},
+        'stale': payload.get('stale') or {},
+        'offline': payload.get('offline', False),
+    }
+    if payload.get('refresh_summary'):
+        additional_info['refresh_summary'] = payload['refresh_summary']
+    if payload.get('changes') is not None:
+        additional_info['changes'] = {field: tuple(change) for field, change in payload['changes'].items()}
+    avatar = payload.get('avatar')
+    if avatar:
+        avatar = dict(avatar)
+        if avatar.get('image'):
+            avatar['image'] = base64.b64decode(avatar['image'])
+        else:
+            avatar.pop('image', None)
+        if not avatar.get('error'):
+            avatar.pop('error', None)
+    return UserRecord.from_dict(payload['user']), additional_info, avatar
+
+
+def _query_flag(query, name, default=False):
+    values = query.get(name)
+    if not values:
+        return default
+    return values[-1].lower() in ('1', 'true', 'yes', 'on')
+
+
+class LookupService:
+    """Serves lookups from one shared engine over local HTTP.
+    
+    Every client shares the engine's API client (connection pool, revalidation cache,
+    rate limiter) and its snapshots, and a request identical to one already running
+    waits for that one's answer instead of sending its own requests to Roblox.
+    
+    Endpoints (all GET, all answer JSON):
+        /user/{name}?alts=1&deadline=3&incremental=1&stale=1&skip=games,presence
+        /alts/{user_id}?deadline=10
+        /servers/{universe_id}?user={name}
+        /sweep?users={name},{name}&universes={universe_id},{universe_id}
+        /games/{user_id}?cursor={cursor}
+        /history/{user_id}?days=90&interval=86400
+    """
+    def __init__(self, engine, host='127.0.0.1', port=DEFAULT_SERVICE_PORT):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self._server = None
+        self._inflight = {}  # request key -> (Future of the request computing it, when its deadline ends)
+        self._inflight_lock = threading.Lock()
+        self.served = 0
+        self.coalesced = 0
+    
+    def handle(self, path):
+        """Answer one request path; returns (status, payload)"""
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        try:
+            deadline_seconds = float(query.get('deadline', [DEFAULT_LOOKUP_DEADLINE])[-1])
+        except ValueError:
+            deadline_seconds = math.nan
+        if not math.isfinite(deadline_seconds) or deadline_seconds <= 0:
+            return 400, {'error': "deadline must be a positive number of seconds"}
+        deadline_seconds = min(deadline_seconds, SERVICE_MAX_DEADLINE)
+        try:
+            match = re.fullmatch(r'/user/([^/]+)', parts.path)
+            if match:
+                username = unquote(match.group(1))
+                check_alts = _query_flag(query, 'alts')
+                incremental = _query_flag(query, 'incremental', True)
+                stale = _query_flag(query, 'stale')
+                skip = tuple(sorted({stage for value in query.get('skip', []) for stage in value.split(',') if stage}))
+                key = ('user', username.lower(), check_alts, incremental, stale, skip)
+                return 200, self._coalesce(key, lambda: _encode_lookup(*self.engine.lookup_user(
+                    username, incremental=incremental, check_alts=check_alts, deadline_seconds=deadline_seconds,
+                    skip=skip, stale=stale)), deadline_seconds)
+            
+            match = re.fullmatch(r'/alts/(\d+)', parts.path)
+            if match:
+                user_id = int(match.group(1))
+                return 200, self._coalesce(('alts', user_id), lambda: self._alts(user_id, deadline_seconds),
+                                           deadline_seconds)
+            
+            match = re.fullmatch(r'/servers/(\d+)', parts.path)
+            if match:
+                username = query.get('user', [''])[-1]
+                if not username:
+                    return 400, {'error': "user query parameter is required"}
+                universe_id = match.group(1)
+                key = ('servers', universe_id, username.lower())
+                return 200, self._coalesce(key, lambda: self._servers(universe_id, username))
+            
+            match = re.fullmatch(r'/games/(\d+)', parts.path)
+            if match:
+                user_id = int(match.group(1))
+                cursor = query.get('cursor', [''])[-1] or None
+                key = ('games', user_id, cursor)
+                return 200, self._coalesce(key, lambda: self._games(user_id, cursor))
+            
+            match = re.fullmatch(r'/history/(\d+)', parts.path)
+            if match:
+                try:
+                    days = float(query.get('days', [HISTORY_DAYS])[-1])
+                    interval = int(query.get('interval', [HISTORY_INTERVAL])[-1])
+                except ValueError:
+                    return 400, {'error': "days and interval must be numbers"}
+                if interval <= 0:
+                    return 400, {'error': "interval must be positive"}
+                points = self.engine.stats_history(int(match.group(1)), days, interval)
+                return 200, {'points': [point.to_dict() for point in points]}
+            
+            if parts.path == '/sweep':
+                usernames = [name for value in query.get('users', []) for name in value.split(',') if name]
+                universe_ids = [universe for value in query.get('universes', [])
+                                for universe in value.split(',') if universe]
+                if not usernames or not universe_ids:
+                    return 400, {'error': "users and universes query parameters are required"}
+                key = ('sweep', tuple(sorted({name.lower() for name in usernames})), tuple(universe_ids))
+                return 200, self._coalesce(key, lambda: self._sweep(usernames, universe_ids))
+        except LookupFailed as e:
+            return 404, {'error': str(e)}
+        except Exception as e:
+            print(f"Error serving {path}: {e}")
+            return 500, {'error': str(e)}
+        return 404, {'error': f"Unknown endpoint {parts.path}",
+                     'endpoints': ["/user/{name}", "/alts/{user_id}", "/servers/{universe_id}?user={name}",
+                                   "/sweep?users={names}&universes={universe_ids}", "/games/{user_id}?cursor={cursor}",
+                                   "/history/{user_id}?days={days}&interval={seconds}"]}
+    
+    def _coalesce(self, key, compute, deadline_seconds=None):
+        """Run compute once for all concurrent requests with the same key.
+        
+        With deadline_seconds, a request only shares the answer of one whose deadline
+        lasts as long (within SERVICE_COALESCE_SLACK); otherwise it computes its own,
+        and later requests share that one.
+        """
+        expires_at = math.inf if deadline_seconds is None else time.monotonic() + deadline_seconds
+        with self._inflight_lock:
+            self.served += 1
+            entry = self._inflight.get(key)
+            leader = entry is None or entry[1] < expires_at - SERVICE_COALESCE_SLACK
+            if leader:
+                future = futures.Future()
+                self._inflight[key] = (future, expires_at)
+            else:
+                future = entry[0]
+                self.coalesced += 1
+        if leader:
+            try:
+                future.set_result(compute())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    if self._inflight.get(key, (None,))[0] is future:
+                        del self._inflight[key]
+        return future.result()
+    
+    def _alts(self, user_id, deadline_seconds):
+        engine = self.engine
+        deadline = Deadline(deadline_seconds)
+        fresh, alts = engine.snapshots.get_fresh(user_id, 'alt_accounts')
+        timed_out = False
+        if not fresh:
+            with engine.client.deadline(deadline):
+                profile, _ = engine.snapshots.fetch(user_id, 'profile', lambda: engine.get_user_info(user_id))
+                if not profile:
+                    raise LookupFailed(f"User {user_id} not found")
+                alts = engine.detect_alt_accounts(user_id, profile)
+            if alts is None:
+                raise LookupFailed(f"Couldn't fetch the friends of user {user_id}")
+            timed_out = deadline.expired()
+            if not timed_out:
+                engine.snapshots.put(user_id, 'alt_accounts', alts)
+        return {'user_id': user_id, 'alt_accounts': [alt.to_dict() for alt in alts], 'timed_out': timed_out}
+    
+    def _servers(self, universe_id, username):
+        result_text, server_rows = self.engine.search_servers(universe_id, username)
+        return {'result': result_text, 'servers': server_rows}
+    
+    def _games(self, user_id, cursor):
+        games = self.engine.get_owned_games(user_id, cursor)
+        return {'games': [game.to_dict() for game in games], 'next_cursor': games.next_cursor}
+    
+    def _sweep(self, usernames, universe_ids):
+        result_text, hits = self.engine.sweep_servers(usernames, universe_ids)
+        return {'result': result_text, 'hits': hits}
+    
+    def serve_forever(self):
+        import http.server
+        service = self
+        
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                status, payload = service.handle(self.path)
+                body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        self._server = http.server.ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        print(f"Serving lookups on http://{self.host}:{self.port}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+    
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class RemoteLookupEngine:
+    """Runs lookups on a lookup service instead of against Roblox; same interface as LookupEngine"""
+    def __init__(self, base_url, transport=None):
+        self.base_url = base_url.rstrip('/')
+        self.transport = transport or HttpTransport()
+        self.client = None
+    
+    def _get(self, path, params, timeout):
+        try:
+            response = self.transport.request('GET', self.base_url + path, params=params, timeout=timeout)
+            payload = response.json()
+        except Exception as e:
+            raise LookupFailed(f"Lookup service at {self.base_url} failed: {e}")
+        if response.status_code != 200:
+            raise LookupFailed(payload.get('error') or f"HTTP {response.status_code} from lookup service")
+        return payload
+    
+    def lookup_user(self, username, incremental=False, check_alts=False,
+                    deadline_seconds=DEFAULT_LOOKUP_DEADLINE, on_status=None, profiler=None, skip=(), deadline=None,
+                    stale=False):
+        profiler = profiler or NULL_PROFILER
+        if deadline is not None:
+            # The service can't be told to stop, so a cancelled lookup just isn't sent
+            if deadline.expired():
+                raise LookupFailed(f"Timed out looking up '{username}'")
+            deadline_seconds = deadline.remaining()
+        if on_status:
+            on_status(f"Looking up via {self.base_url}...")
+        params = {'alts': int(check_alts), 'incremental': int(incremental), 'deadline': deadline_seconds,
+                  'stale': int(stale)}
+        if skip:
+            params['skip'] = ",".join(skip)
+        with profiler.stage('service'):
+            payload = self._get(f"/user/{quote(username, safe='')}", params,
+                                deadline_seconds + SERVICE_TIMEOUT_MARGIN)
+        return _decode_lookup(payload)
+    
+    def search_servers(self, game_id, username, on_progress=None, profiler=None):
+        profiler = profiler or NULL_PROFILER
+        if on_progress:
+            on_progress(f"Searching servers via {self.base_url}...")
+        try:
+            with profiler.stage('service'):
+                payload = self._get(f"/servers/{game_id}", {'user': username}, SERVICE_SEARCH_TIMEOUT)
+        except LookupFailed as e:
+            return f"Error: {e}", []
+        return payload['result'], payload['servers']
+    
+    def sweep_servers(self, usernames, universe_ids, on_progress=None, profiler=None):
+        profiler = profiler or NULL_PROFILER
+        if on_progress:
+            on_progress(f"Sweeping servers via {self.base_url}...")
+        params = {'users': ",".join(usernames), 'universes': ",".join(str(universe) for universe in universe_ids)}
+        try:
+            with profiler.stage('service'):
+                payload = self._get("/sweep", params, SERVICE_SEARCH_TIMEOUT)
+        except LookupFailed as e:
+            return f"Error: {e}", []
+        return payload['result'], payload['hits']
+    
+    def known_friends(self, user_id):
+        return []
+    
+    def get_users(self, user_ids):
+        return {}
+    
+    def iter_connection_pages(self, user_id, kind, cursor=None):
+        raise LookupFailed("Exports read the lists from Roblox directly; run them without --backend")
+    
+    def stats_history(self, user_id, days=HISTORY_DAYS, interval=HISTORY_INTERVAL):
+        try:
+            payload = self._get(f"/history/{user_id}", {'days': days, 'interval': interval}, SERVICE_SEARCH_TIMEOUT)
+        except LookupFailed as e:
+            print(f"Error getting stats history: {e}")
+            return []
+        return [StatsPoint.from_dict(point) for point in payload['points']]
+    
+    def complete_username(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        return []
+    
+    def prefetch_user(self, username, deadline):
+        # The service keeps the snapshots, so a quick lookup there warms them for the real one
+        if deadline.expired():
+            return False
+        try:
+            self.lookup_user(username, incremental=True, skip=lookup_profile_options('quick')[1],
+                             deadline_seconds=deadline.remaining())
+        except LookupFailed:
+            return False
+        return True
+    
+    def get_owned_games(self, user_id, cursor=None):
+        params = {'cursor': cursor} if cursor else None
+        try:
+            payload = self._get(f"/games/{user_id}", params, SERVICE_SEARCH_TIMEOUT)
+        except LookupFailed as e:
+            print(f"Error getting owned games: {e}")
+            return ResultPage()
+        return ResultPage((GameRecord.from_dict(game) for game in payload['games']), payload.get('next_cursor'))
+
+
+class UiUpdateQueue:
+    """Thread-safe queue of UI updates that the Tk main loop drains at a fixed frame rate.
+    
+    Updates posted with a key replace any pending update with the same key, so each
+    widget is redrawn at most once per frame with its latest value.
+    """
+    def __init__(self, root, fps=30):
+        self.root = root
+        self.interval_ms = max(1, int(1000 / fps))
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> (callback, args, kwargs), in posting order
+        self._sequence = 0
+        self._running = False
+    
+    def post(self, callback, *args, key=None, **kwargs):
+        """Queue callback(*args, **kwargs) to run on the Tk thread during the next frame"""
+        with self._lock:
+            if key is None:
+                # Unkeyed updates are never merged
+                self._sequence += 1
+                key = ('event', self._sequence)
+            else:
+                # Drop the stale update and re-append so ordering follows the latest one
+                self._pending.pop(key, None)
+            self._pending[key] = (callback, args, kwargs)
+    
+    def start(self):
+        if not self._running:
+            self._running = True
+            self.root.after(self.interval_ms, self._drain)
+    
+    def stop(self):
+        self._running = False
+    
+    def _drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for callback, args, kwargs in pending.values():
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"Error applying UI update: {e}")
+        if self._running:
+            self.root.after(self.interval_ms, self._drain)
+
+
+def _sort_key(value):
+    """Sort key that orders numbers, then text, then missing values"""
+    if isinstance(value, bool) or value is None or value == "":
+        return (2, 0)
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+def _format_count(value):
+    """Format a count with thousands separators, leaving non-numbers as they are"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return f"{value:,}"
+    return str(value)
+
+
+def _format_optional_count(value):
+    """Format a count that may be missing, which shows as a dash"""
+    return "–" if value is None else _format_count(value)
+
+
+def _format_age(seconds):
+    """Describe an age in seconds roughly, like 5 min or 3 days"""
+    if seconds < 60:
+        return f"{max(0, int(seconds))} s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min"
+    if seconds < 2 * 86400:
+        return f"{int(seconds // 3600)} h"
+    return f"{int(seconds // 86400)} days"
+
+
+def _format_day(timestamp):
+    """Format an epoch timestamp as its UTC date"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class VirtualTable(tk.Frame):
+    """Sortable table that only draws the rows currently in view.
+    
+    Rows are plain dicts. Columns are (key, heading, width) tuples, optionally with a
+    fourth element that formats the cell value. Canvas items are created once per
+    visible row and reused while scrolling, so the cost of a redraw does not depend
+    on how many rows the table holds. on_scroll_end is called whenever the last row
+    is in view, so the next page of a paginated list can be loaded then.
+    """
+    def __init__(self, parent, columns, on_activate=None, on_scroll_end=None, visible_rows=8, row_height=20,
+                 bg="#252525", fg="#d0d0d0", header_bg="#2a2a2a", header_fg="#e0e0e0",
+                 stripe_bg="#2a2a2a", accent="#4a9eff"):
+        super().__init__(parent, bg=bg)
+        self.columns = columns
+        self.on_activate = on_activate
+        self.on_scroll_end = on_scroll_end
+        self.row_height = row_height
+        self.visible_rows = visible_rows
+        self.fg = fg
+        self.bg = bg
+        self.stripe_bg = stripe_bg
+        self.accent = accent
+        self.rows = []
+        self.top = 0
+        self.sort_column = None
+        self.sort_reverse = False
+        self.message = ""
+        self._cells = []  # one list of canvas text ids per visible row
+        self._stripes = []
+        
+        header = tk.Frame(self, bg=header_bg)
+        header.pack(fill=tk.X)
+        self._headers = {}
+        for column in columns:
+            key, heading, width = column[:3]
+            label = tk.Label(header, text=heading, font=('Arial', 8, 'bold'), bg=header_bg, fg=header_fg,
+                             anchor=tk.W, width=max(1, width // 7), cursor="hand2")
+            label.pack(side=tk.LEFT, padx=(4, 0))
+            label.bind("<Button-1>", lambda e, k=key: self.sort_by(k))
+            self._headers[key] = (label, heading)
+        
+        body = tk.Frame(self, bg=bg)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(body, bg=bg, highlightthickness=0, height=visible_rows * row_height)
+        self.scrollbar = tk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.canvas.bind("<Configure>", lambda e: self._layout())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll_rows(-1 if e.delta > 0 else 1) or "break")
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-1) or "break")
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(1) or "break")
+        self._layout()
+    
+    def _layout(self):
+        """(Re)create the pool of canvas items for the rows that fit in view"""
+        height = max(self.canvas.winfo_height(), self.visible_rows * self.row_height)
+        count = max(1, height // self.row_height)
+        width = max(self.canvas.winfo_width(), sum(column[2] for column in self.columns))
+        if count == len(self._cells):
+            for index, stripe in enumerate(self._stripes):
+                y = index * self.row_height
+                self.canvas.coords(stripe, 0, y, width, y + self.row_height)
+            self._redraw()
+            return
+        self.canvas.delete("all")
+        self._cells = []
+        self._stripes = []
+        for index in range(count):
+            y = index * self.row_height
+            self._stripes.append(self.canvas.create_rectangle(0, y, width, y + self.row_height, width=0,
+                                                              fill=self.stripe_bg if index % 2 else self.bg))
+            x = 4
+            cells = []
+            for column in self.columns:
+                cells.append(self.canvas.create_text(x, y + self.row_height // 2, anchor=tk.W, fill=self.fg,
+                                                     font=('Arial', 8), text=""))
+                x += column[2]
+            self._cells.append(cells)
+        self._message_id = self.canvas.create_text(4, self.row_height // 2, anchor=tk.W, fill=self.fg,
+                                                   font=('Arial', 8), text="")
+        self._redraw()
+    
+    def _redraw(self):
+        max_top = max(0, len(self.rows) - len(self._cells))
+        self.top = min(max(0, self.top), max_top)
+        for index, cells in enumerate(self._cells):
+            row_index = self.top + index
+            row = self.rows[row_index] if row_index < len(self.rows) else None
+            for column, cell in zip(self.columns, cells):
+                if row is None:
+                    text = ""
+                else:
+                    value = row.get(column[0], "")
+                    text = column[3](value) if len(column) > 3 else str(value)
+                self.canvas.itemconfigure(cell, text=text,
+                                          fill=self.accent if row is not None and self.on_activate else self.fg)
+        self.canvas.itemconfigure(self._message_id, text="" if self.rows else self.message)
+        self.canvas.configure(cursor="hand2" if self.rows and self.on_activate else "")
+        if self.rows:
+            first = self.top / len(self.rows)
+            last = min(1.0, (self.top + len(self._cells)) / len(self.rows))
+            self.scrollbar.set(first, last)
+            if self.on_scroll_end and self.top + len(self._cells) >= len(self.rows):
+                self.on_scroll_end()
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * len(self.rows))
+        elif action == "scroll":
+            step = len(self._cells) if unit == "pages" else 1
+            self.top += int(amount) * step
+        self._redraw()
+    
+    def scroll_rows(self, amount):
+        self.top += amount
+        self._redraw()
+    
+    def _on_click(self, event):
+        if not self.on_activate:
+            return
+        row_index = self.top + int(self.canvas.canvasy(event.y)) // self.row_height
+        if 0 <= row_index < len(self.rows):
+            self.on_activate(self.rows[row_index])
+    
+    def sort_by(self, key):
+        """Sort by a column, toggling the direction when it is already the sort column"""
+        if self.sort_column == key:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = key
+            self.sort_reverse = False
+        for column_key, (label, heading) in self._headers.items():
+            arrow = (" ▼" if self.sort_reverse else " ▲") if column_key == key else ""
+            label.config(text=heading + arrow)
+        self._sort()
+        self._redraw()
+    
+    def _sort(self):
+        if self.sort_column is not None:
+            self.rows.sort(key=lambda row: _sort_key(row.get(self.sort_column)), reverse=self.sort_reverse)
+    
+    def set_rows(self, rows, message=""):
+        """Replace the table contents; message is shown when there are no rows"""
+        self.rows = list(rows)
+        self.message = message
+        self.top = 0
+        self._sort()
+        self._redraw()
+    
+    def append_rows(self, rows):
+        """Add rows without resetting the scroll position"""
+        self.rows.extend(rows)
+        self._sort()
+        self._redraw()
+    
+    def clear(self, message=""):
+        self.set_rows([], message)
+
+
+class ThumbnailGrid(tk.Frame):
+    """Scrollable grid of thumbnail tiles that only loads the tiles currently in view.
+    
+    Items are records or dicts with an id; caption_key names the field shown under each
+    tile. Tiles that scroll into view are requested from the ThumbnailService returned by
+    get_service, and tiles that scroll out drop their PhotoImage and any request not sent
+    yet. Decoded images stay in the service's bounded cache. post hands a callback to the
+    Tk thread (the app's UiUpdateQueue.post).
+    """
+    def __init__(self, parent, kind, get_service, post, caption_key='name', on_activate=None,
+                 visible_rows=2, tile_size=THUMBNAIL_TILE_SIZE, bg="#252525", fg="#d0d0d0",
+                 tile_bg="#2a2a2a", accent="#4a9eff"):
+        super().__init__(parent, bg=bg)
+        self.kind = kind
+        self.get_service = get_service
+        self.post = post
+        self.caption_key = caption_key
+        self.on_activate = on_activate
+        self.visible_rows = visible_rows
+        self.tile_size = tile_size
+        self.cell_width = tile_size + 36
+        self.cell_height = tile_size + 22
+        self.fg = fg
+        self.tile_bg = tile_bg
+        self.accent = accent
+        self.items = []
+        self.message = ""
+        self.top_row = 0
+        self.columns = 1
+        self._photos = {}     # target id -> PhotoImage, only for tiles in view
+        self._requested = {}  # target id -> callback of the request in flight
+        self._missing = set()  # target ids without a thumbnail
+        self._loaded = {}     # target id -> image, filled by worker threads
+        self._loaded_lock = threading.Lock()
+        
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, height=visible_rows * self.cell_height)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.canvas.bind("<Configure>", lambda e: self._redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll_rows(-1 if e.delta > 0 else 1) or "break")
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-1) or "break")
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(1) or "break")
+    
+    def _visible_items(self):
+        self.columns = max(1, self.canvas.winfo_width() // self.cell_width)
+        total_rows = -(-len(self.items) // self.columns)
+        self.top_row = min(max(0, self.top_row), max(0, total_rows - self.visible_rows))
+        first = self.top_row * self.columns
+        return first, self.items[first:first + self.visible_rows * self.columns]
+    
+    def _redraw(self):
+        first, visible = self._visible_items()
+        visible_ids = {item.get('id') for item in visible}
+        # Forget everything that scrolled out of view; the service cache keeps the decoded images
+        for target_id in [target_id for target_id in self._photos if target_id not in visible_ids]:
+            del self._photos[target_id]
+        service = self.get_service() if _load_imagetk() is not None else None
+        for target_id, callback in list(self._requested.items()):
+            if target_id not in visible_ids:
+                del self._requested[target_id]
+                service.discard(self.kind, target_id, callback)
+        
+        self.canvas.delete("all")
+        for index, item in enumerate(visible):
+            target_id = item.get('id')
+            x = (index % self.columns) * self.cell_width + self.cell_width // 2
+            y = (index // self.columns) * self.cell_height + 2
+            photo = self._photos.get(target_id)
+            if photo is not None:
+                self.canvas.create_image(x, y, anchor=tk.N, image=photo)
+            else:
+                half = self.tile_size // 2
+                self.canvas.create_rectangle(x - half, y, x + half, y + self.tile_size, width=0, fill=self.tile_bg)
+                if target_id in self._missing or service is None:
+                    self.canvas.create_text(x, y + half, text="?", fill=self.fg, font=('Arial', 10))
+                elif target_id not in self._requested:
+                    self._request(service, target_id)
+            caption = str(item.get(self.caption_key) or target_id)
+            if len(caption) > 14:
+                caption = caption[:13] + "…"
+            self.canvas.create_text(x, y + self.tile_size + 10, text=caption, font=('Arial', 7),
+                                    fill=self.accent if self.on_activate else self.fg)
+        if not self.items:
+            self.canvas.create_text(4, self.cell_height // 2, anchor=tk.W, text=self.message,
+                                    fill=self.fg, font=('Arial', 8))
+        self.canvas.configure(cursor="hand2" if self.items and self.on_activate else "")
+        total_rows = -(-len(self.items) // self.columns)
+        if total_rows:
+            self.scrollbar.set(self.top_row / total_rows, min(1.0, (self.top_row + self.visible_rows) / total_rows))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _request(self, service, target_id):
+        def loaded(image):
+            with self._loaded_lock:
+                self._loaded[target_id] = image
+            # Every tile finished within a frame is applied by one redraw
+            self.post(self._apply_loaded, key=('thumbnails', id(self)))
+        self._requested[target_id] = loaded
+        service.request(self.kind, target_id, loaded)
+    
+    def _apply_loaded(self):
+        with self._loaded_lock:
+            loaded, self._loaded = self._loaded, {}
+        if not self.winfo_exists():
+            return  # its lookup tab was closed meanwhile
+        ImageTk = _load_imagetk()
+        for target_id, image in loaded.items():
+            if self._requested.pop(target_id, None) is None:
+                continue  # scrolled out of view or replaced by set_items meanwhile
+            if image is None:
+                self._missing.add(target_id)
+            else:
+                self._photos[target_id] = ImageTk.PhotoImage(image)
+        self._redraw()
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        total_rows = -(-len(self.items) // self.columns)
+        if action == "moveto":
+            self.top_row = int(float(amount) * total_rows)
+        elif action == "scroll":
+            self.top_row += int(amount) * (self.visible_rows if unit == "pages" else 1)
+        self._redraw()
+    
+    def scroll_rows(self, amount):
+        self.top_row += amount
+        self._redraw()
+    
+    def _on_click(self, event):
+        if not self.on_activate:
+            return
+        column = int(event.x) // self.cell_width
+        row = int(self.canvas.canvasy(event.y)) // self.cell_height
+        index = (self.top_row + row) * self.columns + column
+        if column < self.columns and 0 <= index < len(self.items):
+            self.on_activate(self.items[index])
+    
+    def append_items(self, items):
+        """Add tiles without resetting the scroll position"""
+        self.items.extend(items)
+        self._redraw()
+    
+    def set_items(self, items, message=""):
+        """Replace the tiles; message is shown when there are none"""
+        service = self.get_service() if self._requested else None
+        for target_id, callback in self._requested.items():
+            service.discard(self.kind, target_id, callback)
+        self._requested = {}
+        self._photos = {}
+        self._missing = set()
+        self.items = list(items)
+        self.message = message
+        self.top_row = 0
+        self._redraw()
+
+
+class LookupTab:
+    """One lookup shown as a tab: its own result widgets, status panel and cancellation.
+    
+    Colors, row helpers, search options and the engine come from the app, so every
+    tab shares one HTTP client, cache and rate limiter.
+    """
+    def __init__(self, app, notebook):
+        self.app = app
+        self.notebook = notebook
+        
+        # Username this tab looks up, and the Deadline of its running lookup (None while idle);
+        # cancelling a lookup or starting another one drops whatever the old one still posts
+        self.username = None
+        self.lookup = None
+        self.closed = False
+        
+        # Store avatar image reference
+        self.avatar_image = None
+        
+        # (user_id, cursor) of the next owned games page, None once the last page is shown or loading
+        self.owned_games_next = None
+        
+        # Set to stop the running connection list export, None while no export runs
+        self.export_stop = None
+        
+        self.frame = tk.Frame(notebook, bg=self.panel_bg)
+        notebook.add(self.frame, text="New lookup")
+        
+        # Tab toolbar: cancel or repeat this tab's lookup, or close the tab
+        toolbar = tk.Frame(self.frame, bg=self.panel_bg)
+        toolbar.pack(fill=tk.X, pady=(8, 8))
+        self.cancel_button = self._create_minimalist_button(toolbar, "Cancel", width=8, command=self.cancel_lookup)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=(0, 8))
+        self.refresh_button = self._create_minimalist_button(toolbar, "Refresh", width=8, command=self.refresh)
+        self.refresh_button.config(state=tk.DISABLED)
+        self.refresh_button.pack(side=tk.LEFT)
+        close_button = self._create_minimalist_button(toolbar, "Close Tab", width=9,
+                                                      command=lambda: self.app.close_tab(self))
+        close_button.pack(side=tk.RIGHT)
+        
+        # Create scrollable canvas for content
+        canvas_frame = tk.Frame(self.frame, bg=self.panel_bg)
+        canvas_frame.pack(fill=tk.BOTH, expand=True)
+        
+        canvas = tk.Canvas(canvas_frame, bg=self.panel_bg, highlightthickness=0)
+        scrollbar = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg=self.panel_bg)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Content container
+        self.content_frame = scrollable_frame
+        
+        # Status panel at bottom (matching reference UI)
+        status_panel = tk.Frame(self.frame, bg=self.panel_bg)
+        status_panel.pack(fill=tk.X, pady=(15, 0))
+        
+        status_label = tk.Label(
+            status_panel,
+            text="Status",
+            font=('Arial', 10, 'bold'),
+            bg=self.panel_bg,
+            fg=self.title_color
+        )
+        status_label.pack(anchor=tk.W, pady=(0, 5))
+        
+        # Status text area with border
+        status_border = tk.Frame(status_panel, bg=self.border_color, relief=tk.FLAT, borderwidth=1)
+        status_border.pack(fill=tk.BOTH, expand=True)
+        
+        status_inner = tk.Frame(status_border, bg=self.section_bg)
+        status_inner.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
+        
+        # Status text widget for multiple lines
+        self.status_text = tk.Text(
+            status_inner,
+            font=('Arial', 9),
+            bg=self.section_bg,
+            fg=self.text_color,
+            relief=tk.FLAT,
+            borderwidth=0,
+            wrap=tk.WORD,
+            height=5,
+            padx=10,
+            pady=8
+        )
+        self.status_text.pack(fill=tk.BOTH, expand=True)
+        self.status_text.insert('1.0', "Welcome back,\n")
+        self.status_text.config(state=tk.DISABLED)
+        
+        # Initialize info widgets (will be populated when data is loaded)
+        self.info_widgets = {}
+        self._create_info_widgets()
+    
+    def __getattr__(self, name):
+        # Anything a tab doesn't have itself (colors, engine, ui_queue, widget helpers) is the app's
+        if name == 'app':
+            raise AttributeError(name)
+        return getattr(self.app, name)
+    
+    def post(self, callback, *args, key=None, **kwargs):
+        """Queue a UI update for this tab; keyed updates only replace this tab's own, and none run once it is closed"""
+        def apply():
+            if not self.closed:
+                callback(*args, **kwargs)
+        
+        self.ui_queue.post(apply, key=None if key is None else (key, id(self)))
+    
+    def post_result(self, lookup, callback, *args, key=None, **kwargs):
+        """Like post, but dropped unless lookup is still this tab's running lookup"""
+        def apply():
+            if self.lookup is lookup:
+                callback(*args, **kwargs)
+        
+        self.post(apply, key=key)
+    
+    def is_blank(self):
+        """True while the tab has neither shown nor started a lookup, so a search can use it"""
+        return self.username is None
+    
+    def _set_title(self):
+        title = self.username or "New lookup"
+        if self.lookup is not None:
+            title = "⏳ " + title
+        self.notebook.tab(self.frame, text=title)
+    
+    def start_lookup(self, username, incremental=False, check_alts=False, deadline_seconds=DEFAULT_LOOKUP_DEADLINE,
+                     profiler=None, skip=(), sections=None, wait_for=None):
+        """Look up username in this tab, cancelling the lookup it is running; sections loads just those stages"""
+        if self.lookup is not None:
+            self.lookup.cancel()
+        deadline = Deadline(deadline_seconds)
+        self.lookup = deadline
+        if sections is None:
+            # Clear previous data
+            self.username = username
+            self._clear_info_widgets()
+            self.avatar_label.config(image='', text="Loading avatar...")
+            self._update_status("Loading user information...")
+        self.cancel_button.config(state=tk.NORMAL)
+        self.refresh_button.config(state=tk.NORMAL)
+        self._set_title()
+        
+        # Fetch in a separate thread to avoid freezing UI
+        thread = threading.Thread(target=self._fetch_user_info_thread,
+                                  args=(username, incremental, check_alts, deadline, profiler),
+                                  kwargs={'skip': skip, 'sections': sections, 'wait_for': wait_for})
+        thread.daemon = True
+        thread.start()
+    
+    def refresh(self):
+        """Look up this tab's user again with the current search options"""
+        if self.username:
+            check_alts, skip = lookup_profile_options(self.lookup_profile.get())
+            self.start_lookup(self.username, self.incremental_refresh.get(), check_alts, self._deadline_seconds(),
+                              self._new_profiler(f"Lookup '{self.username}'"), skip=skip)
+    
+    def cancel_lookup(self):
+        """Stop the running lookup: it sends no further requests and whatever it still returns is dropped"""
+        if self.lookup is None:
+            return
+        self.lookup.cancel()
+        self.lookup = None
+        self.cancel_button.config(state=tk.DISABLED)
+        self._set_title()
+        self._update_status("Lookup cancelled", is_warning=True)
+    
+    def _lookup_finished(self, lookup):
+        if self.lookup is lookup:
+            self.lookup = None
+            self.cancel_button.config(state=tk.DISABLED)
+            self._set_title()
+    
+    def close(self):
+        """Cancel this tab's lookup and export and drop its widgets"""
+        if self.lookup is not None:
+            self.lookup.cancel()
+            self.lookup = None
+        if self.export_stop is not None:
+            self.export_stop.set()
+        self.closed = True
+        self.frame.destroy()
+    
+    def _update_status(self, message, is_warning=False):
+        """Update status panel with message"""
+        self.status_text.config(state=tk.NORMAL)
+        self.status_text.delete('1.0', tk.END)
+        if is_warning:
+            self.status_text.insert('1.0', message, 'warning')
+            self.status_text.tag_config('warning', foreground=self.warning_color)
+        else:
+            self.status_text.insert('1.0', message)
+        self.status_text.config(state=tk.DISABLED)
+    
+    def _append_status(self, message):
+        """Append a message below the current status"""
+        self.status_text.config(state=tk.NORMAL)
+        self.status_text.insert(tk.END, message)
+        self.status_text.config(state=tk.DISABLED)
+    
+    def _create_info_widgets(self):
+        """Create all info display widgets"""
+        # Top section: Avatar and basic info
+        top_section = tk.Frame(self.content_frame, bg=self.bg_color)
+        top_section.pack(fill=tk.X, pady=(0, 20))
+        
+        # Avatar frame with border
+        avatar_outer = tk.Frame(top_section, bg=self.border_color, relief=tk.FLAT, borderwidth=1)
+        avatar_outer.pack(side=tk.LEFT, padx=(0, 10))
+        avatar_container = tk.Frame(avatar_outer, bg=self.section_bg)
+        avatar_container.pack(padx=1, pady=1)
+        
+        self.avatar_label = tk.Label(
+            avatar_container,
+            text="Avatar",
+            font=('Arial', 9),
+            bg=self.section_bg,
+            fg=self.text_color,
+            width=18,
+            height=8
+        )
+        self.avatar_label.pack(padx=8, pady=8)
+        
+        # Buttons that load a section the lookup profile skipped: stage -> (button, pack options)
+        self.load_buttons = {}
+        self._create_load_button(avatar_container, 'avatar', pady=(0, 8))
+        
+        # Basic info frame with border
+        basic_outer = tk.Frame(top_section, bg=self.border_color, relief=tk.FLAT, borderwidth=1)
+        basic_outer.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        basic_info_frame = tk.Frame(basic_outer, bg=self.section_bg)
+        basic_info_frame.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
+        
+        basic_title = tk.Label(
+            basic_info_frame,
+            text="Basic Information",
+            font=('Arial', 10, 'bold'),
+            bg=self.section_bg,
+            fg=self.title_color
+        )
+        basic_title.pack(anchor=tk.W, padx=10, pady=(10, 6))
+        
+        self.info_widgets['username'] = self._create_info_row(basic_info_frame, "Username:", "")
+        self.info_widgets['display_name'] = self._create_info_row(basic_info_frame, "Display Name:", "")
+        self.info_widgets['user_id'] = self._create_info_row(basic_info_frame, "User ID:", "")
+        self.info_widgets['description'] = self._create_info_row(basic_info_frame, "Description:", "", multiline=True)
+        
+        # Account details section
+        account_section = self._create_section("📅 Account Details")
+        self.info_widgets['created'] = self._create_info_row(account_section, "Created:", "")
+        self.info_widgets['is_banned'] = self._create_info_row(account_section, "Is Banned:", "")
+        self.info_widgets['verified'] = self._create_info_row(account_section, "Verified Badge:", "")
+        
+        # Social statistics section
+        social_section = self._create_section("👥 Social Statistics")
+        self._create_load_button(social_section, 'social')
+        self.info_widgets['friends'] = self._create_info_row(social_section, "Friends:", "")
+        self.info_widgets['followers'] = self._create_info_row(social_section, "Followers:", "")
+        self.info_widgets['following'] = self._create_info_row(social_section, "Following:", "")
+        self._build_export_row(social_section)
+        self.info_widgets['friend_tiles'] = self._create_grid_row(
+            social_section, 'user', 'name',
+            on_activate=lambda friend: self._open_url(f"https://www.roblox.com/users/{friend.id}/profile"))
+        
+        # Achievements section
+        achievements_section = self._create_section("🏆 Achievements")
+        self.info_widgets['badges'] = self._create_info_row(achievements_section, "Badges:", "")
+        self.info_widgets['groups'] = self._create_info_row(achievements_section, "Groups:", "")
+        
+        # Presence section
+        presence_section = self._create_section("🌐 Status")
+        self._create_load_button(presence_section, 'presence')
+        self.info_widgets['status'] = self._create_info_row(presence_section, "Status:", "")
+        self.info_widgets['current_game'] = self._create_info_row(presence_section, "Current Game:", "")
+        self.info_widgets['last_location'] = self._create_info_row(presence_section, "Last Location:", "")
+        
+        # History section (stats recorded by earlier lookups)
+        history_section = self._create_section("📈 History")
+        self.info_widgets['changes'] = self._create_info_row(history_section, "Changes:", "", multiline=True)
+        self.info_widgets['history'] = self._create_table_row(
+            history_section,
+            [('at', "Day", 90, _format_day), ('friends', "Friends", 70, _format_optional_count),
+             ('followers', "Followers", 90, _format_optional_count),
+             ('following', "Following", 80, _format_optional_count),
+             ('badges', "Badges", 70, _format_optional_count), ('groups', "Groups", 60, _format_optional_count),
+             ('presence', "Status", 80, lambda presence: presence or "–")])
+        
+        # Owned Groups section
+        owned_groups_section = self._create_section("👑 Owned Groups")
+        self._create_load_button(owned_groups_section, 'groups')
+        self.info_widgets['owned_groups'] = self._create_table_row(
+            owned_groups_section,
+            [('name', "Name", 320), ('id', "ID", 110), ('member_count', "Members", 110, _format_count)],
+            on_activate=lambda g: self._open_url(f"https://www.roblox.com/groups/{g.id}"))
+        
+        # Owned Games section
+        owned_games_section = self._create_section("🎮 Owned Games")
+        self._create_load_button(owned_games_section, 'games')
+        self.info_widgets['owned_games'] = self._create_table_row(
+            owned_games_section,
+            [('name', "Name", 300), ('id', "ID", 110), ('visits', "Visits", 110, _format_count), ('playing', "Playing", 80)],
+            on_activate=self._open_game_page, on_scroll_end=self._load_more_games)
+        self.info_widgets['game_tiles'] = self._create_grid_row(owned_games_section, 'game', 'name',
+                                                                on_activate=self._open_game_page)
+        
+        # Possible Alt Accounts section
+        alt_accounts_section = self._create_section("🔍 Possible Alt Accounts")
+        self._create_load_button(alt_accounts_section, 'alt_accounts')
+        self.info_widgets['alt_accounts'] = self._create_table_row(
+            alt_accounts_section,
+            [('username', "Username", 160), ('id', "ID", 110), ('score', "Score", 60), ('reasons', "Reasons", 400, ", ".join)],
+            on_activate=lambda alt: self._open_url(f"https://www.roblox.com/users/{alt.id}/profile"))
+        self.info_widgets['alt_tiles'] = self._create_grid_row(
+            alt_accounts_section, 'user', 'username',
+            on_activate=lambda alt: self._open_url(f"https://www.roblox.com/users/{alt.id}/profile"))
+        
+        # Sections whose title shows the age of saved data served for a stage
+        self.stage_sections = {
+            'profile': account_section,
+            'social': social_section,
+            'presence': presence_section,
+            'groups': owned_groups_section,
+            'games': owned_games_section,
+            'alt_accounts': alt_accounts_section,
+        }
+        
+        # Server Search section (rarely used, so it is only built when opened)
+        self.game_id_entry = None
+        self.search_servers_button = None
+        self.server_search_section = self._create_deferred_section("🎮 Snipe Server", self._build_server_search_panel)
+        
+        # Links section
+        links_section = self._create_section("🔗 Links")
+        self.info_widgets['profile_link'] = self._create_info_row(links_section, "Profile:", "", link=True)
+        self.info_widgets['avatar_link'] = self._create_info_row(links_section, "Avatar:", "", link=True)
+    
+    def _create_section(self, title):
+        """Create a section with title"""
+        section_frame = tk.Frame(self.content_frame, bg=self.section_bg, relief=tk.RAISED, borderwidth=2)
+        section_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        title_label = tk.Label(
+            section_frame,
+            text=title,
+            font=('Arial', 14, 'bold'),
+            bg=self.section_bg,
+            fg=self.title_color
+        )
+        title_label.pack(anchor=tk.W, padx=15, pady=(15, 10))
+        section_frame.title = title
+        section_frame.title_label = title_label
+        
+        return section_frame
+    
+    def _create_load_button(self, parent, stage, **pack_options):
+        """Create the (initially hidden) button that loads a skipped section; it sits under the title"""
+        button = self._create_minimalist_button(parent, "Load", width=8, command=lambda: self.load_section(stage))
+        title_label = getattr(parent, 'title_label', None)
+        options = {'anchor': tk.W, 'padx': 15, 'pady': (0, 8)}
+        if title_label is not None:
+            options['after'] = title_label
+        options.update(pack_options)
+        self.load_buttons[stage] = (button, options)
+    
+    def _create_deferred_section(self, title, builder):
+        """Create a section whose contents are only built when the user opens it"""
+        section_frame = self._create_section(title)
+        section_frame.built = False
+        
+        def build():
+            if section_frame.built:
+                return
+            section_frame.built = True
+            open_button.destroy()
+            builder(section_frame)
+        
+        open_button = self._create_minimalist_button(section_frame, "Show", width=8, command=build)
+        open_button.pack(anchor=tk.W, padx=15, pady=(0, 10))
+        section_frame.build = build
+        return section_frame
+    
+    def _build_server_search_panel(self, section):
+        """Build the server search panel inside its section"""
+        server_search_frame = tk.Frame(section, bg=self.section_bg)
+        server_search_frame.pack(fill=tk.X, padx=15, pady=10)
+        
+        game_id_label = tk.Label(
+            server_search_frame,
+            text="Game ID (Universe ID):",
+            font=('Arial', 10, 'bold'),
+            bg=self.section_bg,
+            fg=self.label_color
+        )
+        game_id_label.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Entry with border
+        entry_wrapper = tk.Frame(server_search_frame, bg=self.bg_color)
+        entry_wrapper.pack(side=tk.LEFT, padx=(0, 8))
+        self.game_id_entry = tk.Entry(
+            entry_wrapper,
+            font=('Arial', 9),
+            width=18,
+            bg=self.panel_bg,
+            fg=self.text_color,
+            insertbackground=self.text_color,
+            relief=tk.FLAT,
+            borderwidth=1,
+            highlightthickness=1,
+            highlightbackground=self.border_color,
+            highlightcolor=self.accent_color
+        )
+        self.game_id_entry.pack(padx=2, pady=2)
+        
+        # Buttons with minimalist style
+        self.search_servers_button = tk.Button(
+            server_search_frame,
+            text="Search Servers",
+            font=('Arial', 9),
+            bg=self.panel_bg,
+            fg=self.text_color,
+            activebackground=self.section_bg,
+            activeforeground=self.text_color,
+            relief=tk.FLAT,
+            borderwidth=1,
+            highlightthickness=1,
+            highlightbackground=self.border_color,
+            padx=12,
+            pady=3,
+            cursor="hand2",
+            command=self.search_user_in_servers
+        )
+        self.search_servers_button.pack(side=tk.LEFT, padx=(0, 5))
+        
+        # Button to use current game ID
+        use_current_button = tk.Button(
+            server_search_frame,
+            text="Use Current Game",
+            font=('Arial', 8),
+            bg=self.panel_bg,
+            fg=self.text_color,
+            activebackground=self.section_bg,
+            activeforeground=self.text_color,
+            relief=tk.FLAT,
+            borderwidth=1,
+            highlightthickness=1,
+            highlightbackground=self.border_color,
+            padx=8,
+            pady=3,
+            cursor="hand2",
+            command=self.use_current_game_id
+        )
+        use_current_button.pack(side=tk.LEFT)
+        
+        # Sweep: many users across many games in one pass
+        sweep_frame = tk.Frame(section, bg=self.section_bg)
+        sweep_frame.pack(fill=tk.X, padx=15, pady=(0, 10))
+        self.sweep_users_entry = self._create_sweep_entry(sweep_frame, "Users:", 30)
+        self.sweep_universes_entry = self._create_sweep_entry(sweep_frame, "Universe IDs:", 18)
+        self.sweep_button = tk.Button(
+            sweep_frame,
+            text="Sweep",
+            font=('Arial', 9),
+            bg=self.panel_bg,
+            fg=self.text_color,
+            activebackground=self.section_bg,
+            activeforeground=self.text_color,
+            relief=tk.FLAT,
+            borderwidth=1,
+            highlightthickness=1,
+            highlightbackground=self.border_color,
+            padx=12,
+            pady=3,
+            cursor="hand2",
+            command=self.sweep_servers
+        )
+        self.sweep_button.pack(side=tk.LEFT)
+        
+        self.info_widgets['server_search_result'] = self._create_info_row(section, "Result:", "", multiline=True)
+        self.info_widgets['server_list'] = self._create_table_row(
+            section,
+            [('username', "User", 130), ('universe_id', "Universe", 90), ('server_id', "Server ID", 300),
+             ('player_count', "Players", 70), ('max_players', "Max", 60), ('fps', "FPS", 70), ('ping', "Ping", 60)],
+            on_activate=self._copy_server_id)
+        
+        # Add info label about API limitations - warning style
+        info_label = tk.Label(
+            section,
+            text="⚠ Note: Roblox API doesn't provide player lists. If user is in game, all servers will be shown.",
+            font=('Arial', 7),
+            bg=self.panel_bg,
+            fg=self.warning_color,
+            wraplength=800
+        )
+        info_label.pack(anchor=tk.W, padx=12, pady=(0, 8))
+    
+    def _build_export_row(self, parent):
+        """Create the row that streams the shown user's friends, followers or followings to a file"""
+        row_frame = tk.Frame(parent, bg=self.panel_bg)
+        row_frame.pack(fill=tk.X, padx=12, pady=4)
+        label = tk.Label(
+            row_frame,
+            text="Export:",
+            font=('Arial', 9),
+            bg=self.panel_bg,
+            fg=self.label_color,
+            width=15,
+            anchor=tk.W
+        )
+        label.pack(side=tk.LEFT, padx=(0, 10))
+        self.export_list = tk.StringVar(value='followers')
+        list_menu = tk.OptionMenu(row_frame, self.export_list, *CONNECTION_LISTS)
+        list_menu.config(
+            font=('Arial', 9),
+            bg=self.section_bg,
+            fg=self.text_color,
+            activebackground=self.panel_bg,
+            activeforeground=self.text_color,
+            relief=tk.FLAT,
+            highlightthickness=0
+        )
+        list_menu.pack(side=tk.LEFT)
+        # Names are often missing from the lists; this fetches them 100 users per request
+        self.export_enrich = tk.BooleanVar(value=False)
+        enrich_checkbox = tk.Checkbutton(
+            row_frame,
+            text="Add names",
+            font=('Arial', 9),
+            bg=self.panel_bg,
+            fg=self.text_color,
+            activebackground=self.panel_bg,
+            activeforeground=self.text_color,
+            selectcolor=self.section_bg,
+            variable=self.export_enrich
+        )
+        enrich_checkbox.pack(side=tk.LEFT, padx=(8, 8))
+        self.export_button = self._create_minimalist_button(row_frame, "Export...", width=10,
+                                                            command=self.toggle_export)
+        self.export_button.pack(side=tk.LEFT)
+    
+    def _create_sweep_entry(self, parent, text, width):
+        """Create a labelled comma-separated list entry for the sweep row"""
+        label = tk.Label(
+            parent,
+            text=text,
+            font=('Arial', 10, 'bold'),
+            bg=self.section_bg,
+            fg=self.label_color
+        )
+        label.pack(side=tk.LEFT, padx=(0, 10))
+        entry_wrapper = tk.Frame(parent, bg=self.bg_color)
+        entry_wrapper.pack(side=tk.LEFT, padx=(0, 8))
+        entry = tk.Entry(
+            entry_wrapper,
+            font=('Arial', 9),
+            width=width,
+            bg=self.panel_bg,
+            fg=self.text_color,
+            insertbackground=self.text_color,
+            relief=tk.FLAT,
+            borderwidth=1,
+            highlightthickness=1,
+            highlightbackground=self.border_color,
+            highlightcolor=self.accent_color
+        )
+        entry.pack(padx=2, pady=2)
+        return entry
+    
+    def load_section(self, stage):
+        """Fetch one section the lookup profile skipped, leaving the rest as shown"""
+        username = self.info_widgets['username']['value'].cget('text')
+        if not username:
+            return
+        self.load_buttons[stage][0].config(state=tk.DISABLED)
+        self._update_status(f"Loading {stage.replace('_', ' ')}...")
+        # Incremental, so the profile comes from the snapshot the lookup just stored
+        self.start_lookup(username, True, stage == 'alt_accounts', self._deadline_seconds(),
+                          self._new_profiler(f"Load {stage} '{username}'"),
+                          skip=tuple(other for other in LOOKUP_STAGES if other != stage), sections=(stage,))
+    
+    def _clear_info_widgets(self):
+        """Clear all info widgets"""
+        for widget_info in self.info_widgets.values():
+            if widget_info['type'] == 'link':
+                widget_info['value'].config(text="", cursor="")
+            elif widget_info['type'] == 'table':
+                widget_info['value'].clear()
+            elif widget_info['type'] == 'grid':
+                widget_info['value'].set_items([])
+            else:
+                widget_info['value'].config(text="")
+    
+    def _fetch_user_info_thread(self, username, incremental, check_alts, deadline, profiler=None, skip=(),
+                                sections=None, wait_for=None):
+        try:
+            if wait_for is not None:
+                # A prefetch of this user is still running; let it finish filling the snapshots
+                wait_for.join(deadline.remaining())
+            # An incremental search shows saved data at once and revalidates it below
+            user_info, additional_info, avatar = self.engine.lookup_user(
+                username, incremental=incremental, check_alts=check_alts, deadline_seconds=deadline.seconds,
+                on_status=lambda message: self.post_result(deadline, self._update_status, message, key='status'),
+                profiler=profiler, skip=skip, deadline=deadline, stale=incremental and sections is None)
+            additional_info['friends'] = self.engine.known_friends(user_info.id)
+            additional_info['history'] = self.engine.stats_history(user_info.id)
+            
+            # Update UI in main thread
+            self.post_result(deadline, self._update_ui, user_info, additional_info, avatar, username,
+                             sections=sections or LOOKUP_STAGES,
+                             key='lookup_result' if sections is None else ('section', sections))
+            if additional_info.get('stale') and not additional_info.get('offline'):
+                self._revalidate(username, additional_info['stale'], check_alts, deadline)
+        
+        except LookupFailed as e:
+            self.post_result(deadline, self._show_error, str(e))
+        except Exception as e:
+            self.post_result(deadline, self._show_error, f"Error: {str(e)}")
+        finally:
+            for stage in sections or ():
+                self.post(self.load_buttons[stage][0].config, key=('load_button', stage), state=tk.NORMAL)
+            self.post(self._lookup_finished, deadline)
+            if profiler:
+                self._report_profile(profiler.finish())
+    
+    def _revalidate(self, username, stale, check_alts, lookup):
+        """Fetch the current values of the sections shown from saved data, and show them unless lookup was cancelled"""
+        sections = tuple(stage for stage in LOOKUP_STAGES if stage in stale)
+        try:
+            # A fresh budget, which cancelling the lookup still cuts short
+            user_info, additional_info, avatar = self.engine.lookup_user(
+                username, incremental=True, check_alts=check_alts, deadline=Deadline(lookup.seconds, parent=lookup),
+                skip=tuple(stage for stage in LOOKUP_STAGES if stage not in stale))
+            additional_info['friends'] = self.engine.known_friends(user_info.id)
+            additional_info['history'] = self.engine.stats_history(user_info.id)
+        except Exception as e:
+            self.post_result(lookup, self._update_status, f"⚠ Showing saved data; revalidation failed: {e}",
+                             is_warning=True, key='status')
+            return
+        
+        self.post_result(lookup, self._update_ui, user_info, additional_info, avatar, username, sections=sections,
+                         key='revalidated')
+    
+    def _report_profile(self, profiler):
+        """Show a finished profile in the status panel and append the full report to the output file"""
+        self.post(self._append_status, "\n" + profiler.waterfall())
+        if self.profile_output:
+            try:
+                with open(self.profile_output, 'a', encoding='utf-8') as profile_file:
+                    profile_file.write(profiler.report() + "\n\n")
+            except OSError as e:
+                print(f"Error writing profile: {e}")
+    
+    def _update_ui(self, user_info, additional_info, avatar, username, sections=LOOKUP_STAGES):
+        """Update UI with fetched information; sections limits the update to those stages' widgets"""
+        try:
+            timed_out = additional_info.get('timed_out', set())
+            degraded = additional_info.get('degraded', {})
+            skipped = additional_info.get('skipped', set())
+            stale = additional_info.get('stale', {})
+            offline = additional_info.get('offline', False)
+            
+            def section_value(value, section):
+                """Value for a row, marking values missing because of an open circuit, the deadline or the profile"""
+                if value in (None, 'N/A'):
+                    if section in skipped:
+                        return "Not loaded"
+                    if offline:
+                        return "Offline"
+                    if section in degraded:
+                        return "Unavailable (circuit open)"
+                    if section in timed_out:
+                        return "Timed out"
+                return str(value)
+            
+            def empty_message(section, default):
+                if section in skipped:
+                    return "Not loaded"
+                if offline and section not in stale:
+                    return "Offline"
+                if section in degraded:
+                    return "Unavailable (circuit open)"
+                return "Timed out" if section in timed_out else default
+            
+            # Sections served from saved data say how old it is
+            for stage in sections:
+                section = self.stage_sections.get(stage)
+                if section is not None:
+                    title = section.title
+                    if stage in stale:
+                        title += f"  (saved {_format_age(time.time() - stale[stage])} ago)"
+                    section.title_label.config(text=title)
+            
+            # Sections the lookup profile skipped get a button that loads just them
+            for stage in sections:
+                if stage in self.load_buttons:
+                    button, pack_options = self.load_buttons[stage]
+                    button.config(state=tk.NORMAL)
+                    if stage in skipped:
+                        button.pack(**pack_options)
+                    else:
+                        button.pack_forget()
+            
+            # Display avatar (downloaded by the lookup thread, decoded here)
+            if 'avatar' in sections:
+                if avatar and avatar.get('image'):
+                    try:
+                        img = Image.open(BytesIO(avatar['image']))
+                        img = img.resize((150, 150), Image.Resampling.LANCZOS)
+                        
+                        # Convert to PhotoImage and display
+                        ImageTk = _load_imagetk()
+                        if ImageTk is not None:
+                            photo = ImageTk.PhotoImage(img)
+                            # Clear any existing text
+                            self.avatar_label.config(image=photo, text="")
+                            # Keep reference to prevent garbage collection - this is critical!
+                            self.avatar_image = photo
+                            self.avatar_label.image = photo
+                        else:
+                            # ImageTk not available
+                            self.avatar_label.config(image='', text="ImageTk not\navailable")
+                    except Exception as e:
+                        error_msg = str(e)[:40]
+                        self.avatar_label.config(image='', text=f"Error:\n{error_msg}")
+                        print(f"Avatar display error: {e}")
+                elif 'avatar' in skipped:
+                    self.avatar_label.config(image='', text="Avatar\nnot loaded")
+                elif 'avatar' in timed_out:
+                    self.avatar_label.config(image='', text="Avatar\ntimed out")
+                elif avatar and avatar.get('error'):
+                    self.avatar_label.config(image='', text=f"Network error:\n{avatar['error'][:40]}")
+                else:
+                    self.avatar_label.config(image='', text="No avatar URL\navailable")
+            
+            if 'profile' in sections:
+                # Update basic information
+                self.info_widgets['username']['value'].config(text=user_info.name or 'N/A')
+                self.info_widgets['display_name']['value'].config(text=user_info.display_name or 'N/A')
+                self.info_widgets['user_id']['value'].config(text=str(user_info.id))
+                desc = user_info.description
+                if not desc:
+                    desc = "No description"
+                self.info_widgets['description']['value'].config(text=desc)
+                
+                # Update account details
+                self.info_widgets['created']['value'].config(text=self.format_date(user_info.created))
+                self.info_widgets['is_banned']['value'].config(text="Yes" if user_info.is_banned else "No")
+                self.info_widgets['verified']['value'].config(text="Yes" if user_info.verified else "No")
+                
+                # Update links
+                user_id = user_info.get('id', 'N/A')
+                profile_url = f"https://www.roblox.com/users/{user_id}/profile"
+                avatar_url_link = f"https://www.roblox.com/users/{user_id}/avatar"
+                
+                self.info_widgets['profile_link']['value'].config(text=profile_url)
+                self.info_widgets['profile_link']['value'].bind("<Button-1>", lambda e: self._open_url(profile_url))
+                
+                self.info_widgets['avatar_link']['value'].config(text=avatar_url_link)
+                self.info_widgets['avatar_link']['value'].bind("<Button-1>", lambda e: self._open_url(avatar_url_link))
+            
+            if 'social' in sections:
+                # Update social statistics and badges
+                social = additional_info.get('social') or SocialCounts()
+                self.info_widgets['friends']['value'].config(text=section_value(social.friends, 'social'))
+                self.info_widgets['followers']['value'].config(text=section_value(social.followers, 'social'))
+                self.info_widgets['following']['value'].config(text=section_value(social.following, 'social'))
+                self.info_widgets['badges']['value'].config(text=section_value(social.badges, 'social'))
+            
+            if 'presence' in sections:
+                presence = additional_info.get('presence')
+                if presence:
+                    status, current_game, last_location = presence.presence, presence.current_game, presence.last_location
+                else:
+                    status = current_game = last_location = None
+                self.info_widgets['status']['value'].config(text=section_value(status, 'presence'))
+                self.info_widgets['current_game']['value'].config(text=section_value(current_game, 'presence'))
+                self.info_widgets['last_location']['value'].config(text=section_value(last_location, 'presence'))
+            
+            if {'social', 'groups', 'presence'} & set(sections):
+                self.info_widgets['changes']['value'].config(text=self._format_changes(additional_info))
+                self.info_widgets['history']['value'].set_rows(
+                    list(reversed(additional_info.get('history', []))),
+                    message="Stats are recorded here on every lookup (needs the user index)")
+            
+            # Owned groups, owned games and alt accounts (tables render only visible rows)
+            if 'groups' in sections:
+                self.info_widgets['groups']['value'].config(
+                    text=section_value(additional_info.get('groups_count'), 'groups'))
+                self.info_widgets['owned_groups']['value'].set_rows(
+                    additional_info.get('owned_groups', []), message=empty_message('groups', "None"))
+            if 'games' in sections:
+                owned_games = additional_info.get('owned_games', [])
+                next_cursor = getattr(owned_games, 'next_cursor', None)
+                self.owned_games_next = (user_info.id, next_cursor) if next_cursor else None
+                self.info_widgets['owned_games']['value'].set_rows(owned_games, message=empty_message('games', "None"))
+                self.info_widgets['game_tiles']['value'].set_items(owned_games)
+            if 'alt_accounts' in sections:
+                self.info_widgets['alt_accounts']['value'].set_rows(
+                    additional_info.get('alt_accounts', []), message=empty_message('alt_accounts', "None detected"))
+                self.info_widgets['alt_tiles']['value'].set_items(additional_info.get('alt_accounts', []))
+                self.info_widgets['friend_tiles']['value'].set_items(
+                    additional_info.get('friends', []), message="Friends show up here after an alt check")
+            
+            if offline:
+                saved = f" for {', '.join(sorted(stale))}" if stale else ""
+                self._update_status(f"⚠ Roblox is unreachable; showing saved data{saved}", is_warning=True)
+            elif stale:
+                self._update_status(f"Showing saved {', '.join(sorted(stale))}; revalidating...")
+            elif degraded or timed_out:
+                lines = ["⚠ Partial result"]
+                for section, endpoints in sorted(degraded.items()):
+                    lines.append(f"  {section}: degraded, circuit open for {', '.join(endpoints)}")
+                if timed_out:
+                    lines.append(f"  timed out: {', '.join(sorted(timed_out))}")
+                self._update_status("\n".join(lines), is_warning=True)
+            elif len(sections) == 1:
+                self._update_status(f"✓ Loaded {sections[0].replace('_', ' ')}")
+            elif additional_info.get('refresh_summary'):
+                self._update_status(f"✓ Information refreshed ({additional_info['refresh_summary']})")
+            else:
+                self._update_status("✓ Information loaded successfully!")
+            
+        except Exception as e:
+            self._show_error(f"Error updating UI: {str(e)}")
+    
+    def _format_changes(self, additional_info):
+        """Describe how the stats just fetched differ from the ones recorded by the previous lookup"""
+        if 'changes' not in additional_info:
+            return "No stats recorded (needs the user index)"
+        changes = additional_info['changes']
+        if not changes:
+            return "First recorded check"
+        lines = [f"Since {self.format_date(max(change[2] for change in changes.values()))}"]
+        for field in HISTORY_FIELDS:
+            if field not in changes:
+                continue
+            old, new, _ = changes[field]
+            label = "Status" if field == 'presence' else field.capitalize()
+            if old == new:
+                lines.append(f"{label}: unchanged ({_format_count(new)})")
+            elif field == 'presence':
+                lines.append(f"{label}: {old} → {new}")
+            else:
+                lines.append(f"{label}: {_format_count(old)} → {_format_count(new)} ({new - old:+,})")
+        return "\n".join(lines)
+    
+    def _open_game_page(self, game):
+        """Open an owned game's page, falling back to a search when the root place is unknown"""
+        if game.root_place_id:
+            self._open_url(f"https://www.roblox.com/games/{game.root_place_id}")
+        else:
+            self._open_url(f"https://www.roblox.com/discover/?Keyword={game.name or ''}")
+    
+    def _load_more_games(self):
+        """Fetch the next page of owned games once the table is scrolled to its end"""
+        if not self.owned_games_next:
+            return
+        user_id, cursor = self.owned_games_next
+        self.owned_games_next = None
+        self._update_status("Loading more games...")
+        thread = threading.Thread(target=self._load_more_games_thread, args=(user_id, cursor))
+        thread.daemon = True
+        thread.start()
+    
+    def _load_more_games_thread(self, user_id, cursor):
+        page = self.engine.get_owned_games(user_id, cursor)
+        self.post(self._append_owned_games, user_id, page)
+    
+    def _append_owned_games(self, user_id, page):
+        """Add a page of owned games, unless another user has been looked up meanwhile"""
+        if self.info_widgets['user_id']['value'].cget('text') != str(user_id):
+            return
+        self.owned_games_next = (user_id, page.next_cursor) if page.next_cursor else None
+        self.info_widgets['owned_games']['value'].append_rows(page)
+        self.info_widgets['game_tiles']['value'].append_items(page)
+        self._update_status(f"✓ Loaded {len(page)} more games" + ("" if page.next_cursor else " (all shown)"))
+    
+    def toggle_export(self):
+        """Export the shown user's chosen list to a file, or stop the export that is running"""
+        if self.export_stop is not None:
+            self.export_stop.set()
+            self.export_button.config(state=tk.DISABLED)
+            return
+        user_id = self.info_widgets['user_id']['value'].cget('text')
+        if not user_id.isdigit():
+            messagebox.showwarning("Warning", "Look up a user first")
+            return
+        from tkinter import filedialog
+        kind = self.export_list.get()
+        username = self.info_widgets['username']['value'].cget('text')
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title=f"Export {kind} of {username}",
+            initialfile=f"{username}-{kind}.ndjson",
+            defaultextension=".ndjson",
+            filetypes=[("NDJSON", "*.ndjson"), ("CSV", "*.csv")]
+        )
+        if not path:
+            return
+        self.export_stop = threading.Event()
+        self.export_button.config(text="Stop")
+        thread = threading.Thread(target=self._export_thread,
+                                  args=(int(user_id), kind, path, self.export_enrich.get(), self.export_stop))
+        thread.daemon = True
+        thread.start()
+    
+    def _export_thread(self, user_id, kind, path, enrich, stop):
+        export = ConnectionExport(self.engine, user_id, kind, path, enrich=enrich)
+        
+        def progress(count, cursor):
+            self.post(self._update_status, f"Exporting {kind}: {count:,} written...", key='status')
+        
+        try:
+            export.run(on_progress=progress, stop=stop)
+            if export.finished:
+                self.post(self._update_status, f"✓ Exported {export.count:,} {kind} to {path}", key='status')
+            else:
+                self.post(self._update_status, f"Export stopped after {export.count:,} {kind}; "
+                          "export to the same file again to resume", key='status')
+        except Exception as e:
+            self.post(self._update_status, f"Export stopped after {export.count:,} {kind}: {e}\n"
+                      "Export to the same file again to resume", is_warning=True, key='status')
+        finally:
+            self.post(self._export_finished)
+    
+    def _export_finished(self):
+        self.export_stop = None
+        self.export_button.config(text="Export...", state=tk.NORMAL)
+    
+    def _copy_server_id(self, server):
+        """Copy a server's job ID to the clipboard"""
+        self.root.clipboard_clear()
+        self.root.clipboard_append(str(server['server_id']))
+        self._update_status(f"Copied server ID {server['server_id']} to clipboard")
+    
+    def use_current_game_id(self):
+        """Extract universe ID from current game and fill it in"""
+        self.server_search_section.build()
+        current_game_text = self.info_widgets.get('current_game', {}).get('value', None)
+        if current_game_text:
+            text = current_game_text.cget('text')
+            # Extract universe ID from text like "Game Name (Universe: 123456)"
+            match = re.search(r'Universe:\s*(\d+)', text)
+            if match:
+                universe_id = match.group(1)
+                self.game_id_entry.delete(0, tk.END)
+                self.game_id_entry.insert(0, universe_id)
+                messagebox.showinfo("Success", f"Game ID set to {universe_id}")
+            else:
+                messagebox.showwarning("Warning", "Could not extract Universe ID from current game. Please enter it manually.")
+        else:
+            messagebox.showwarning("Warning", "No current game information available. Please search for a user first.")
+    
+    def search_user_in_servers(self):
+        """Search for the current user in game servers"""
+        game_id = self.game_id_entry.get().strip()
+        if not game_id:
+            messagebox.showwarning("Warning", "Please enter a Game ID (Universe ID)")
+            return
+        
+        # The user this tab has looked up
+        username = self.info_widgets['username']['value'].cget('text')
+        if not username:
+            messagebox.showwarning("Warning", "Please search for a user first")
+            return
+        
+        # Disable button and show loading
+        self.search_servers_button.config(state=tk.DISABLED)
+        self._update_server_result("Searching servers... This may take a while...")
+        self.root.update()
+        
+        # Fetch in a separate thread
+        thread = threading.Thread(target=self._search_servers_thread,
+                                  args=(game_id, username, self._new_profiler(f"Server search '{username}'")))
+        thread.daemon = True
+        thread.start()
+    
+    def _search_servers_thread(self, game_id, username, profiler=None):
+        """Search servers in a separate thread"""
+        try:
+            result_text, server_rows = self.engine.search_servers(
+                game_id, username,
+                on_progress=lambda message: self.post(self._update_server_result, message,
+                                                      key='server_search_result'),
+                profiler=profiler)
+            self.post(self._update_server_result, result_text, server_rows, key='server_search_result')
+            
+        except Exception as e:
+            self.post(self._update_server_result, f"Error: {str(e)}", key='server_search_result')
+        finally:
+            self.post(self.search_servers_button.config, key='search_servers_button', state=tk.NORMAL)
+            if profiler:
+                self._report_profile(profiler.finish())
+    
+    def sweep_servers(self):
+        """Search several games' servers for several users at once"""
+        usernames = [name.strip() for name in self.sweep_users_entry.get().split(',') if name.strip()]
+        universe_ids = [universe.strip() for universe in
+                        (self.sweep_universes_entry.get() or self.game_id_entry.get()).split(',') if universe.strip()]
+        if not usernames:
+            messagebox.showwarning("Warning", "Please enter the usernames to look for, separated by commas")
+            return
+        if not universe_ids:
+            messagebox.showwarning("Warning", "Please enter one or more Universe IDs, separated by commas")
+            return
+        
+        self.sweep_button.config(state=tk.DISABLED)
+        self._update_server_result(f"Sweeping {len(universe_ids)} game(s) for {len(usernames)} user(s)...")
+        
+        thread = threading.Thread(target=self._sweep_servers_thread,
+                                  args=(usernames, universe_ids,
+                                        self._new_profiler(f"Server sweep ({len(usernames)} users)")))
+        thread.daemon = True
+        thread.start()
+    
+    def _sweep_servers_thread(self, usernames, universe_ids, profiler=None):
+        """Sweep servers in a separate thread"""
+        try:
+            result_text, hits = self.engine.sweep_servers(
+                usernames, universe_ids,
+                on_progress=lambda message: self.post(self._update_server_result, message,
+                                                      key='server_search_result'),
+                profiler=profiler)
+            self.post(self._update_server_result, result_text, hits, key='server_search_result')
+        except Exception as e:
+            self.post(self._update_server_result, f"Error: {str(e)}", key='server_search_result')
+        finally:
+            self.post(self.sweep_button.config, key='sweep_button', state=tk.NORMAL)
+            if profiler:
+                self._report_profile(profiler.finish())
+    
+    def _update_server_result(self, text, servers=None):
+        """Update server search result text and the server table"""
+        self.info_widgets['server_search_result']['value'].config(text=text)
+        self.info_widgets['server_list']['value'].set_rows(servers or [])
+    
+    def _show_error(self, message):
+        """Show error message"""
+        self._update_status("✗ Error occurred", is_warning=True)
+        messagebox.showerror("Error", message)
 
 
 class RobloxUserInfoApp:
-    def __init__(self, root):
+    def __init__(self, root, startup_timer=None, engine=None, profile_output=None):
         self.root = root
+        self.startup_timer = startup_timer
+        # When set, profiled lookups also capture cProfile and tracemalloc and append the report here
+        self.profile_output = profile_output
         self.root.title("RBLX Lookup")
         self.root.geometry("1000x900")
         # Dark minimalist theme colors (matching the UI style)
@@ -42,11 +5593,30 @@ class RobloxUserInfoApp:
         self.style.configure('Info.TLabel', font=('Arial', 10), background=self.section_bg, foreground=self.text_color)
         self.style.configure('Custom.TButton', font=('Arial', 11, 'bold'))
         
-        # Store avatar image reference
-        self.avatar_image = None
+        # Lookup logic, with the shared HTTP client and last known snapshot of every user;
+        # every tab's lookups run on it at the same time
+        self.engine = engine or LookupEngine()
         
-        self.setup_ui()
+        # Worker threads hand all widget updates to this queue instead of root.after
+        self.ui_queue = UiUpdateQueue(self.root)
+        
+        # Batched headshot and game icon loader for the thumbnail grids, created on first use
+        self.thumbnails = None
+        
+        # Open lookup tabs, in notebook order
+        self.tabs = []
         
+        # Speculative prefetch while typing: last seen text, pending after() timer and the
+        # running prefetch as (username, Deadline, thread)
+        self._typed_text = ""
+        self._prefetch_timer = None
+        self._prefetch = None
+        
+        self.setup_ui()
+        self.ui_queue.start()
+        if self.startup_timer:
+            self.startup_timer.mark("ui built")
+    
     def setup_ui(self):
         # Main container - matching reference layout
         main_frame = tk.Frame(self.root, bg=self.bg_color)
@@ -95,10 +5665,25 @@ class RobloxUserInfoApp:
         )
         version_label.pack(anchor=tk.W)
         
-        # Right side: Empty for now (can add options later if needed)
+        # Right side: options
         right_top = tk.Frame(top_section, bg=self.panel_bg)
         right_top.pack(side=tk.RIGHT)
         
+        # Profiling shows a stage waterfall in the status panel after each lookup
+        self.profile_lookups = tk.BooleanVar(value=False)
+        profile_checkbox = tk.Checkbutton(
+            right_top,
+            text="Profile",
+            font=('Arial', 9),
+            bg=self.panel_bg,
+            fg=self.text_color,
+            activebackground=self.panel_bg,
+            activeforeground=self.text_color,
+            selectcolor=self.section_bg,
+            variable=self.profile_lookups
+        )
+        profile_checkbox.pack(anchor=tk.E)
+        
         # Search section
         search_section = tk.Frame(content_frame, bg=self.panel_bg)
         search_section.pack(fill=tk.X, padx=15, pady=(0, 15))
@@ -135,320 +5720,170 @@ class RobloxUserInfoApp:
         )
         self.username_entry.pack(padx=2, pady=2)
         self.username_entry.bind('<Return>', lambda e: self.fetch_user_info())
+        self.username_entry.bind('<KeyRelease>', self._on_username_typed)
+        self.username_entry.bind('<Down>', lambda e: self._focus_suggestions())
+        self.username_entry.bind('<Escape>', lambda e: self._hide_suggestions())
+        
+        # Autocomplete from usernames resolved before, shown under the entry while typing
+        self.suggestions = tk.Listbox(
+            self.root,
+            font=('Arial', 10),
+            bg=self.section_bg,
+            fg=self.text_color,
+            selectbackground=self.accent_color,
+            relief=tk.FLAT,
+            highlightthickness=1,
+            highlightbackground=self.border_color,
+            activestyle='none'
+        )
+        self.suggestions.bind('<ButtonRelease-1>', lambda e: self._choose_suggestion())
+        self.suggestions.bind('<Return>', lambda e: self._choose_suggestion())
+        self.suggestions.bind('<Escape>', lambda e: self._hide_suggestions())
         
         # Search button with minimalist style
         self.search_button = self._create_minimalist_button(search_frame, "Search", width=12, command=self.fetch_user_info)
         self.search_button.pack(side=tk.LEFT, padx=(0, 8))
         
-        # Checkbox for alt account detection
-        self.check_alt_accounts = tk.BooleanVar(value=False)
-        alt_checkbox = tk.Checkbutton(
+        # Searches open a tab of their own; this adds an empty one for the next search
+        new_tab_button = self._create_minimalist_button(search_frame, "New Tab", width=8, command=self.new_tab)
+        new_tab_button.pack(side=tk.LEFT, padx=(0, 8))
+        
+        # Lookup profile: which sections a search fetches ("full+alts" also checks for alt accounts)
+        profile_label = tk.Label(
             search_frame,
-            text="Check for alt accounts",
+            text="Profile:",
             font=('Arial', 9),
             bg=self.panel_bg,
-            fg=self.text_color,
-            activebackground=self.panel_bg,
-            activeforeground=self.text_color,
-            selectcolor=self.section_bg,
-            variable=self.check_alt_accounts
-        )
-        alt_checkbox.pack(side=tk.LEFT)
-        
-        # Main content area - split layout
-        main_content = tk.Frame(content_frame, bg=self.panel_bg)
-        main_content.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
-        
-        # Create scrollable canvas for content
-        canvas_frame = tk.Frame(main_content, bg=self.panel_bg)
-        canvas_frame.pack(fill=tk.BOTH, expand=True)
-        
-        canvas = tk.Canvas(canvas_frame, bg=self.panel_bg, highlightthickness=0)
-        scrollbar = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.panel_bg)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Content container
-        self.content_frame = scrollable_frame
-        
-        # Status panel at bottom (matching reference UI)
-        status_panel = tk.Frame(content_frame, bg=self.panel_bg)
-        status_panel.pack(fill=tk.X, padx=15, pady=(0, 15))
-        
-        status_label = tk.Label(
-            status_panel,
-            text="Status",
-            font=('Arial', 10, 'bold'),
-            bg=self.panel_bg,
-            fg=self.title_color
-        )
-        status_label.pack(anchor=tk.W, pady=(0, 5))
-        
-        # Status text area with border
-        status_border = tk.Frame(status_panel, bg=self.border_color, relief=tk.FLAT, borderwidth=1)
-        status_border.pack(fill=tk.BOTH, expand=True)
-        
-        status_inner = tk.Frame(status_border, bg=self.section_bg)
-        status_inner.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
-        
-        # Status text widget for multiple lines
-        self.status_text = tk.Text(
-            status_inner,
-            font=('Arial', 9),
-            bg=self.section_bg,
-            fg=self.text_color,
-            relief=tk.FLAT,
-            borderwidth=0,
-            wrap=tk.WORD,
-            height=5,
-            padx=10,
-            pady=8
+            fg=self.text_color
         )
-        self.status_text.pack(fill=tk.BOTH, expand=True)
-        self.status_text.insert('1.0', "Welcome back,\n")
-        self.status_text.config(state=tk.DISABLED)
-        
-        # Keep loading_label reference for compatibility
-        class StatusLabel:
-            def __init__(self, status_text):
-                self.status_text = status_text
-            def config(self, **kwargs):
-                if 'text' in kwargs:
-                    self.status_text.config(state=tk.NORMAL)
-                    self.status_text.delete('1.0', tk.END)
-                    self.status_text.insert('1.0', kwargs['text'])
-                    self.status_text.config(state=tk.DISABLED)
-        
-        self.loading_label = StatusLabel(self.status_text)
-        
-        # Initialize info widgets (will be populated when data is loaded)
-        self.info_widgets = {}
-        self._create_info_widgets()
-    
-    def _create_minimalist_button(self, parent, text, width=10, command=None):
-        """Create a minimalist button matching the UI style"""
-        button = tk.Button(
-            parent,
-            text=text,
+        profile_label.pack(side=tk.LEFT, padx=(0, 4))
+        self.lookup_profile = tk.StringVar(value=DEFAULT_LOOKUP_PROFILE)
+        profile_menu = tk.OptionMenu(search_frame, self.lookup_profile, *LOOKUP_PROFILES)
+        profile_menu.config(
             font=('Arial', 9),
             bg=self.section_bg,
             fg=self.text_color,
             activebackground=self.panel_bg,
             activeforeground=self.text_color,
             relief=tk.FLAT,
-            borderwidth=1,
-            highlightthickness=1,
-            highlightbackground=self.border_color,
-            width=width,
-            cursor="hand2",
-            command=command
-        )
-        return button
-    
-    def _update_status(self, message, is_warning=False):
-        """Update status panel with message"""
-        self.status_text.config(state=tk.NORMAL)
-        self.status_text.delete('1.0', tk.END)
-        if is_warning:
-            self.status_text.insert('1.0', message, 'warning')
-            self.status_text.tag_config('warning', foreground=self.warning_color)
-        else:
-            self.status_text.insert('1.0', message)
-        self.status_text.config(state=tk.DISABLED)
-        
-    def _create_info_widgets(self):
-        """Create all info display widgets"""
-        # Top section: Avatar and basic info
-        top_section = tk.Frame(self.content_frame, bg=self.bg_color)
-        top_section.pack(fill=tk.X, pady=(0, 20))
-        
-        # Avatar frame with border
-        avatar_outer = tk.Frame(top_section, bg=self.border_color, relief=tk.FLAT, borderwidth=1)
-        avatar_outer.pack(side=tk.LEFT, padx=(0, 10))
-        avatar_container = tk.Frame(avatar_outer, bg=self.section_bg)
-        avatar_container.pack(padx=1, pady=1)
-        
-        self.avatar_label = tk.Label(
-            avatar_container,
-            text="Avatar",
-            font=('Arial', 9),
-            bg=self.section_bg,
-            fg=self.text_color,
-            width=18,
-            height=8
-        )
-        self.avatar_label.pack(padx=8, pady=8)
-        
-        # Basic info frame with border
-        basic_outer = tk.Frame(top_section, bg=self.border_color, relief=tk.FLAT, borderwidth=1)
-        basic_outer.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        basic_info_frame = tk.Frame(basic_outer, bg=self.section_bg)
-        basic_info_frame.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
-        
-        basic_title = tk.Label(
-            basic_info_frame,
-            text="Basic Information",
-            font=('Arial', 10, 'bold'),
-            bg=self.section_bg,
-            fg=self.title_color
-        )
-        basic_title.pack(anchor=tk.W, padx=10, pady=(10, 6))
-        
-        self.info_widgets['username'] = self._create_info_row(basic_info_frame, "Username:", "")
-        self.info_widgets['display_name'] = self._create_info_row(basic_info_frame, "Display Name:", "")
-        self.info_widgets['user_id'] = self._create_info_row(basic_info_frame, "User ID:", "")
-        self.info_widgets['description'] = self._create_info_row(basic_info_frame, "Description:", "", multiline=True)
-        
-        # Account details section
-        account_section = self._create_section("📅 Account Details")
-        self.info_widgets['created'] = self._create_info_row(account_section, "Created:", "")
-        self.info_widgets['is_banned'] = self._create_info_row(account_section, "Is Banned:", "")
-        self.info_widgets['verified'] = self._create_info_row(account_section, "Verified Badge:", "")
-        
-        # Social statistics section
-        social_section = self._create_section("👥 Social Statistics")
-        self.info_widgets['friends'] = self._create_info_row(social_section, "Friends:", "")
-        self.info_widgets['followers'] = self._create_info_row(social_section, "Followers:", "")
-        self.info_widgets['following'] = self._create_info_row(social_section, "Following:", "")
-        
-        # Achievements section
-        achievements_section = self._create_section("🏆 Achievements")
-        self.info_widgets['badges'] = self._create_info_row(achievements_section, "Badges:", "")
-        self.info_widgets['groups'] = self._create_info_row(achievements_section, "Groups:", "")
-        
-        # Presence section
-        presence_section = self._create_section("🌐 Status")
-        self.info_widgets['status'] = self._create_info_row(presence_section, "Status:", "")
-        self.info_widgets['current_game'] = self._create_info_row(presence_section, "Current Game:", "")
-        self.info_widgets['last_location'] = self._create_info_row(presence_section, "Last Location:", "")
-        
-        # Owned Groups section
-        owned_groups_section = self._create_section("👑 Owned Groups")
-        self.info_widgets['owned_groups'] = self._create_info_row(owned_groups_section, "Groups:", "", multiline=True)
-        
-        # Owned Games section
-        owned_games_section = self._create_section("🎮 Owned Games")
-        self.info_widgets['owned_games'] = self._create_info_row(owned_games_section, "Games:", "", multiline=True)
-        
-        # Possible Alt Accounts section
-        alt_accounts_section = self._create_section("🔍 Possible Alt Accounts")
-        self.info_widgets['alt_accounts'] = self._create_info_row(alt_accounts_section, "Potential Alts:", "", multiline=True)
-        
-        # Server Search section
-        server_search_section = self._create_section("🎮 Snipe Server")
-        server_search_frame = tk.Frame(server_search_section, bg=self.section_bg)
-        server_search_frame.pack(fill=tk.X, padx=15, pady=10)
-        
-        game_id_label = tk.Label(
-            server_search_frame,
-            text="Game ID (Universe ID):",
-            font=('Arial', 10, 'bold'),
-            bg=self.section_bg,
-            fg=self.label_color
+            highlightthickness=0
         )
-        game_id_label.pack(side=tk.LEFT, padx=(0, 10))
+        profile_menu.pack(side=tk.LEFT)
         
-        # Entry with border
-        entry_wrapper = tk.Frame(server_search_frame, bg=self.bg_color)
-        entry_wrapper.pack(side=tk.LEFT, padx=(0, 8))
-        self.game_id_entry = tk.Entry(
-            entry_wrapper,
+        # Checkbox for incremental refresh (reuse fields that are still fresh)
+        self.incremental_refresh = tk.BooleanVar(value=True)
+        incremental_checkbox = tk.Checkbutton(
+            search_frame,
+            text="Incremental refresh",
             font=('Arial', 9),
-            width=18,
             bg=self.panel_bg,
             fg=self.text_color,
-            insertbackground=self.text_color,
-            relief=tk.FLAT,
-            borderwidth=1,
-            highlightthickness=1,
-            highlightbackground=self.border_color,
-            highlightcolor=self.accent_color
+            activebackground=self.panel_bg,
+            activeforeground=self.text_color,
+            selectcolor=self.section_bg,
+            variable=self.incremental_refresh
         )
-        self.game_id_entry.pack(padx=2, pady=2)
-        
-        # Buttons with minimalist style
-        self.search_servers_button = tk.Button(
-            server_search_frame,
-            text="Search Servers",
+        incremental_checkbox.pack(side=tk.LEFT, padx=(8, 0))
+        
+        # Total time budget for a lookup; sections still loading when it runs out show "Timed out"
+        deadline_label = tk.Label(
+            search_frame,
+            text="Deadline (s):",
             font=('Arial', 9),
             bg=self.panel_bg,
+            fg=self.text_color
+        )
+        deadline_label.pack(side=tk.LEFT, padx=(8, 4))
+        self.deadline_var = tk.StringVar(value=str(DEFAULT_LOOKUP_DEADLINE))
+        deadline_spinbox = tk.Spinbox(
+            search_frame,
+            from_=0.5,
+            to=120,
+            increment=0.5,
+            width=5,
+            font=('Arial', 9),
+            bg=self.section_bg,
             fg=self.text_color,
-            activebackground=self.section_bg,
-            activeforeground=self.text_color,
+            buttonbackground=self.section_bg,
             relief=tk.FLAT,
-            borderwidth=1,
-            highlightthickness=1,
-            highlightbackground=self.border_color,
-            padx=12,
-            pady=3,
-            cursor="hand2",
-            command=self.search_user_in_servers
+            textvariable=self.deadline_var
         )
-        self.search_servers_button.pack(side=tk.LEFT, padx=(0, 5))
+        deadline_spinbox.pack(side=tk.LEFT)
         
-        # Button to use current game ID
-        use_current_button = tk.Button(
-            server_search_frame,
-            text="Use Current Game",
-            font=('Arial', 8),
-            bg=self.panel_bg,
+        # Main content area: one tab per lookup, so several can run side by side
+        self.style.configure('TNotebook', background=self.panel_bg, borderwidth=0)
+        self.style.configure('TNotebook.Tab', font=('Arial', 9), padding=(10, 4),
+                             background=self.section_bg, foreground=self.label_color)
+        self.style.map('TNotebook.Tab', background=[('selected', self.panel_bg)],
+                       foreground=[('selected', self.title_color)])
+        self.notebook = ttk.Notebook(content_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
+        self.root.bind('<Control-w>', lambda e: self.close_tab(self.current_tab()))
+        self.new_tab()
+    
+    def _create_minimalist_button(self, parent, text, width=10, command=None):
+        """Create a minimalist button matching the UI style"""
+        button = tk.Button(
+            parent,
+            text=text,
+            font=('Arial', 9),
+            bg=self.section_bg,
             fg=self.text_color,
-            activebackground=self.section_bg,
+            activebackground=self.panel_bg,
             activeforeground=self.text_color,
             relief=tk.FLAT,
             borderwidth=1,
             highlightthickness=1,
             highlightbackground=self.border_color,
-            padx=8,
-            pady=3,
+            width=width,
             cursor="hand2",
-            command=self.use_current_game_id
+            command=command
         )
-        use_current_button.pack(side=tk.LEFT)
-        
-        self.info_widgets['server_search_result'] = self._create_info_row(server_search_section, "Result:", "", multiline=True)
-        
-        # Add info label about API limitations - warning style
-        info_label = tk.Label(
-            server_search_section,
-            text="⚠ Note: Roblox API doesn't provide player lists. If user is in game, all servers will be shown.",
-            font=('Arial', 7),
+        return button
+    
+    def _create_table_row(self, parent, columns, on_activate=None, on_scroll_end=None):
+        """Create a virtualized, sortable table row for list results"""
+        row_frame = tk.Frame(parent, bg=self.panel_bg)
+        row_frame.pack(fill=tk.X, padx=12, pady=4)
+        table = VirtualTable(
+            row_frame,
+            columns,
+            on_activate=on_activate,
+            on_scroll_end=on_scroll_end,
             bg=self.panel_bg,
-            fg=self.warning_color,
-            wraplength=800
+            fg=self.text_color,
+            header_bg=self.section_bg,
+            header_fg=self.label_color,
+            stripe_bg=self.section_bg,
+            accent=self.accent_color
         )
-        info_label.pack(anchor=tk.W, padx=12, pady=(0, 8))
-        
-        # Links section
-        links_section = self._create_section("🔗 Links")
-        self.info_widgets['profile_link'] = self._create_info_row(links_section, "Profile:", "", link=True)
-        self.info_widgets['avatar_link'] = self._create_info_row(links_section, "Avatar:", "", link=True)
-        
-    def _create_section(self, title):
-        """Create a section with title"""
-        section_frame = tk.Frame(self.content_frame, bg=self.section_bg, relief=tk.RAISED, borderwidth=2)
-        section_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        title_label = tk.Label(
-            section_frame,
-            text=title,
-            font=('Arial', 14, 'bold'),
-            bg=self.section_bg,
-            fg=self.title_color
+        table.pack(fill=tk.X, expand=True)
+        return {'label': None, 'value': table, 'type': 'table'}
+    
+    def _create_grid_row(self, parent, kind, caption_key, on_activate=None):
+        """Create a thumbnail grid row that loads only the tiles in view"""
+        row_frame = tk.Frame(parent, bg=self.panel_bg)
+        row_frame.pack(fill=tk.X, padx=12, pady=4)
+        grid = ThumbnailGrid(
+            row_frame,
+            kind,
+            self._get_thumbnails,
+            self.ui_queue.post,
+            caption_key=caption_key,
+            on_activate=on_activate,
+            bg=self.panel_bg,
+            fg=self.text_color,
+            tile_bg=self.section_bg,
+            accent=self.accent_color
         )
-        title_label.pack(anchor=tk.W, padx=15, pady=(15, 10))
-        
-        return section_frame
+        grid.pack(fill=tk.X, expand=True)
+        return {'label': None, 'value': grid, 'type': 'grid'}
+    
+    def _get_thumbnails(self):
+        """Thumbnail loader shared by every grid, using the engine's client when it has one"""
+        if self.thumbnails is None:
+            self.thumbnails = ThumbnailService(self.engine.client or RobloxApiClient())
+        return self.thumbnails
     
     def _create_info_row(self, parent, label_text, value_text, multiline=False, link=False):
         """Create an info row with label and value - minimalist style"""
@@ -503,852 +5938,854 @@ class RobloxUserInfoApp:
             value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
             return {'label': label, 'value': value_label, 'type': 'normal'}
     
+    def new_tab(self):
+        """Open an empty lookup tab and switch to it"""
+        tab = LookupTab(self, self.notebook)
+        self.tabs.append(tab)
+        self.notebook.select(tab.frame)
+        return tab
+    
+    def current_tab(self):
+        selected = self.notebook.select()
+        for tab in self.tabs:
+            if str(tab.frame) == selected:
+                return tab
+        return self.tabs[-1]
+    
+    def close_tab(self, tab):
+        """Close a tab, cancelling its lookup and export; closing the last one leaves an empty tab"""
+        tab.close()
+        self.tabs.remove(tab)
+        if not self.tabs:
+            self.new_tab()
+    
     def fetch_user_info(self):
         username = self.username_entry.get().strip()
         if not username:
             messagebox.showwarning("Warning", "Please enter a username")
             return
         
-        # Clear previous data
-        self._clear_info_widgets()
-        
-        # Disable button and show loading
-        self.search_button.config(state=tk.DISABLED)
-        self._update_status("Loading user information...")
-        self.avatar_label.config(image='', text="Loading avatar...")
-        self.root.update()
-        
-        # Fetch in a separate thread to avoid freezing UI
-        thread = threading.Thread(target=self._fetch_user_info_thread, args=(username,))
-        thread.daemon = True
-        thread.start()
-        
-    def _clear_info_widgets(self):
-        """Clear all info widgets"""
-        for widget_info in self.info_widgets.values():
-            if widget_info['type'] == 'link':
-                widget_info['value'].config(text="", cursor="")
-            else:
-                widget_info['value'].config(text="")
-    
-    def _fetch_user_info_thread(self, username):
-        try:
-            # Step 1: Get user ID from username
-            user_id = self.get_user_id(username)
-            if not user_id:
-                self.root.after(0, self._show_error, f"User '{username}' not found")
-                return
-            
-            # Step 2: Get user information
-            user_info = self.get_user_info(user_id)
-            if not user_info:
-                self.root.after(0, self._show_error, "Failed to fetch user information")
-                return
-            
-            # Step 3: Get additional user data
-            additional_info = self.get_additional_user_info(user_id)
-            
-            # Step 4: Get owned groups
-            owned_groups = self.get_owned_groups(user_id)
-            additional_info['owned_groups'] = owned_groups
-            
-            # Step 5: Get owned games
-            owned_games = self.get_owned_games(user_id)
-            additional_info['owned_games'] = owned_games
-            
-            # Step 6: Get possible alt accounts (only if checkbox is checked)
-            if self.check_alt_accounts.get():
-                self.root.after(0, lambda: self._update_status("Analyzing friends for alt accounts..."))
-                alt_accounts = self.detect_alt_accounts(user_id, user_info)
-                additional_info['alt_accounts'] = alt_accounts
-            else:
-                additional_info['alt_accounts'] = []
-            
-            # Step 7: Get avatar
-            avatar_url = self.get_avatar_url(user_id)
-            
-            # Update UI in main thread
-            self.root.after(0, self._update_ui, user_info, additional_info, avatar_url, username)
-            
-        except Exception as e:
-            self.root.after(0, self._show_error, f"Error: {str(e)}")
-    
-    def get_user_id(self, username):
-        """Get user ID from username"""
-        try:
-            url = "https://users.roblox.com/v1/usernames/users"
-            payload = {
-                "usernames": [username],
-                "excludeBannedUsers": False
-            }
-            response = requests.post(url, json=payload, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("data") and len(data["data"]) > 0:
-                return data["data"][0]["id"]
-            return None
-        except Exception as e:
-            print(f"Error getting user ID: {e}")
-            return None
-    
-    def get_user_info(self, user_id):
-        """Get basic user information"""
-        try:
-            url = f"https://users.roblox.com/v1/users/{user_id}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"Error getting user info: {e}")
-            return None
-    
-    def get_additional_user_info(self, user_id):
-        """Get additional user information like friends count, badges, etc."""
-        additional_info = {}
-        
-        try:
-            # Get friends count
-            url = f"https://friends.roblox.com/v1/users/{user_id}/friends/count"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                additional_info['friends_count'] = response.json().get('count', 0)
-        except:
-            additional_info['friends_count'] = "N/A"
-        
-        try:
-            # Get followers count
-            url = f"https://friends.roblox.com/v1/users/{user_id}/followers/count"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                additional_info['followers_count'] = response.json().get('count', 0)
-        except:
-            additional_info['followers_count'] = "N/A"
-        
-        try:
-            # Get following count
-            url = f"https://friends.roblox.com/v1/users/{user_id}/followings/count"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                additional_info['following_count'] = response.json().get('count', 0)
-        except:
-            additional_info['following_count'] = "N/A"
-        
-        try:
-            # Get badges count
-            url = f"https://badges.roblox.com/v1/users/{user_id}/badges/count"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                additional_info['badges_count'] = response.json().get('count', 0)
-        except:
-            additional_info['badges_count'] = "N/A"
-        
-        try:
-            # Get groups count
-            url = f"https://groups.roblox.com/v1/users/{user_id}/groups/roles"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                additional_info['groups_count'] = len(response.json().get('data', []))
-        except:
-            additional_info['groups_count'] = "N/A"
-        
-        try:
-            # Get user presence
-            url = f"https://presence.roblox.com/v1/presence/users"
-            payload = {"userIds": [user_id]}
-            response = requests.post(url, json=payload, timeout=10)
-            if response.status_code == 200:
-                presence_data = response.json().get('userPresences', [])
-                if presence_data:
-                    presence = presence_data[0]
-                    additional_info['presence'] = presence.get('userPresenceType', 'Unknown')
-                    additional_info['last_location'] = presence.get('lastLocation', 'Unknown')
-                    
-                    # Get current game if user is playing
-                    current_game = "N/A"
-                    if presence.get('userPresenceType') == 'InGame' or presence.get('userPresenceType') == 'InStudio':
-                        universe_id = presence.get('universeId')
-                        place_id = presence.get('placeId')
-                        if universe_id:
-                            # Get game name from universe ID
-                            game_name = self.get_game_name(universe_id)
-                            if game_name:
-                                current_game = f"{game_name} (Universe: {universe_id})"
-                            else:
-                                current_game = f"Universe: {universe_id}"
-                        elif place_id:
-                            current_game = f"Place: {place_id}"
-                    additional_info['current_game'] = current_game
-                else:
-                    additional_info['presence'] = "N/A"
-                    additional_info['last_location'] = "N/A"
-                    additional_info['current_game'] = "N/A"
-            else:
-                additional_info['presence'] = "N/A"
-                additional_info['last_location'] = "N/A"
-                additional_info['current_game'] = "N/A"
-        except Exception as e:
-            print(f"Error getting presence: {e}")
-            additional_info['presence'] = "N/A"
-            additional_info['last_location'] = "N/A"
-            additional_info['current_game'] = "N/A"
+        # A prefetch of this name is reused; any other speculative work is cancelled
+        self._hide_suggestions()
+        if self._prefetch_timer is not None:
+            self.root.after_cancel(self._prefetch_timer)
+            self._prefetch_timer = None
+        self._cancel_prefetch(keep=username)
+        prefetch_thread = self._prefetch[2] if self._prefetch else None
+        self._prefetch = None
         
-        return additional_info
+        # Each search gets its own tab, so earlier lookups keep running and stay on screen
+        tab = self.current_tab()
+        if not tab.is_blank():
+            tab = self.new_tab()
+        check_alts, skip = lookup_profile_options(self.lookup_profile.get())
+        tab.start_lookup(username, self.incremental_refresh.get(), check_alts, self._deadline_seconds(),
+                         self._new_profiler(f"Lookup '{username}'"), skip=skip, wait_for=prefetch_thread)
     
-    def get_game_name(self, universe_id):
-        """Get game name from universe ID"""
-        try:
-            url = f"https://games.roblox.com/v1/games?universeIds={universe_id}"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json().get('data', [])
-                if data:
-                    return data[0].get('name', None)
-        except Exception as e:
-            print(f"Error getting game name: {e}")
-        return None
+    def _on_username_typed(self, event=None):
+        """Offer known usernames at once, and prefetch the typed one once typing pauses"""
+        text = self.username_entry.get().strip()
+        if text == self._typed_text:
+            return
+        self._typed_text = text
+        self._show_suggestions(self.engine.complete_username(text))
+        if self._prefetch_timer is not None:
+            self.root.after_cancel(self._prefetch_timer)
+            self._prefetch_timer = None
+        self._cancel_prefetch(keep=text)
+        # Prefetched data lives in the snapshots, which only incremental lookups reuse
+        if self.incremental_refresh.get() and USERNAME_PATTERN.fullmatch(text):
+            self._prefetch_timer = self.root.after(PREFETCH_DELAY_MS, self._start_prefetch, text)
     
-    def get_owned_groups(self, user_id):
-        """Get groups owned by the user"""
-        owned_groups = []
-        try:
-            url = f"https://groups.roblox.com/v1/users/{user_id}/groups/roles"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json().get('data', [])
-                for group_role in data:
-                    if group_role.get('role', {}).get('rank') == 255:  # Owner rank
-                        group = group_role.get('group', {})
-                        owned_groups.append({
-                            'id': group.get('id'),
-                            'name': group.get('name'),
-                            'member_count': group.get('memberCount', 0)
-                        })
-        except Exception as e:
-            print(f"Error getting owned groups: {e}")
-        return owned_groups
+    def _start_prefetch(self, username):
+        self._prefetch_timer = None
+        if self._prefetch and self._prefetch[0].lower() == username.lower():
+            return
+        deadline = Deadline(PREFETCH_DEADLINE)
+        thread = threading.Thread(target=self.engine.prefetch_user, args=(username, deadline))
+        thread.daemon = True
+        self._prefetch = (username, deadline, thread)
+        thread.start()
     
-    def get_owned_games(self, user_id):
-        """Get games/experiences created by the user"""
-        owned_games = []
-        try:
-            url = f"https://games.roblox.com/v2/users/{user_id}/games?accessFilter=2&limit=50&sortOrder=Asc"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json().get('data', [])
-                for game in data:
-                    owned_games.append({
-                        'id': game.get('id'),
-                        'name': game.get('name'),
-                        'playing': game.get('playing', 0),
-                        'visits': game.get('visits', 0),
-                        'created': game.get('created', '')
-                    })
-        except Exception as e:
-            print(f"Error getting owned games: {e}")
-        return owned_games
+    def _cancel_prefetch(self, keep=None):
+        """Cancel the running prefetch unless it is for the username keep"""
+        if self._prefetch and self._prefetch[0].lower() != (keep or "").lower():
+            self._prefetch[1].cancel()
+            self._prefetch = None
     
-    def detect_alt_accounts(self, user_id, user_info):
-        """Detect possible alt accounts by analyzing friends"""
-        potential_alts = []
-        try:
-            # Get user's creation date
-            user_created = user_info.get('created', '')
-            user_username = user_info.get('name', '').lower()
-            user_description = user_info.get('description', '').lower()
-            
-            # Get friends list (limited to first 100 for performance)
-            url = f"https://friends.roblox.com/v1/users/{user_id}/friends?userSort=0&limit=100"
-            response = requests.get(url, timeout=15)
-            if response.status_code != 200:
-                return potential_alts
-            
-            friends = response.json().get('data', [])
-            if not friends:
-                return potential_alts
-            
-            # Analyze each friend for alt account indicators
-            for friend in friends[:50]:  # Limit to 50 for performance
-                friend_id = friend.get('id')
-                friend_name = friend.get('name', '').lower()
-                
-                # Get friend's info
-                try:
-                    friend_info = self.get_user_info(friend_id)
-                    if not friend_info:
-                        continue
-                    
-                    friend_created = friend_info.get('created', '')
-                    friend_description = friend_info.get('description', '').lower()
-                    friend_friends_count = self._get_friends_count(friend_id)
-                    
-                    score = 0
-                    reasons = []
-                    
-                    # Check 1: Similar creation date (within 30 days)
-                    if user_created and friend_created:
-                        try:
-                            user_date = datetime.fromisoformat(user_created.replace('Z', '+00:00'))
-                            friend_date = datetime.fromisoformat(friend_created.replace('Z', '+00:00'))
-                            days_diff = abs((user_date - friend_date).days)
-                            if days_diff <= 30:
-                                score += 3
-                                reasons.append(f"Created {days_diff} days apart")
-                        except:
-                            pass
-                    
-                    # Check 2: Similar username patterns
-                    similarity = SequenceMatcher(None, user_username, friend_name).ratio()
-                    if similarity > 0.6:
-                        score += 2
-                        reasons.append(f"Similar username ({similarity:.0%} match)")
-                    
-                    # Check 3: Common username patterns (numbers, underscores, etc.)
-                    user_base = re.sub(r'[0-9_\-]', '', user_username)
-                    friend_base = re.sub(r'[0-9_\-]', '', friend_name)
-                    if user_base and friend_base and user_base == friend_base:
-                        score += 3
-                        reasons.append("Same base username with variations")
-                    
-                    # Check 4: Similar descriptions
-                    if user_description and friend_description:
-                        desc_similarity = SequenceMatcher(None, user_description[:50], friend_description[:50]).ratio()
-                        if desc_similarity > 0.7:
-                            score += 2
-                            reasons.append("Similar description")
-                    
-                    # Check 5: Low friend count (alts often have few friends)
-                    if friend_friends_count < 10:
-                        score += 1
-                        reasons.append(f"Low friend count ({friend_friends_count})")
-                    
-                    # Check 6: Both have similar low activity (few badges, groups)
-                    friend_badges = self._get_badges_count(friend_id)
-                    if friend_badges < 5:
-                        score += 1
-                        reasons.append(f"Low badge count ({friend_badges})")
-                    
-                    # If score is high enough, consider it a potential alt
-                    if score >= 4:
-                        potential_alts.append({
-                            'username': friend.get('name'),
-                            'id': friend_id,
-                            'score': score,
-                            'reasons': reasons
-                        })
-                
-                except Exception as e:
-                    continue
-            
-            # Sort by score (highest first)
-            potential_alts.sort(key=lambda x: x['score'], reverse=True)
-            
-        except Exception as e:
-            print(f"Error detecting alt accounts: {e}")
-        
-        return potential_alts[:10]  # Return top 10
+    def _show_suggestions(self, names):
+        text = self.username_entry.get().strip().lower()
+        if not names or (len(names) == 1 and names[0].lower() == text):
+            self._hide_suggestions()
+            return
+        self.suggestions.delete(0, tk.END)
+        for name in names:
+            self.suggestions.insert(tk.END, name)
+        self.suggestions.config(height=len(names))
+        self.suggestions.place(in_=self.username_entry, x=0, rely=1.0, relwidth=1.0)
+        self.suggestions.lift()
     
-    def _get_friends_count(self, user_id):
-        """Helper to get friends count"""
-        try:
-            url = f"https://friends.roblox.com/v1/users/{user_id}/friends/count"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                return response.json().get('count', 0)
-        except:
-            pass
-        return 0
+    def _hide_suggestions(self):
+        self.suggestions.place_forget()
     
-    def _get_badges_count(self, user_id):
-        """Helper to get badges count"""
-        try:
-            url = f"https://badges.roblox.com/v1/users/{user_id}/badges/count"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                return response.json().get('count', 0)
-        except:
-            pass
-        return 0
+    def _focus_suggestions(self):
+        if self.suggestions.winfo_ismapped():
+            self.suggestions.focus_set()
+            self.suggestions.selection_clear(0, tk.END)
+            self.suggestions.selection_set(0)
+            self.suggestions.activate(0)
     
-    def get_avatar_url(self, user_id):
-        """Get user avatar URL using current Roblox API"""
-        try:
-            # Updated endpoint: /v1/users/avatar instead of /v1/users/avatar-headshot
-            url = f"https://thumbnails.roblox.com/v1/users/avatar?userIds={user_id}&size=150x150&format=Png&isCircular=false"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("data") and len(data["data"]) > 0:
-                return data["data"][0]["imageUrl"]
-        except Exception as e:
-            print(f"Error getting avatar: {e}")
-        return None
+    def _choose_suggestion(self):
+        """Put the chosen username in the entry and prefetch it right away"""
+        selection = self.suggestions.curselection()
+        if not selection:
+            return
+        name = self.suggestions.get(selection[0])
+        self._hide_suggestions()
+        self.username_entry.delete(0, tk.END)
+        self.username_entry.insert(0, name)
+        self.username_entry.focus_set()
+        self._typed_text = name
+        if self._prefetch_timer is not None:
+            self.root.after_cancel(self._prefetch_timer)
+            self._prefetch_timer = None
+        self._cancel_prefetch(keep=name)
+        if self.incremental_refresh.get():
+            self._start_prefetch(name)
     
-    def _update_ui(self, user_info, additional_info, avatar_url, username):
-        """Update UI with fetched information"""
+    def _deadline_seconds(self):
         try:
-            # Display avatar - fixed to work properly
-            if avatar_url:
-                try:
-                    # Always try to load and display the image
-                    response = requests.get(avatar_url, timeout=10)
-                    response.raise_for_status()
-                    img = Image.open(BytesIO(response.content))
-                    img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                    
-                    # Convert to PhotoImage and display
-                    if IMAGETK_AVAILABLE and ImageTk is not None:
-                        photo = ImageTk.PhotoImage(img)
-                        # Clear any existing text
-                        self.avatar_label.config(image=photo, text="")
-                        # Keep reference to prevent garbage collection - this is critical!
-                        self.avatar_image = photo
-                        self.avatar_label.image = photo
-                    else:
-                        # ImageTk not available
-                        self.avatar_label.config(image='', text="ImageTk not\navailable")
-                except requests.RequestException as e:
-                    error_msg = str(e)[:40]
-                    self.avatar_label.config(image='', text=f"Network error:\n{error_msg}")
-                    print(f"Avatar fetch error: {e}")
-                except Exception as e:
-                    error_msg = str(e)[:40]
-                    self.avatar_label.config(image='', text=f"Error:\n{error_msg}")
-                    print(f"Avatar display error: {e}")
-            else:
-                self.avatar_label.config(image='', text="No avatar URL\navailable")
-            
-            # Update basic information
-            self.info_widgets['username']['value'].config(text=user_info.get('name', 'N/A'))
-            self.info_widgets['display_name']['value'].config(text=user_info.get('displayName', 'N/A'))
-            self.info_widgets['user_id']['value'].config(text=str(user_info.get('id', 'N/A')))
-            desc = user_info.get('description', 'No description')
-            if not desc:
-                desc = "No description"
-            self.info_widgets['description']['value'].config(text=desc)
-            
-            # Update account details
-            self.info_widgets['created']['value'].config(text=self.format_date(user_info.get('created')))
-            self.info_widgets['is_banned']['value'].config(text="Yes" if user_info.get('isBanned', False) else "No")
-            self.info_widgets['verified']['value'].config(text="Yes" if user_info.get('hasVerifiedBadge', False) else "No")
-            
-            # Update social statistics
-            self.info_widgets['friends']['value'].config(text=str(additional_info.get('friends_count', 'N/A')))
-            self.info_widgets['followers']['value'].config(text=str(additional_info.get('followers_count', 'N/A')))
-            self.info_widgets['following']['value'].config(text=str(additional_info.get('following_count', 'N/A')))
-            
-            # Update achievements
-            self.info_widgets['badges']['value'].config(text=str(additional_info.get('badges_count', 'N/A')))
-            self.info_widgets['groups']['value'].config(text=str(additional_info.get('groups_count', 'N/A')))
-            
-            # Update presence
-            self.info_widgets['status']['value'].config(text=str(additional_info.get('presence', 'N/A')))
-            current_game = additional_info.get('current_game', 'N/A')
-            self.info_widgets['current_game']['value'].config(text=str(current_game))
-            self.info_widgets['last_location']['value'].config(text=str(additional_info.get('last_location', 'N/A')))
-            
-            # Update owned groups
-            owned_groups = additional_info.get('owned_groups', [])
-            if owned_groups:
-                groups_text = "\n".join([f"• {g['name']} (ID: {g['id']}, Members: {g['member_count']})" 
-                                       for g in owned_groups[:10]])
-                if len(owned_groups) > 10:
-                    groups_text += f"\n... and {len(owned_groups) - 10} more"
-            else:
-                groups_text = "None"
-            self.info_widgets['owned_groups']['value'].config(text=groups_text)
-            
-            # Update owned games
-            owned_games = additional_info.get('owned_games', [])
-            if owned_games:
-                games_text = "\n".join([f"• {g['name']} (ID: {g['id']}, Visits: {g['visits']:,}, Playing: {g['playing']})" 
-                                       for g in owned_games[:10]])
-                if len(owned_games) > 10:
-                    games_text += f"\n... and {len(owned_games) - 10} more"
-            else:
-                games_text = "None"
-            self.info_widgets['owned_games']['value'].config(text=games_text)
-            
-            # Update alt accounts
-            alt_accounts = additional_info.get('alt_accounts', [])
-            if alt_accounts:
-                alts_text = "\n".join([f"• {alt['username']} (ID: {alt['id']}, Score: {alt['score']}/10)" 
-                                      for alt in alt_accounts])
-                alts_text += "\n\nReasons:\n" + "\n".join([f"  - {alt['username']}: {', '.join(alt['reasons'][:2])}" 
-                                                          for alt in alt_accounts[:5]])
-            else:
-                alts_text = "None detected"
-            self.info_widgets['alt_accounts']['value'].config(text=alts_text)
-            
-            # Update links
-            user_id = user_info.get('id', 'N/A')
-            profile_url = f"https://www.roblox.com/users/{user_id}/profile"
-            avatar_url_link = f"https://www.roblox.com/users/{user_id}/avatar"
-            
-            self.info_widgets['profile_link']['value'].config(text=profile_url)
-            self.info_widgets['profile_link']['value'].bind("<Button-1>", lambda e: self._open_url(profile_url))
-            
-            self.info_widgets['avatar_link']['value'].config(text=avatar_url_link)
-            self.info_widgets['avatar_link']['value'].bind("<Button-1>", lambda e: self._open_url(avatar_url_link))
-            
-            self._update_status("✓ Information loaded successfully!")
-            
-        except Exception as e:
-            self._show_error(f"Error updating UI: {str(e)}")
-        finally:
-            self.search_button.config(state=tk.NORMAL)
+            return float(self.deadline_var.get())
+        except (ValueError, tk.TclError):
+            return DEFAULT_LOOKUP_DEADLINE
+    
+    def _new_profiler(self, name):
+        """Return a started StageProfiler if profiling is switched on, otherwise None"""
+        if not self.profile_lookups.get():
+            return None
+        detailed = bool(self.profile_output)
+        return StageProfiler(name, cprofile=detailed, trace_memory=detailed).start()
     
     def _open_url(self, url):
         """Open URL in default browser"""
         webbrowser.open(url)
     
     def format_date(self, date_string):
-        """Format ISO date string to readable format"""
+        """Format an epoch timestamp or ISO date string to readable format"""
         if not date_string:
             return "N/A"
         try:
-            dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+            if isinstance(date_string, (int, float)):
+                dt = datetime.fromtimestamp(date_string, tz=timezone.utc)
+            else:
+                dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
             return dt.strftime("%B %d, %Y at %I:%M %p")
         except:
             return date_string
-    
-    def use_current_game_id(self):
-        """Extract universe ID from current game and fill it in"""
-        current_game_text = self.info_widgets.get('current_game', {}).get('value', None)
-        if current_game_text:
-            text = current_game_text.cget('text')
-            # Extract universe ID from text like "Game Name (Universe: 123456)"
-            match = re.search(r'Universe:\s*(\d+)', text)
-            if match:
-                universe_id = match.group(1)
-                self.game_id_entry.delete(0, tk.END)
-                self.game_id_entry.insert(0, universe_id)
-                messagebox.showinfo("Success", f"Game ID set to {universe_id}")
+
+
+def run_benchmark(engine, args):
+    """Run lookups, server searches or sweeps without the GUI and print their timings"""
+    timings = []
+    for run in range(args.repeat):
+        profiler = None
+        if args.profile or args.profile_out:
+            profiler = StageProfiler(f"Run {run + 1}", cprofile=args.cprofile,
+                                     trace_memory=args.tracemalloc).start()
+        started = time.perf_counter()
+        if args.bench_lookup:
+            check_alts, skip = (lookup_profile_options(args.lookup_profile) if args.lookup_profile
+                                else (args.alts, ()))
+            
+            def lookup(username):
+                try:
+                    _, additional_info, _ = engine.lookup_user(
+                        username, check_alts=check_alts, deadline_seconds=args.deadline or DEFAULT_LOOKUP_DEADLINE,
+                        profiler=profiler, skip=skip)
+                    outcome = f"{len(additional_info.get('alt_accounts', []))} alt candidates"
+                    if additional_info['timed_out']:
+                        outcome += f", timed out: {', '.join(sorted(additional_info['timed_out']))}"
+                except LookupFailed as e:
+                    outcome = f"failed: {e}"
+                return outcome
+            
+            # Several names are looked up at once on the shared engine, like searches in separate tabs
+            usernames = args.bench_lookup.split(',')
+            if len(usernames) == 1:
+                outcome = lookup(usernames[0])
             else:
-                messagebox.showwarning("Warning", "Could not extract Universe ID from current game. Please enter it manually.")
+                with futures.ThreadPoolExecutor(max_workers=len(usernames)) as pool:
+                    outcomes = list(pool.map(lookup, usernames))
+                outcome = "; ".join(f"{username}: {result}" for username, result in zip(usernames, outcomes))
+        elif args.bench_sweep:
+            usernames, universe_ids = (value.split(',') for value in args.bench_sweep)
+            result_text, hits = engine.sweep_servers(usernames, universe_ids, profiler=profiler)
+            outcome = result_text.splitlines()[0]
+            for hit in hits:
+                print(f"  {hit['username']} in universe {hit['universe_id']}, server {hit['server_id']}")
         else:
-            messagebox.showwarning("Warning", "No current game information available. Please search for a user first.")
+            universe_id, username = args.bench_servers
+            result_text, server_rows = engine.search_servers(universe_id, username, profiler=profiler)
+            outcome = f"{len(server_rows)} servers listed, {result_text.splitlines()[0]}"
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        print(f"run {run + 1}: {elapsed * 1000:.1f} ms ({outcome})")
+        if profiler:
+            profiler.finish()
+            if args.profile:
+                print(profiler.report() if (args.cprofile or args.tracemalloc) else profiler.waterfall())
+            if args.profile_out:
+                with open(args.profile_out, 'a', encoding='utf-8') as profile_file:
+                    profile_file.write(profiler.report() + "\n\n")
+    if len(timings) > 1:
+        ordered = sorted(timings)
+        print(f"min {ordered[0] * 1000:.1f} ms, median {ordered[len(ordered) // 2] * 1000:.1f} ms, "
+              f"max {ordered[-1] * 1000:.1f} ms")
+
+
+# Defaults for batch runs (--batch)
+DEFAULT_BATCH_RATE_LIMIT = 10     # Roblox API requests per second, shared by all worker processes
+BATCH_LOOKUP_DEADLINE = 120       # rate limiting makes batch lookups slower than interactive ones
+BATCH_SKIPPED_STAGES = ('presence', 'avatar')
+BATCH_PROGRESS_INTERVAL = 5
+
+
+def _batch_part_paths(out_dir):
+    return sorted(os.path.join(out_dir, name) for name in os.listdir(out_dir)
+                  if name.startswith("part-") and name.endswith(".ndjson"))
+
+
+def read_batch_results(paths, repair=False):
+    """Read batch result files into {account: entry}; a complete result wins over a failed one.
     
-    def search_user_in_servers(self):
-        """Search for the current user in game servers"""
-        game_id = self.game_id_entry.get().strip()
-        if not game_id:
-            messagebox.showwarning("Warning", "Please enter a Game ID (Universe ID)")
-            return
-        
-        # Get the user ID from the last search
-        username = self.username_entry.get().strip()
-        if not username:
-            messagebox.showwarning("Warning", "Please search for a user first")
-            return
-        
-        # Disable button and show loading
-        self.search_servers_button.config(state=tk.DISABLED)
-        self.info_widgets['server_search_result']['value'].config(text="Searching servers... This may take a while...")
-        self.root.update()
-        
-        # Fetch in a separate thread
-        thread = threading.Thread(target=self._search_servers_thread, args=(game_id, username))
-        thread.daemon = True
-        thread.start()
+    A line cut off by a crash ends its file; with repair=True it is truncated away
+    so the file can be appended to again.
+    """
+    results = {}
+    for path in paths:
+        good = 0
+        with open(path, 'rb') as part:
+            for line in part:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                good += len(line)
+                account = entry['account'].lower()
+                if entry.get('ok') or not results.get(account, {}).get('ok'):
+                    results[account] = entry
+        if repair and good < os.path.getsize(path):
+            with open(path, 'r+b') as part:
+                part.truncate(good)
+    return results
+
+
+def merge_batch_results(paths, destination):
+    """Merge batch result files into one NDJSON file sorted by account; returns the account count"""
+    results = read_batch_results(paths)
+    temporary = destination + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as merged:
+        for account in sorted(results):
+            merged.write(json.dumps(results[account], separators=(',', ':')) + "\n")
+    os.replace(temporary, destination)
+    return len(results)
+
+
+def _batch_worker(index, accounts, options, limiter, stats):
+    """Look up one shard of a batch in its own process, appending each result to its part file.
     
-    def _search_servers_thread(self, game_id, username):
-        """Search servers in a separate thread"""
+    stats is shared with the parent: [looked up, failed, API requests, disk cache hits].
+    """
+    inner = ReplayTransport(options['replay']) if options['replay'] else HttpTransport()
+    transport = CachingTransport(inner, DiskCache(options['cache']), options['cache_max_age'])
+    client = RobloxApiClient(transport, hedging=not options['replay'], rate_limiter=limiter)
+    username_index = UsernameIndex(options['username_index']) if options['username_index'] else None
+    engine = LookupEngine(client, max_workers=options['threads'] * 6, username_index=username_index)
+    output_lock = threading.Lock()
+    reported = [0, 0]  # transport requests and hits already added to stats
+    
+    def run(account):
+        if os.getppid() != options['parent']:
+            return  # The runner died; stop instead of racing a resumed run
+        entry = {'account': account}
         try:
-            # Get user ID
-            user_id = self.get_user_id(username)
-            if not user_id:
-                self.root.after(0, lambda: self._update_server_result(f"Error: User '{username}' not found"))
-                return
-            
-            # Get game servers
-            self.root.after(0, lambda: self.info_widgets['server_search_result']['value'].config(
-                text="Fetching server list..."))
-            
-            servers = self.get_game_servers(game_id)
-            if not servers:
-                self.root.after(0, lambda: self._update_server_result("No servers found or error fetching servers"))
-                return
-            
-            total_servers = len(servers)
-            self.root.after(0, lambda: self.info_widgets['server_search_result']['value'].config(
-                text=f"Found {total_servers} servers. Checking player lists..."))
-            
-            # First, verify user is actually in this game using presence API
-            presence_info = self.check_user_presence_in_game(user_id, game_id)
-            user_in_game = presence_info and presence_info.get('in_game')
-            
-            if not user_in_game:
-                self.root.after(0, lambda: self._update_server_result(
-                    f"✗ User is not currently playing this game (Universe ID: {game_id})"))
-                return
-            
-            # Check each server for the user
-            found_servers = []
-            checked = 0
-            
-            for server in servers:
-                checked += 1
-                if checked % 5 == 0:
-                    self.root.after(0, lambda c=checked, t=total_servers: 
-                        self.info_widgets['server_search_result']['value'].config(
-                            text=f"Checked {c}/{t} servers..."))
-                
-                server_id = server.get('id')
-                server_token = server.get('token')  # Some APIs use token instead of id
-                
-                # Check if user is in this server using multiple methods
-                user_found = False
-                
-                # Method 1: Check playerTokens - these might be user IDs or session tokens
-                player_tokens = server.get('playerTokens', [])
-                if player_tokens:
-                    # playerTokens could be:
-                    # 1. Direct user IDs (as integers)
-                    # 2. Session tokens (strings) that need resolution
-                    # 3. User IDs as strings
-                    for token in player_tokens:
-                        try:
-                            # Try direct integer comparison
-                            if isinstance(token, int) and token == int(user_id):
-                                user_found = True
-                                break
-                            # Try string to int conversion
-                            elif isinstance(token, str) and token.isdigit():
-                                if int(token) == int(user_id):
-                                    user_found = True
-                                    break
-                            # Try as string comparison
-                            elif str(token) == str(user_id):
-                                user_found = True
-                                break
-                        except (ValueError, TypeError):
-                            # If token format is unexpected, try to resolve it
-                            resolved_id = self.resolve_player_token(token)
-                            if resolved_id and int(resolved_id) == int(user_id):
-                                user_found = True
-                                break
-                
-                # Method 2: Check if server data includes player list with user IDs
-                if not user_found:
-                    player_list = server.get('players', [])
-                    if player_list:
-                        for player in player_list:
-                            # Try different possible keys for user ID
-                            player_id = (player.get('id') or 
-                                       player.get('userId') or 
-                                       player.get('user_id') or
-                                       player.get('Id'))
-                            if player_id and str(player_id) == str(user_id):
-                                user_found = True
-                                break
-                
-                # Method 3: Try to get players from server endpoint
-                if not user_found and (server_id or server_token):
-                    players = self.get_server_players(server_id or server_token, game_id)
-                    if players:
-                        for player in players:
-                            # Handle both dict and direct ID formats
-                            if isinstance(player, dict):
-                                player_id = (player.get('id') or 
-                                           player.get('userId') or 
-                                           player.get('user_id') or
-                                           player.get('Id'))
-                            else:
-                                # If player is just an ID/token
-                                player_id = player
-                            
-                            if player_id and str(player_id) == str(user_id):
-                                user_found = True
-                                break
-                
-                # Method 4: Try to use game place endpoint to get player info
-                # Some games expose player data through their place page
-                if not user_found and (server_id or server_token):
-                    place_players = self.get_place_players(game_id, server_id or server_token)
-                    if place_players:
-                        for player in place_players:
-                            player_id = (player.get('id') or 
-                                       player.get('userId') or 
-                                       player.get('user_id'))
-                            if player_id and str(player_id) == str(user_id):
-                                user_found = True
-                                break
-                
-                if user_found:
-                    found_servers.append({
-                        'server_id': server_id or server_token or 'N/A',
-                        'player_count': server.get('playing', server.get('playerCount', 0)),
-                        'max_players': server.get('maxPlayers', server.get('maxPlayers', 'N/A')),
-                        'fps': server.get('fps', 'N/A'),
-                        'ping': server.get('ping', 'N/A')
-                    })
-            
-            # Update result
-            if found_servers:
-                result_text = f"✓ Found user in {len(found_servers)} server(s):\n\n"
-                for i, server in enumerate(found_servers, 1):
-                    result_text += f"Server {i}:\n"
-                    result_text += f"  • Server ID: {server['server_id']}\n"
-                    result_text += f"  • Players: {server['player_count']}/{server['max_players']}\n"
-                    result_text += f"  • FPS: {server['fps']}\n"
-                    result_text += f"  • Ping: {server['ping']}\n\n"
-            else:
-                # Alternative approach: If user is confirmed in game, show all servers as potential matches
-                if user_in_game and total_servers > 0:
-                    result_text = f"⚠ User is confirmed to be in this game (Universe ID: {game_id})\n"
-                    result_text += f"but Roblox API doesn't provide player lists for privacy reasons.\n\n"
-                    result_text += f"Found {total_servers} public server(s). User is likely in one of these:\n\n"
-                    
-                    for i, server in enumerate(servers[:10], 1):  # Show first 10 servers
-                        server_id = server.get('id') or server.get('token') or 'N/A'
-                        player_count = server.get('playing', server.get('playerCount', 0))
-                        max_players = server.get('maxPlayers', 'N/A')
-                        result_text += f"Server {i}:\n"
-                        result_text += f"  • Server ID: {server_id}\n"
-                        result_text += f"  • Players: {player_count}/{max_players}\n"
-                        if server.get('fps'):
-                            result_text += f"  • FPS: {server.get('fps')}\n"
-                        result_text += "\n"
-                    
-                    if total_servers > 10:
-                        result_text += f"... and {total_servers - 10} more servers\n\n"
-                    
-                    result_text += "Note: Due to API limitations, we cannot determine which exact server.\n"
-                    result_text += "The user is confirmed to be in this game and is likely in one of the above servers."
-                else:
-                    result_text = f"✗ User not found in any of the {total_servers} checked servers.\n\n"
-                    if user_in_game:
-                        result_text += f"Note: User is confirmed to be in this game (Universe ID: {game_id}), "
-                        result_text += "but could not be found in public server player lists.\n"
-                        result_text += "Possible reasons:\n"
-                        result_text += "  • User is in a private/VIP server\n"
-                        result_text += "  • Roblox API doesn't provide full player lists for privacy\n"
-                        result_text += "  • Server player data format differs from expected\n"
-                    else:
-                        result_text += "Note: The user might be in a private server, or the server list may be incomplete."
-            
-            self.root.after(0, lambda: self._update_server_result(result_text))
-            
+            user_info, additional_info, _ = engine.lookup_user(
+                account, check_alts=options['alts'], deadline_seconds=options['deadline'],
+                skip=BATCH_SKIPPED_STAGES)
+            entry['lookup'] = _encode_lookup(user_info, additional_info, None)
+            incomplete = sorted(additional_info['timed_out']) + sorted(additional_info['degraded'])
+            if additional_info['offline']:
+                incomplete.append('offline')
+            # Partial results are kept, but the account is looked up again on resume
+            entry['ok'] = not incomplete
+            if incomplete:
+                entry['error'] = f"incomplete: {', '.join(incomplete)}"
         except Exception as e:
-            self.root.after(0, lambda: self._update_server_result(f"Error: {str(e)}"))
-        finally:
-            self.root.after(0, lambda: self.search_servers_button.config(state=tk.NORMAL))
+            entry['ok'] = False
+            entry['error'] = str(e)
+        entry['at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        line = json.dumps(entry, separators=(',', ':')) + "\n"
+        with output_lock:
+            part.write(line)
+            part.flush()
+            requests_made, hits = transport.requests - reported[0], transport.hits - reported[1]
+            reported[0] += requests_made
+            reported[1] += hits
+        with stats.get_lock():
+            stats[0] += 1
+            stats[1] += 0 if entry['ok'] else 1
+            stats[2] += requests_made
+            stats[3] += hits
     
-    def _update_server_result(self, text):
-        """Update server search result"""
-        self.info_widgets['server_search_result']['value'].config(text=text)
+    path = os.path.join(options['out_dir'], f"part-{index:03d}.ndjson")
+    try:
+        with open(path, 'a', encoding='utf-8') as part:
+            with futures.ThreadPoolExecutor(max_workers=options['threads']) as pool:
+                list(pool.map(run, accounts))
+    except KeyboardInterrupt:
+        pass  # Everything written so far is kept; the parent tells the user how to resume
+    finally:
+        transport.close()
+
+
+def run_batch(args):
+    """Look up every account listed in a file across worker processes, resuming a previous run"""
+    accounts = []
+    seen = set()
+    with open(args.batch, encoding='utf-8') as listing:
+        for line in listing:
+            account = line.strip()
+            if account and not account.startswith('#') and account.lower() not in seen:
+                seen.add(account.lower())
+                accounts.append(account)
     
-    def get_game_servers(self, universe_id):
-        """Get list of public servers for a game"""
-        servers = []
-        try:
-            url = f"https://games.roblox.com/v1/games/{universe_id}/servers/Public"
-            params = {
-                "sortOrder": "Asc",
-                "limit": "100"  # Get up to 100 servers
-            }
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                servers = data.get('data', [])
-                # Debug: Print first server structure to understand data format
-                if servers and len(servers) > 0:
-                    print(f"DEBUG: First server structure keys: {servers[0].keys()}")
-                    print(f"DEBUG: First server playerTokens type: {type(servers[0].get('playerTokens'))}")
-        except Exception as e:
-            print(f"Error getting game servers: {e}")
-        return servers
+    out_dir = args.batch_out or os.path.splitext(args.batch)[0] + "-results"
+    os.makedirs(out_dir, exist_ok=True)
+    done = {account for account, entry in read_batch_results(_batch_part_paths(out_dir), repair=True).items()
+            if entry.get('ok')}
+    pending = [account for account in accounts if account.lower() not in done]
+    print(f"{len(accounts)} accounts: {len(accounts) - len(pending)} already done, {len(pending)} to look up")
     
-    def get_server_players(self, server_id, universe_id=None):
-        """Get list of players in a specific server"""
+    if pending:
+        workers = max(1, min(args.workers or os.cpu_count() or 1, len(pending)))
+        options = {
+            'out_dir': out_dir,
+            'cache': args.cache or os.path.join(out_dir, "cache.sqlite3"),
+            'cache_max_age': args.cache_max_age,
+            'replay': args.replay,
+            'alts': args.alts,
+            'deadline': args.deadline or BATCH_LOOKUP_DEADLINE,
+            'threads': args.batch_threads,
+            'parent': os.getpid(),
+            'username_index': _username_index_path(args),
+        }
+        DiskCache(options['cache']).close()  # create the table before the workers race to
+        limiter = SharedRateLimiter(args.rate_limit or DEFAULT_BATCH_RATE_LIMIT)
+        stats = multiprocessing.Array('q', 4)
+        processes = [multiprocessing.Process(target=_batch_worker, name=f"batch-{index}",
+                                             args=(index, pending[index::workers], options, limiter, stats))
+                     for index in range(workers)]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        
+        def progress():
+            elapsed = time.perf_counter() - started
+            return (f"{stats[0]}/{len(pending)} accounts ({stats[1]} failed) in {elapsed:.0f}s, "
+                    f"{stats[0] / elapsed:.1f} accounts/s, {stats[2] / elapsed:.1f} API requests/s, "
+                    f"{stats[3]} disk cache hits")
+        
         try:
-            # Try different possible endpoints
-            endpoints = []
-            if universe_id:
-                endpoints.append(f"https://games.roblox.com/v1/games/{universe_id}/servers/{server_id}")
-            endpoints.extend([
-                f"https://games.roblox.com/v1/games/servers/{server_id}",
-                f"https://games.roblox.com/v1/games/{server_id}/servers",
-            ])
-            
-            for url in endpoints:
-                try:
-                    response = requests.get(url, timeout=5)
-                    if response.status_code == 200:
-                        data = response.json()
-                        # Try different possible keys for player data
-                        players = (data.get('players') or 
-                                 data.get('data', {}).get('players') or
-                                 data.get('playerTokens') or
-                                 data.get('data', {}).get('playerTokens') or
-                                 [])
-                        if players:
-                            return players if isinstance(players, list) else []
-                except:
-                    continue
-        except Exception as e:
-            print(f"Error getting server players: {e}")
-        return None
+            while any(process.is_alive() for process in processes):
+                for process in processes:
+                    process.join(timeout=BATCH_PROGRESS_INTERVAL / workers)
+                print(progress())
+        except KeyboardInterrupt:
+            for process in processes:
+                process.join()
+            print(progress())
+            print("Interrupted; run the same command again to resume")
+            return
+        print(f"Done with {workers} worker process(es): {progress()}")
     
-    def resolve_player_token(self, token):
-        """Try to resolve a player token to a user ID"""
-        # Player tokens might already be user IDs, or we might need to resolve them
-        # For now, return the token as-is if it looks like a number
-        try:
-            if isinstance(token, (int, str)) and str(token).isdigit():
-                return int(token)
-        except:
-            pass
+    merged = os.path.join(out_dir, "results.ndjson")
+    count = merge_batch_results(_batch_part_paths(out_dir), merged)
+    print(f"Merged {count} accounts into {merged}")
+
+
+def _username_index_path(args):
+    """Index file to use, or None; replayed runs skip the default index so they stay reproducible"""
+    if args.no_username_index:
         return None
-    
-    def check_user_presence_in_game(self, user_id, universe_id):
-        """Check if user is currently in a specific game"""
-        try:
-            url = f"https://presence.roblox.com/v1/presence/users"
-            payload = {"userIds": [user_id]}
-            response = requests.post(url, json=payload, timeout=5)
-            if response.status_code == 200:
-                presence_data = response.json().get('userPresences', [])
-                if presence_data:
-                    presence = presence_data[0]
-                    # Check if user is in the game (universeId matches)
-                    if str(presence.get('universeId')) == str(universe_id):
-                        return {'in_game': True, 'presence': presence}
-        except Exception as e:
-            print(f"Error checking presence: {e}")
+    if args.username_index:
+        return args.username_index
+    if args.replay:
         return None
+    os.makedirs(os.path.dirname(DEFAULT_USERNAME_INDEX), exist_ok=True)
+    return DEFAULT_USERNAME_INDEX
+
+
+def run_index_benchmark(count, queries=200):
+    """Compare similar-username queries on the index with a SequenceMatcher scan over every name"""
+    import random
+    import tempfile
     
-    def get_place_players(self, universe_id, server_id):
-        """Try to get players from game place endpoint (alternative method)"""
+    rng = random.Random(1)
+    syllables = ["ka", "zo", "mi", "ra", "te", "lo", "nu", "shi", "bo", "xa", "ve", "qu", "dy", "pe", "gr", "ix"]
+    
+    def make_name():
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 5)))
+        if rng.random() < 0.3:
+            name = name.capitalize()
+        if rng.random() < 0.5:
+            name += rng.choice(["", "_", "x"]) + str(rng.randint(1, 9999))
+        return name
+    
+    names = [(user_id, make_name()) for user_id in range(1, count + 1)]
+    with tempfile.TemporaryDirectory() as directory:
+        index = UsernameIndex(os.path.join(directory, "index.sqlite3"))
+        started = time.perf_counter()
+        for start in range(0, count, 1000):
+            index.add(names[start:start + 1000])
+        build = time.perf_counter() - started
+        targets = [rng.choice(names)[1] for _ in range(queries)]
+        
+        started = time.perf_counter()
+        found = [index.similar(target, limit=1000) for target in targets]
+        indexed = (time.perf_counter() - started) / queries
+        
+        scan_queries = max(1, min(queries, 2000000 // count))
+        started = time.perf_counter()
+        recall = {0.6: [0, 0], 0.8: [0, 0]}  # similarity -> [found by the index, found by the scan]
+        for target, matches in zip(targets[:scan_queries], found):
+            target_lower, base = target.lower(), _username_base(target)
+            indexed_ids = {match.id for match in matches}
+            for user_id, name in names:
+                if name.lower() == target_lower:
+                    continue
+                same_base = _username_base(name) == base
+                similarity = difflib.SequenceMatcher(None, target_lower, name.lower()).ratio()
+                for threshold, counts in recall.items():
+                    if same_base or similarity >= threshold:
+                        counts[1] += 1
+                        counts[0] += user_id in indexed_ids
+        scanned = (time.perf_counter() - started) / scan_queries
+        index.close()
+    print(f"{count} usernames indexed in {build:.1f} s")
+    print(f"index query: {indexed * 1000:8.2f} ms, {sum(map(len, found)) / queries:.1f} matches on average")
+    print(f"full scan:   {scanned * 1000:8.2f} ms (over {scan_queries} queries)")
+    for threshold, (hits, total) in recall.items():
+        if total:
+            print(f"index found {hits / total:.0%} of the scan's matches with the same base or "
+                  f"similarity >= {threshold}")
+
+
+def run_rank_alts(engine, username):
+    """Print alt candidates ranked from the user index alone, without any API requests"""
+    found = engine.username_index.find(username) if engine.username_index else None
+    if not found:
+        print(f"'{username}' is not in the user index yet; look them up first")
+        return
+    user_id, created = found
+    ranked = engine.rank_alt_candidates(UserRecord(user_id, username, created=created), limit=50)
+    print(f"{len(engine.creation_index)} accounts with known creation dates; {len(ranked)} candidates")
+    for alt in ranked:
+        print(f"{alt.score:>3}  {alt.username} ({alt.id}): {', '.join(alt.reasons)}")
+
+
+def run_export(engine, username, kind, path, enrich=False):
+    """Stream a user's friends, followers or followings to a file, resuming an interrupted export"""
+    user_id = engine.get_user_id(username)
+    if not user_id:
+        print(f"User '{username}' not found")
+        return
+    export = ConnectionExport(engine, user_id, kind, path, enrich=enrich)
+    started = time.perf_counter()
+    last_report = [started]
+    
+    def progress(count, cursor):
+        now = time.perf_counter()
+        if now - last_report[0] >= BATCH_PROGRESS_INTERVAL:
+            last_report[0] = now
+            print(f"{count} {kind} written, {export.pages / (now - started):.1f} pages/s")
+    
+    try:
+        export.run(on_progress=progress)
+    except KeyboardInterrupt:
+        print(f"Interrupted after {export.count} {kind}; run the same command again to resume")
+        return
+    except Exception as e:
+        print(f"Export stopped after {export.count} {kind}: {e}; run the same command again to resume")
+        return
+    resumed = " (resumed)" if export.resumed else ""
+    print(f"Wrote {export.count} {kind} of {username} to {path}{resumed} in {time.perf_counter() - started:.1f} s")
+
+
+def run_history(engine, username):
+    """Print a user's recorded stats, one row per day, from the history store alone"""
+    found = engine.username_index.find(username) if engine.username_index else None
+    if not found:
+        print(f"'{username}' is not in the user index yet; look them up first")
+        return
+    user_id = found[0]
+    points = engine.stats_history(user_id)
+    print(f"{engine.history.points(user_id)} points recorded for {username} ({user_id}); "
+          f"last {HISTORY_DAYS} days by day:")
+    print(f"{'day':<10} {'friends':>8} {'followers':>10} {'following':>10} {'badges':>7} {'groups':>7}  status")
+    for point in points:
+        counts = [_format_optional_count(point.get(field)) for field in HISTORY_FIELDS[:-1]]
+        print(f"{_format_day(point.at):<10} {counts[0]:>8} {counts[1]:>10} {counts[2]:>10} {counts[3]:>7} "
+              f"{counts[4]:>7}  {point.presence or '–'}")
+
+
+def run_history_benchmark(count, queries=200):
+    """Time appends, range queries and downsampling on a StatsHistory holding count hourly points"""
+    import random
+    import tempfile
+    
+    rng = random.Random(1)
+    start = 1700000000
+    stats = [0, 0, 0, 0, 0]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.sqlite3")
+        history = StatsHistory(path)
+        started = time.perf_counter()
+        for index in range(count):
+            stats = [max(0, value + rng.choice((-1, 0, 0, 0, 1, 2))) for value in stats]
+            values = dict(zip(HISTORY_FIELDS, stats))
+            values['presence'] = rng.choice(('Offline', 'Online', 'InGame'))
+            history.record(1, values, at=start + index * 3600)
+        appended = (time.perf_counter() - started) / count
+        history.close()
+        size = os.path.getsize(path)
+        history = StatsHistory(path)
+        
+        def timed(query, runs):
+            started = time.perf_counter()
+            for _ in range(runs):
+                result = query()
+            return (time.perf_counter() - started) / runs, result
+        
+        end = start + count * 3600
+        full, (times, _) = timed(lambda: history.series(1, start, end), max(1, queries // 20))
+        weeks = [rng.randrange(start, max(start + 1, end - 7 * 86400)) for _ in range(queries)]
+        started = time.perf_counter()
+        for week_start in weeks:
+            history.series(1, week_start, week_start + 7 * 86400, ('followers',))
+        week = (time.perf_counter() - started) / queries
+        daily, points = timed(lambda: history.downsample(1, start, end, 86400), max(1, queries // 20))
+        history.close()
+    print(f"{count} points appended at {appended * 1000:.3f} ms each; file {size / 1024:.0f} KiB "
+          f"({size / count:.1f} bytes per point, including SQLite overhead)")
+    print(f"full range: {full * 1000:.2f} ms for {len(times)} points; "
+          f"one week of one stat: {week * 1000:.3f} ms; by day: {daily * 1000:.2f} ms for {len(points)} days")
+
+
+def run_created_benchmark(count, queries=1000):
+    """Compare creation-window queries on CreationDateIndex with a scan over (id, created) pairs"""
+    import random
+    
+    rng = random.Random(1)
+    users = [(user_id, rng.randrange(1150000000, 1760000000)) for user_id in range(1, count + 1)]
+    index = CreationDateIndex()
+    started = time.perf_counter()
+    for user_id, created in users:
+        index.add(user_id, created)
+    len(index)
+    build = time.perf_counter() - started
+    window = 30 * 86400
+    targets = [rng.choice(users)[1] for _ in range(queries)]
+    
+    started = time.perf_counter()
+    found = sum(len(index.between(created - window, created + window)) for created in targets)
+    indexed = (time.perf_counter() - started) / queries
+    scan_queries = max(1, min(queries, 20000000 // count))
+    started = time.perf_counter()
+    for created in targets[:scan_queries]:
+        [user_id for user_id, other in users if abs(other - created) <= window]
+    scanned = (time.perf_counter() - started) / scan_queries
+    
+    print(f"{count} accounts indexed in {build:.2f} s, "
+          f"{(index._times.itemsize + index._ids.itemsize)} bytes per account")
+    print(f"+-30 day window: {indexed * 1000:.3f} ms per query ({found / queries:.0f} accounts on average), "
+          f"scan {scanned * 1000:.1f} ms")
+
+
+def run_records_benchmark(count):
+    """Compare the memory used by count users held as raw JSON dicts versus records"""
+    import tracemalloc
+    
+    def sample(i):
+        return {
+            'id': 1000000 + i, 'name': f"user{i}", 'displayName': f"User {i}", 'description': "",
+            'created': "2019-05-04T12:30:00.123Z", 'isBanned': False, 'hasVerifiedBadge': False,
+        }
+    
+    def measure(build):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        held = build()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        stats = after.compare_to(before, 'filename')
+        size = sum(stat.size_diff for stat in stats)
+        blocks = sum(stat.count_diff for stat in stats)
+        del held
+        return size, blocks
+    
+    raw = [sample(i) for i in range(count)]
+    dict_size, dict_blocks = measure(lambda: [dict(data) for data in raw])
+    record_size, record_blocks = measure(lambda: [UserRecord.from_json(data) for data in raw])
+    print(f"{count} users as dicts:   {dict_size / count:7.1f} bytes/user, {dict_blocks / count:5.2f} blocks/user")
+    print(f"{count} users as records: {record_size / count:7.1f} bytes/user, {record_blocks / count:5.2f} blocks/user")
+
+
+def run_json_benchmark(count, chunk_size=65536):
+    """Compare decoding a list page of count items in one go with each JSON library against streaming it"""
+    import tracemalloc
+    
+    page = {
+        'previousPageCursor': None,
+        'data': [{'id': 1000000 + i, 'maxPlayers': 50, 'playing': 40, 'fps': 59.9, 'ping': 80,
+                  'playerTokens': [f"{i:08X}-{j:04X}-4A4A-8B8B-0123456789AB" for j in range(40)]}
+                 for i in range(count)],
+        'nextPageCursor': "eyJrZXkiOiJ2YWx1ZSJ9",
+    }
+    body = json.dumps(page, separators=(',', ':')).encode('utf-8')
+    chunks = [body[start:start + chunk_size] for start in range(0, len(body), chunk_size)]
+    print(f"{count} servers, {len(body) / 1024:.0f} KiB body in {len(chunks)} chunks of {chunk_size // 1024} KiB")
+    
+    def measure(consume):
+        # Timed without tracing, since tracemalloc slows allocation-heavy decoding down
+        started = time.perf_counter()
+        first = consume()
+        elapsed = time.perf_counter() - started
+        tracemalloc.start()
+        consume()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return first - started, elapsed, peak
+    
+    def full_decode(decoder):
+        def consume():
+            items = decoder.loads(b''.join(chunks))['data']
+            first = time.perf_counter()
+            for item in items:
+                pass
+            return first
+        return consume
+    
+    def streamed():
+        first = None
+        for item in JsonArrayStream(iter(chunks)):
+            if first is None:
+                first = time.perf_counter()
+        return first
+    
+    runs = []
+    for name in JSON_DECODERS:
         try:
-            # Try to get place ID from universe
-            url = f"https://games.roblox.com/v1/games?universeIds={universe_id}"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json().get('data', [])
-                if data:
-                    place_id = data[0].get('rootPlaceId')
-                    if place_id:
-                        # Try to get player info from place (this may not work due to privacy)
-                        place_url = f"https://www.roblox.com/games/{place_id}"
-                        # Note: This would require web scraping which violates ToS
-                        # So we'll skip this approach
-                        pass
-        except Exception as e:
-            print(f"Error getting place players: {e}")
-        return None
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        runs.append((f"full decode ({name})", full_decode(JsonDecoder(name))))
+    runs.append(("streamed", streamed))
+    for label, consume in runs:
+        first, elapsed, peak = measure(consume)
+        print(f"{label:<22} first item {first * 1000:7.1f} ms, total {elapsed * 1000:7.1f} ms, "
+              f"peak {peak / 1024:8.0f} KiB")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Roblox user lookup tool")
+    parser.add_argument("--startup-report", nargs='?', const='-', metavar="FILE",
+                        help="print startup timings, or append them to FILE")
+    parser.add_argument("--latency-report", action="store_true",
+                        help="print per-endpoint latency percentiles and hedging counts on exit")
+    parser.add_argument("--serve", nargs='?', const=str(DEFAULT_SERVICE_PORT), metavar="[HOST:]PORT",
+                        help="serve lookups over local HTTP instead of opening the GUI "
+                             f"(default port {DEFAULT_SERVICE_PORT})")
+    parser.add_argument("--backend", metavar="URL",
+                        help="run lookups on a lookup service (e.g. http://127.0.0.1:8765) instead of directly")
+    parser.add_argument("--rate-limit", type=float, metavar="N",
+                        help="send at most N Roblox API requests per second "
+                             f"(default: unlimited, or {DEFAULT_SERVICE_RATE_LIMIT} with --serve)")
+    parser.add_argument("--username-index", metavar="FILE",
+                        help=f"username similarity index used by alt detection (default {DEFAULT_USERNAME_INDEX}, "
+                             "not used with --replay unless given)")
+    parser.add_argument("--no-username-index", action="store_true",
+                        help="don't remember usernames or search them for alts")
+    parser.add_argument("--rank-alts", metavar="USERNAME",
+                        help="rank alt candidates for an already looked-up user from the user index alone, then exit")
+    parser.add_argument("--export", nargs=3, metavar=("USERNAME", "LIST", "FILE"),
+                        help=f"stream a user's {', '.join(CONNECTION_LISTS)} (LIST) to FILE as NDJSON, or CSV "
+                             "if FILE ends in .csv, resuming an interrupted export of the same list, then exit")
+    parser.add_argument("--export-enrich", action="store_true",
+                        help="fill in the names and verified badges of exported users with multi-ID users requests")
+    parser.add_argument("--history", metavar="USERNAME",
+                        help="print the social stats recorded by earlier lookups of a user, one row per day, then exit")
+    parser.add_argument("--bench-history", type=int, metavar="N",
+                        help="time appends and range queries on a stats history of N hourly points, then exit")
+    parser.add_argument("--bench-created", type=int, metavar="N",
+                        help="compare creation-window queries on the date index with a scan over N accounts, then exit")
+    parser.add_argument("--bench-index", type=int, metavar="N",
+                        help="compare index queries with a full scan over N synthetic usernames, then exit")
+    parser.add_argument("--no-hedging", action="store_true",
+                        help="never send hedged duplicate requests")
+    parser.add_argument("--record", metavar="CASSETTE",
+                        help="record every request and response to a cassette file")
+    parser.add_argument("--replay", metavar="CASSETTE",
+                        help="answer requests from a recorded cassette instead of the network")
+    parser.add_argument("--replay-speed", type=float, default=1.0, metavar="X",
+                        help="replay latencies scaled by 1/X (1 = original timing, 0 = as fast as possible)")
+    parser.add_argument("--bench-lookup", metavar="USERNAMES",
+                        help="look up a user without the GUI and print timings; "
+                             "several comma-separated names are looked up at once")
+    parser.add_argument("--bench-servers", nargs=2, metavar=("UNIVERSE_ID", "USERNAME"),
+                        help="search a game's servers for a user without the GUI and print timings")
+    parser.add_argument("--bench-sweep", nargs=2, metavar=("USERNAMES", "UNIVERSE_IDS"),
+                        help="search several games' servers (comma-separated IDs) for several users "
+                             "(comma-separated names) in one pass without the GUI and print hits and timings")
+    parser.add_argument("--alts", action="store_true", help="include alt detection in --bench-lookup")
+    parser.add_argument("--lookup-profile", choices=tuple(LOOKUP_PROFILES),
+                        help="sections --bench-lookup fetches (default: everything, with --alts for alt detection)")
+    parser.add_argument("--repeat", type=int, default=1, help="number of benchmark runs")
+    parser.add_argument("--deadline", type=float,
+                        help=f"lookup deadline in seconds (default {DEFAULT_LOOKUP_DEADLINE}, "
+                             f"or {BATCH_LOOKUP_DEADLINE} with --batch)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="look up every username listed in FILE (one per line) across worker processes")
+    parser.add_argument("--batch-out", metavar="DIR",
+                        help="where --batch writes its part files and merged results (default: FILE-results)")
+    parser.add_argument("--workers", type=int, help="worker processes for --batch (default: one per core)")
+    parser.add_argument("--batch-threads", type=int, default=4, help="concurrent lookups per worker process")
+    parser.add_argument("--cache", metavar="FILE",
+                        help="SQLite response cache shared by the --batch workers (default: DIR/cache.sqlite3)")
+    parser.add_argument("--cache-max-age", type=float, default=6 * 3600, metavar="SECONDS",
+                        help="how long cached responses are used without revalidating them")
+    parser.add_argument("--merge", nargs='+', metavar=("DEST", "SOURCE"),
+                        help="merge batch result directories or files into DEST, then exit")
+    parser.add_argument("--json-decoder", choices=('auto',) + JSON_DECODERS, default='auto',
+                        help="JSON library for response bodies (auto picks the fastest installed one)")
+    parser.add_argument("--bench-json", type=int, metavar="N",
+                        help="compare full and streamed decoding of a server list page with N servers, then exit")
+    parser.add_argument("--bench-records", type=int, metavar="N",
+                        help="compare memory per user for N users held as dicts versus records, then exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a per-stage timing waterfall for every benchmark run")
+    parser.add_argument("--cprofile", action="store_true", help="also capture cProfile stats when profiling")
+    parser.add_argument("--tracemalloc", action="store_true", help="also capture allocations when profiling")
+    parser.add_argument("--profile-out", metavar="FILE",
+                        help="append full profiling reports to FILE (in the GUI, profiled lookups then "
+                             "also capture cProfile and tracemalloc)")
+    args = parser.parse_args(argv)
     
-    def _show_error(self, message):
-        """Show error message"""
-        self._update_status("✗ Error occurred", is_warning=True)
-        self.search_button.config(state=tk.NORMAL)
-        messagebox.showerror("Error", message)
+    json_decoder.use(args.json_decoder)
+    if args.bench_json:
+        run_json_benchmark(args.bench_json)
+        return
+    if args.bench_records:
+        run_records_benchmark(args.bench_records)
+        return
+    if args.bench_index:
+        run_index_benchmark(args.bench_index)
+        return
+    if args.bench_created:
+        run_created_benchmark(args.bench_created)
+        return
+    if args.bench_history:
+        run_history_benchmark(args.bench_history)
+        return
+    if args.merge:
+        if len(args.merge) < 2:
+            parser.error("--merge needs a destination and at least one source")
+        sources = []
+        for source in args.merge[1:]:
+            sources.extend(_batch_part_paths(source) if os.path.isdir(source) else [source])
+        print(f"Merged {merge_batch_results(sources, args.merge[0])} accounts into {args.merge[0]}")
+        return
+    if args.batch:
+        if args.record or args.backend:
+            parser.error("--batch can't be combined with --record or --backend")
+        run_batch(args)
+        return
+    if args.record and args.replay:
+        parser.error("--record and --replay can't be combined")
+    if args.backend and (args.serve or args.record or args.replay):
+        parser.error("--backend can't be combined with --serve, --record or --replay")
+    if args.export and args.backend:
+        parser.error("--export can't be combined with --backend")
+    if args.export and args.export[1] not in CONNECTION_LISTS:
+        parser.error(f"--export LIST must be one of {', '.join(CONNECTION_LISTS)}")
+    if args.backend:
+        engine = RemoteLookupEngine(args.backend)
+        transport = engine.transport
+    else:
+        if args.replay:
+            transport = ReplayTransport(args.replay, speed=args.replay_speed or None)
+        elif args.record:
+            transport = RecordingTransport(HttpTransport(), args.record)
+        else:
+            transport = HttpTransport()
+        rate_limit = args.rate_limit or (DEFAULT_SERVICE_RATE_LIMIT if args.serve else None)
+        # Hedged duplicates would consume extra recordings during replay
+        client = RobloxApiClient(transport, hedging=not (args.no_hedging or args.replay),
+                                 rate_limiter=RateLimiter(rate_limit) if rate_limit else None)
+        index_path = _username_index_path(args)
+        # Room for many lookups at once: the service's clients or the GUI's tabs
+        engine = LookupEngine(client, max_workers=32,
+                              username_index=UsernameIndex(index_path) if index_path else None)
+    
+    try:
+        if args.rank_alts:
+            if not getattr(engine, 'username_index', None):
+                parser.error("--rank-alts needs the user index")
+            run_rank_alts(engine, args.rank_alts)
+        elif args.export:
+            run_export(engine, *args.export, enrich=args.export_enrich)
+        elif args.history:
+            if not getattr(engine, 'history', None):
+                parser.error("--history needs the user index")
+            run_history(engine, args.history)
+        elif args.serve:
+            host, _, port = args.serve.rpartition(':')
+            service = LookupService(engine, host or '127.0.0.1', int(port))
+            try:
+                service.serve_forever()
+            except KeyboardInterrupt:
+                print(f"Served {service.served} requests ({service.coalesced} shared an in-flight answer)")
+        elif args.bench_lookup or args.bench_servers or args.bench_sweep:
+            run_benchmark(engine, args)
+        else:
+            run_gui(engine, args)
+        if args.latency_report and engine.client:
+            print(engine.client.latency_report())
+        if args.replay:
+            print(f"Replay: {transport.hits} requests answered, {transport.misses} not in cassette")
+    finally:
+        transport.close()
 
 
-def main():
+def run_gui(engine, args):
+    startup_timer = StartupTimer(_IMPORT_STARTED)
+    startup_timer.mark("imports done")
     root = tk.Tk()
-    app = RobloxUserInfoApp(root)
+    startup_timer.mark("tk root created")
+    app = RobloxUserInfoApp(root, startup_timer=startup_timer, engine=engine, profile_output=args.profile_out)
+    
+    def on_interactive():
+        startup_timer.mark("window interactive")
+        if args.startup_report == '-':
+            print(startup_timer.report())
+        elif args.startup_report:
+            with open(args.startup_report, 'a', encoding='utf-8') as report_file:
+                report_file.write(startup_timer.summary_line() + "\n")
+    
+    # after_idle runs once the first frame has been drawn and the event loop is idle
+    root.after_idle(on_interactive)
     root.mainloop()
 
 
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# The app is a single module at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roblox_lookup import LookupEngine, RobloxApiClient
+from fake_transport import FakeTransport
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Path for a username index file in the test's temporary directory"""
+    return str(tmp_path / "usernames.sqlite3")
+
+
+@pytest.fixture
+def transport():
+    return FakeTransport()
+
+
+@pytest.fixture
+def engine(transport):
+    """Engine on the fake transport, without hedging so request counts are exact"""
+    return LookupEngine(RobloxApiClient(transport, hedging=False))
@@ -0,0 +1,87 @@
+"""Canned Roblox API answers, so tests run without the network"""
+import re
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import roblox_lookup
+from roblox_lookup import ApiResponse, ConnectionFailed
+
+
+def user_json(user_id, name=None):
+    return {'id': user_id, 'name': name or f'user{user_id}', 'displayName': f'User {user_id}', 'description': '',
+            'created': f'{2020 + user_id // 56}-01-{user_id % 28 + 1:02d}T00:00:00Z', 'isBanned': False, 'hasVerifiedBadge': False}
+
+
+class FakeTransport:
+    """Answers every endpoint the lookup uses with small fixed data.
+    
+    Every user named userN has the id N, and every user has the friends listed in
+    friends as (id, name) pairs, user2 to user29 unless a test changes them, and
+    followers followers (ids from 1000), paged by the offset as cursor. Requests
+    are counted per (method, endpoint template) in calls. Hosts in down raise
+    ConnectionFailed, statuses maps an endpoint template to a status to answer with,
+    and every answer takes latency seconds.
+    """
+    def __init__(self):
+        self.calls = Counter()
+        self.down = set()
+        self.statuses = {}
+        self.friends = [(user_id, f'user{user_id}') for user_id in range(2, 30)]
+        self.followers = 250
+        self.latency = 0
+        self._lock = threading.Lock()
+    
+    def request(self, method, url, params=None, json=None, headers=None, timeout=10, stream=False):
+        endpoint = roblox_lookup._endpoint_template(url)
+        with self._lock:
+            self.calls[(method, endpoint)] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if urlsplit(url).netloc in self.down:
+            raise ConnectionFailed(f"Could not reach {urlsplit(url).netloc}")
+        if endpoint in self.statuses:
+            return ApiResponse(url, self.statuses[endpoint], {}, b'{}')
+        
+        if 'usernames/users' in url:
+            body = {'data': [{'id': int(name[4:]), 'name': name, 'requestedUsername': name}
+                             for name in json['usernames'] if re.fullmatch(r'user\d+', name)]}
+        elif url.endswith('users.roblox.com/v1/users'):
+            names = dict(self.friends)
+            body = {'data': [user_json(user_id, names.get(user_id)) for user_id in json['userIds']]}
+        elif re.search(r'users\.roblox\.com/v1/users/\d+$', url):
+            user_id = int(url.rsplit('/', 1)[1])
+            body = user_json(user_id, dict(self.friends).get(user_id))
+        elif url.endswith('/count'):
+            body = {'count': 3}
+        elif 'groups/roles' in url:
+            body = {'data': [{'group': {'id': group_id, 'name': f'group{group_id}', 'memberCount': 10},
+                              'role': {'rank': 255 if group_id == 1 else 1}} for group_id in range(1, 4)]}
+        elif 'presence' in url:
+            body = {'userPresences': [{'userPresenceType': 0, 'lastLocation': 'Website'}]}
+        elif url.endswith('/followers'):
+            start, limit = int(params.get('cursor') or 0), int(params['limit'])
+            end = min(start + limit, self.followers)
+            body = {'data': [{'id': 1000 + index, 'name': f'user{1000 + index}'} for index in range(start, end)],
+                    'nextPageCursor': str(end) if end < self.followers else None}
+        elif '/friends' in url:
+            body = {'data': [{'id': user_id, 'name': name} for user_id, name in self.friends]}
+        elif 'v2/users' in url and 'games' in url:
+            body = {'data': [{'id': 5, 'name': 'game', 'rootPlace': {'id': 9}}]}
+        elif url.endswith('games.roblox.com/v1/games'):
+            body = {'data': [{'id': 5, 'playing': 1, 'visits': 100}]}
+        elif 'thumbnails' in url:
+            body = {'data': [{'targetId': 1, 'imageUrl': 'https://tr.rbxcdn.com/abc/150/150/Avatar/Png'}]}
+        elif 'rbxcdn' in url:
+            return ApiResponse(url, 200, {'Content-Type': 'image/png'}, b'\x89PNG')
+        else:
+            return ApiResponse(url, 404, {}, b'{}')
+        return ApiResponse(url, 200, {'Content-Type': 'application/json'}, roblox_lookup.json.dumps(body).encode())
+    
+    def requests_to(self, fragment):
+        """How many requests went to endpoints containing fragment"""
+        return sum(count for (_, endpoint), count in self.calls.items() if fragment in endpoint)
+    
+    def close(self):
+        pass
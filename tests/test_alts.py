@@ -0,0 +1,45 @@
+from roblox_lookup import ALT_SCORE_THRESHOLD, GroupMembershipIndex, GroupRecord, UsernameIndex
+
+
+def test_group_overlap_weighs_small_groups_more(index_path):
+    groups = GroupMembershipIndex(UsernameIndex(index_path))
+    small, huge = GroupRecord(1, 'small', 5), GroupRecord(2, 'huge', 10 ** 6)
+    groups.set_memberships(10, [small, huge])
+    groups.set_memberships(11, [small])
+    groups.set_memberships(12, [huge])
+    small_weight, shared = groups.overlap(10, 11)
+    huge_weight, _ = groups.overlap(10, 12)
+    assert shared == {1} and small_weight > 3 * huge_weight
+    assert groups.co_members(10) == {11: small_weight}
+    reloaded = GroupMembershipIndex(UsernameIndex(index_path))
+    assert reloaded.fresh_groups(10, 60) == {1, 2}
+    assert reloaded.overlap(10, 11) == (small_weight, {1})
+
+
+def test_alt_candidates_come_from_one_users_request(engine, transport):
+    user_info = engine.get_user_info(1)
+    transport.calls.clear()
+    alts = engine.detect_alt_accounts(1, user_info)
+    assert alts and alts[0].score >= alts[-1].score >= ALT_SCORE_THRESHOLD
+    assert transport.requests_to('users.roblox.com/v1/users/{id}') == 0
+    assert transport.calls[('POST', 'users.roblox.com/v1/users')] == 1
+
+
+def test_alt_check_skips_candidate_groups_when_user_has_none(engine, transport):
+    transport.statuses['groups.roblox.com/v1/users/{id}/groups/roles'] = 200  # an empty body, so no groups
+    user_info = engine.get_user_info(1)
+    transport.calls.clear()
+    engine.detect_alt_accounts(1, user_info)
+    assert transport.requests_to('groups/roles') == 1
+
+
+def test_alt_check_fetches_profiles_and_groups_only_where_they_could_decide(engine, transport):
+    # 40 needs its creation date and groups, 41 its creation date, 42 matches on its name alone
+    # and 70 was created a year apart, so shared groups can't lift it to the threshold
+    transport.friends = [(40, 'qwerty'), (41, 'user1_alt'), (42, 'user1_'), (70, 'zzz')]
+    user_info = engine.get_user_info(1)
+    transport.calls.clear()
+    alts = engine.detect_alt_accounts(1, user_info)
+    assert {alt.id for alt in alts} == {40, 41, 42}
+    assert transport.requests_to('users.roblox.com/v1/users/{id}') == 3
+    assert transport.requests_to('groups/roles') == 2
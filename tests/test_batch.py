@@ -0,0 +1,78 @@
+import argparse
+import json
+import os
+
+from roblox_lookup import (BATCH_SKIPPED_STAGES, LookupEngine, RecordingTransport, RobloxApiClient,
+                           merge_batch_results, read_batch_results, run_batch)
+from fake_transport import FakeTransport
+
+
+def record_cassette(path, accounts):
+    """Record the requests a batch makes for accounts, for the workers to replay"""
+    transport = RecordingTransport(FakeTransport(), path)
+    engine = LookupEngine(RobloxApiClient(transport, hedging=False))
+    for account in accounts:
+        engine.lookup_user(account, skip=BATCH_SKIPPED_STAGES)
+    transport.close()
+
+
+def batch_args(tmp_path, accounts, cassette):
+    listing = tmp_path / "accounts.txt"
+    listing.write_text("# accounts\n" + "\n".join(accounts) + "\n", encoding='utf-8')
+    return argparse.Namespace(batch=str(listing), batch_out=str(tmp_path / "out"), workers=1, batch_threads=2,
+                              cache=None, cache_max_age=3600, replay=cassette, alts=False, deadline=None,
+                              rate_limit=1000, username_index=None, no_username_index=True)
+
+
+def write_part(path, entries, tail=""):
+    with open(path, 'w', encoding='utf-8') as part:
+        for entry in entries:
+            part.write(json.dumps(entry) + "\n")
+        part.write(tail)
+
+
+def test_read_batch_results_prefers_complete_entries_and_repairs_cut_lines(tmp_path):
+    path = str(tmp_path / "part-000.ndjson")
+    write_part(path, [{'account': 'User2', 'ok': True}, {'account': 'user2', 'ok': False},
+                      {'account': 'user3', 'ok': False}], tail='{"account": "us')
+    results = read_batch_results([path])
+    assert results['user2']['ok'] and not results['user3']['ok']
+    size = os.path.getsize(path)
+    read_batch_results([path], repair=True)
+    assert os.path.getsize(path) < size
+    with open(path, encoding='utf-8') as part:
+        assert part.read().endswith("}\n")
+
+
+def test_merge_keeps_one_entry_per_account_sorted(tmp_path):
+    first, second = str(tmp_path / "part-000.ndjson"), str(tmp_path / "part-001.ndjson")
+    write_part(first, [{'account': 'user3', 'ok': True}, {'account': 'user2', 'ok': False}])
+    write_part(second, [{'account': 'User2', 'ok': True}])
+    destination = str(tmp_path / "results.ndjson")
+    assert merge_batch_results([first, second], destination) == 2
+    with open(destination, encoding='utf-8') as merged:
+        assert [json.loads(line) for line in merged] == [{'account': 'User2', 'ok': True},
+                                                         {'account': 'user3', 'ok': True}]
+
+
+def test_batch_resumes_only_unfinished_accounts(tmp_path):
+    cassette = str(tmp_path / "batch.jsonl.gz")
+    record_cassette(cassette, ['user3', 'user4'])
+    args = batch_args(tmp_path, ['user2', 'user3', 'user4'], cassette)
+    os.makedirs(args.batch_out)
+    # A previous run finished user2, failed user3 and was killed while writing user4
+    done = {'account': 'user2', 'ok': True, 'lookup': {'user': {'id': 2}}}
+    write_part(os.path.join(args.batch_out, "part-000.ndjson"), [done, {'account': 'user3', 'ok': False}],
+               tail='{"account": "user4", "ok"')
+    
+    run_batch(args)
+    
+    with open(os.path.join(args.batch_out, "results.ndjson"), encoding='utf-8') as merged:
+        results = {entry['account']: entry for entry in map(json.loads, merged)}
+    assert sorted(results) == ['user2', 'user3', 'user4']
+    assert results['user2'] == done
+    assert results['user3']['ok'] and results['user3']['lookup']['user']['id'] == 3
+    assert results['user4']['ok'] and results['user4']['lookup']['user']['id'] == 4
+    with open(os.path.join(args.batch_out, "part-000.ndjson"), encoding='utf-8') as part:
+        written = [json.loads(line)['account'] for line in part]
+    assert written[:2] == ['user2', 'user3'] and sorted(written[2:]) == ['user3', 'user4']
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+import roblox_lookup
+from roblox_lookup import CircuitBreaker, CircuitOpenError, RobloxApiClient
+from fake_transport import FakeTransport
+
+
+def test_breaker_opens_after_threshold_failures():
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_allows_one_trial_then_closes():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_half_open_failure_reopens():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_release_gives_back_trial():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_client_opens_circuit_on_server_errors_only():
+    transport = FakeTransport()
+    client = RobloxApiClient(transport, hedging=False)
+    transport.statuses['users.roblox.com/v1/users/{id}'] = 404
+    for user_id in range(10):
+        client.get(f"https://users.roblox.com/v1/users/{user_id}")
+    assert client.breaker("https://users.roblox.com/v1/users/1").state == CircuitBreaker.CLOSED
+    
+    transport.statuses['users.roblox.com/v1/users/{id}'] = 503
+    for user_id in range(roblox_lookup.CIRCUIT_FAILURE_THRESHOLD):
+        client.get(f"https://users.roblox.com/v1/users/{user_id}")
+    sent = transport.requests_to('v1/users/{id}')
+    with pytest.raises(CircuitOpenError):
+        client.get("https://users.roblox.com/v1/users/1")
+    assert transport.requests_to('v1/users/{id}') == sent
+
+
+def test_rate_limited_responses_do_not_open_the_circuit():
+    transport = FakeTransport()
+    client = RobloxApiClient(transport, hedging=False)
+    transport.statuses['friends.roblox.com/v1/users/{id}/friends/count'] = 429
+    for _ in range(roblox_lookup.CIRCUIT_FAILURE_THRESHOLD + 1):
+        assert client.get("https://friends.roblox.com/v1/users/1/friends/count").status_code == 429
+    assert client.breaker("https://friends.roblox.com/v1/users/1/friends/count").state == CircuitBreaker.CLOSED
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from roblox_lookup import (LookupEngine, LookupFailed, RecordingTransport, ReplayTransport, RobloxApiClient,
+                           TransportError)
+from fake_transport import FakeTransport
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    return str(tmp_path / "lookup.jsonl.gz")
+
+
+def record(path, transport, *urls):
+    recorder = RecordingTransport(transport, path)
+    for url in urls:
+        try:
+            recorder.request('GET', url)
+        except Exception:
+            pass
+    recorder.close()
+
+
+def test_replayed_lookup_matches_the_recorded_one(cassette):
+    recorder = RecordingTransport(FakeTransport(), cassette)
+    recorded = LookupEngine(RobloxApiClient(recorder, hedging=False)).lookup_user('user1', check_alts=True)
+    recorder.close()
+    
+    replay = ReplayTransport(cassette)
+    user_info, additional_info, avatar = LookupEngine(RobloxApiClient(replay)).lookup_user('user1', check_alts=True)
+    assert replay.misses == 0 and replay.hits > 0
+    assert user_info == recorded[0] and user_info.name == 'user1'
+    for field in ('social', 'presence', 'groups_count', 'owned_groups', 'owned_games', 'alt_accounts', 'timed_out'):
+        assert additional_info[field] == recorded[1][field], field
+    assert additional_info['social'].complete and additional_info['alt_accounts']
+    assert avatar == recorded[2]
+
+
+def test_unrecorded_requests_fail_and_count_as_misses(cassette):
+    record(cassette, FakeTransport(), "https://users.roblox.com/v1/users/1")
+    replay = ReplayTransport(cassette)
+    engine = LookupEngine(RobloxApiClient(replay, hedging=False))
+    with pytest.raises(LookupFailed):
+        engine.lookup_user('user1')
+    assert replay.misses == 1 and replay.hits == 0
+    with pytest.raises(TransportError):
+        replay.request('GET', "https://users.roblox.com/v1/users/2")
+    assert replay.request('GET', "https://users.roblox.com/v1/users/1").status_code == 200
+    assert (replay.hits, replay.misses) == (1, 2)
+
+
+def test_repeated_requests_replay_in_order_then_reuse_the_last(cassette):
+    transport = FakeTransport()
+    url = "https://users.roblox.com/v1/users/1"
+    recorder = RecordingTransport(transport, cassette)
+    recorder.request('GET', url)
+    transport.statuses['users.roblox.com/v1/users/{id}'] = 503
+    recorder.request('GET', url)
+    recorder.close()
+    replay = ReplayTransport(cassette)
+    assert [replay.request('GET', url).status_code for _ in range(3)] == [200, 503, 503]
+
+
+def test_recorded_connection_errors_are_replayed(cassette):
+    transport = FakeTransport()
+    transport.down.add('users.roblox.com')
+    record(cassette, transport, "https://users.roblox.com/v1/users/1")
+    with pytest.raises(TransportError, match="ConnectionFailed"):
+        ReplayTransport(cassette).request('GET', "https://users.roblox.com/v1/users/1")
+
+
+def test_replay_speed_scales_recorded_latency(cassette):
+    transport = FakeTransport()
+    transport.latency = 0.2
+    url = "https://users.roblox.com/v1/users/1"
+    record(cassette, transport, url)
+    
+    def replay_time(speed, timeout=10):
+        started = time.perf_counter()
+        ReplayTransport(cassette, speed=speed).request('GET', url, timeout=timeout)
+        return time.perf_counter() - started
+    
+    assert replay_time(None) < 0.05
+    assert 0.08 <= replay_time(2.0) < 0.19
+    assert replay_time(1.0) >= 0.19
+    with pytest.raises(TransportError, match="timeout"):
+        replay_time(1.0, timeout=0.05)
@@ -0,0 +1,28 @@
+from roblox_lookup import Deadline
+
+
+def test_deadline_share_is_capped_by_parent():
+    deadline = Deadline(10)
+    share = deadline.share(0.5)
+    assert 4 < share.remaining() <= 5
+    assert share.parent is deadline
+    assert not share.expired()
+
+
+def test_deadline_cancel_expires_every_share():
+    deadline = Deadline(10)
+    share = deadline.share(0.9)
+    nested = share.share(0.5)
+    deadline.cancel()
+    assert deadline.expired()
+    assert share.expired()
+    assert nested.expired()
+    assert nested.remaining() == 0
+
+
+def test_cancelling_a_share_leaves_the_parent_running():
+    deadline = Deadline(10)
+    share = deadline.share(0.5)
+    share.cancel()
+    assert share.expired()
+    assert not deadline.expired()
@@ -0,0 +1,71 @@
+import csv
+import json
+import os
+import threading
+
+from roblox_lookup import ConnectionExport
+
+
+def exported_ids(path):
+    with open(path, encoding='utf-8') as output:
+        if path.endswith('.csv'):
+            return [int(row['id']) for row in csv.DictReader(output)]
+        return [json.loads(line)['id'] for line in output]
+
+
+def stop_after_pages(pages):
+    """A stop event and an on_progress callback that sets it once pages have been written"""
+    stop = threading.Event()
+    
+    def on_progress(count, cursor):
+        if count >= pages * 100:
+            stop.set()
+    
+    return stop, on_progress
+
+
+def test_export_writes_every_page(engine, tmp_path):
+    path = str(tmp_path / "followers.ndjson")
+    export = ConnectionExport(engine, 1, 'followers', path)
+    assert export.run() == 250
+    assert exported_ids(path) == list(range(1000, 1250))
+    assert export.finished and export.pages == 3
+    assert not os.path.exists(export.state_path)
+
+
+def test_stopped_export_resumes_from_saved_cursor(engine, transport, tmp_path):
+    path = str(tmp_path / "followers.ndjson")
+    stop, on_progress = stop_after_pages(1)
+    first = ConnectionExport(engine, 1, 'followers', path)
+    assert first.run(on_progress, stop) == 100
+    assert not first.finished and os.path.exists(first.state_path)
+    
+    transport.calls.clear()
+    resumed = ConnectionExport(engine, 1, 'followers', path)
+    assert resumed.run() == 250
+    assert resumed.resumed and resumed.finished and resumed.pages == 2
+    assert transport.requests_to('/followers') == 2
+    assert exported_ids(path) == list(range(1000, 1250))
+
+
+def test_resume_cuts_off_rows_written_after_the_last_saved_cursor(engine, tmp_path):
+    path = str(tmp_path / "followers.csv")
+    stop, on_progress = stop_after_pages(2)
+    ConnectionExport(engine, 1, 'followers', path).run(on_progress, stop)
+    # A crash after a page was partly written but before its cursor was saved
+    with open(path, 'a', encoding='utf-8') as output:
+        output.write("1200,user1200,,False\n1201,us")
+    
+    assert ConnectionExport(engine, 1, 'followers', path).run() == 250
+    assert exported_ids(path) == list(range(1000, 1250))
+    with open(path, encoding='utf-8') as output:
+        assert output.read().count('id,name') == 1
+
+
+def test_state_of_another_export_is_ignored(engine, tmp_path):
+    path = str(tmp_path / "followers.ndjson")
+    stop, on_progress = stop_after_pages(1)
+    ConnectionExport(engine, 1, 'followers', path).run(on_progress, stop)
+    other = ConnectionExport(engine, 2, 'followers', path)
+    assert other.run() == 250 and not other.resumed
+    assert exported_ids(path) == list(range(1000, 1250))
@@ -0,0 +1,40 @@
+import pytest
+
+from roblox_lookup import HISTORY_BLOCK_SIZE, StatsHistory, _decode_deltas, _encode_deltas
+
+
+@pytest.mark.parametrize("values", [
+    [],
+    [0],
+    [5, 5, 5],
+    [1700000000, 1700086400, 1700172800],
+    [3, -1, 120, -1, 2 ** 40, 0],
+])
+def test_deltas_round_trip(values):
+    assert list(_decode_deltas(_encode_deltas(values))) == values
+
+
+def test_deltas_pack_small_steps_into_one_byte_each():
+    assert len(_encode_deltas([1000 + step for step in range(50)])) == 2 + 49
+
+
+def test_history_round_trip_across_packed_blocks(index_path):
+    history = StatsHistory(index_path)
+    start = 1700000000
+    count = HISTORY_BLOCK_SIZE + 10
+    for point in range(count):
+        history.record(7, {'friends': 100 + point, 'followers': None if point % 3 else point,
+                           'presence': 'Online' if point % 2 else 'Offline'}, at=start + point * 3600)
+    assert history.points(7) == count
+    times, columns = history.series(7, start, start + count * 3600)
+    assert times == [start + point * 3600 for point in range(count)]
+    assert columns['friends'] == [100 + point for point in range(count)]
+    assert columns['followers'] == [None if point % 3 else point for point in range(count)]
+    assert columns['presence'][:2] == ['Offline', 'Online']
+    assert columns['badges'] == [None] * count
+
+
+def test_history_reports_changes_since_last_point(index_path):
+    history = StatsHistory(index_path)
+    assert history.record(1, {'friends': 10}, at=1000) == {}
+    assert history.record(1, {'friends': 12, 'badges': 3}, at=2000) == {'friends': (10, 12, 1000)}
@@ -0,0 +1,27 @@
+import pytest
+
+from roblox_lookup import ConnectionFailed, OfflineError, RobloxApiClient
+from fake_transport import FakeTransport
+
+
+def test_one_unreachable_host_does_not_go_offline():
+    transport = FakeTransport()
+    transport.down.add('presence.roblox.com')
+    client = RobloxApiClient(transport, hedging=False)
+    with pytest.raises(ConnectionFailed):
+        client.post("https://presence.roblox.com/v1/presence/users", json={'userIds': [1]})
+    assert client.online
+    assert client.get("https://users.roblox.com/v1/users/1").status_code == 200
+
+
+def test_no_network_goes_offline_and_fails_fast():
+    transport = FakeTransport()
+    transport.down.update(('users.roblox.com', 'friends.roblox.com'))
+    client = RobloxApiClient(transport, hedging=False)
+    with pytest.raises(ConnectionFailed):
+        client.get("https://users.roblox.com/v1/users/1")
+    assert not client.online
+    sent = sum(transport.calls.values())
+    with pytest.raises(OfflineError):
+        client.get("https://friends.roblox.com/v1/users/1/friends/count")
+    assert sum(transport.calls.values()) == sent
@@ -0,0 +1,14 @@
+from roblox_lookup import UsernameIndex, UsernamePrefixIndex
+
+
+def test_prefix_index_completes_from_username_index(index_path):
+    index = UsernameIndex(index_path)
+    index.add([(1, 'Builder'), (2, 'builderman'), (3, 'Bloxy'), (4, 'Guest')])
+    prefixes = UsernamePrefixIndex(index)
+    assert prefixes.complete('bu') == ['Builder', 'builderman']
+    assert prefixes.complete('BUILDERM') == ['builderman']
+    assert prefixes.complete('b', limit=1) == ['Bloxy']
+    assert prefixes.complete('') == []
+    prefixes.add(['BuilderMan', 'Bubble'])
+    assert prefixes.complete('bu') == ['Bubble', 'Builder', 'BuilderMan']
+    assert len(prefixes) == 5
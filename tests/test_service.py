@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from roblox_lookup import SERVICE_MAX_DEADLINE, LookupService, _decode_lookup, _encode_lookup
+
+
+@pytest.fixture
+def service(engine):
+    return LookupService(engine)
+
+
+def test_encoded_lookup_round_trips_through_json(engine):
+    user_info, additional_info, avatar = engine.lookup_user('user1', check_alts=True)
+    payload = json.loads(json.dumps(_encode_lookup(user_info, additional_info, avatar)))
+    decoded_user, decoded_info, decoded_avatar = _decode_lookup(payload)
+    assert decoded_user == user_info
+    for field in ('social', 'presence', 'groups_count', 'owned_groups', 'alt_accounts', 'timed_out', 'skipped',
+                  'degraded', 'stale', 'offline'):
+        assert decoded_info[field] == additional_info[field], field
+    assert list(decoded_info['owned_games']) == list(additional_info['owned_games'])
+    assert decoded_info['owned_games'].next_cursor == additional_info['owned_games'].next_cursor
+    assert decoded_avatar == avatar
+
+
+def test_service_answers_the_wire_format(service):
+    status, payload = service.handle("/user/user1?deadline=5&skip=games")
+    user_info, additional_info, _ = _decode_lookup(json.loads(json.dumps(payload)))
+    assert status == 200 and user_info.name == 'user1'
+    assert additional_info['skipped'] == {'games', 'alt_accounts'}
+    assert service.handle("/user/nobody")[0] == 404
+
+
+@pytest.mark.parametrize("deadline", ['nan', 'inf', '-inf', '-1', '0', 'soon'])
+def test_rejects_deadlines_that_are_not_positive_numbers(service, deadline):
+    status, payload = service.handle(f"/user/user1?deadline={deadline}")
+    assert status == 400 and 'deadline' in payload['error']
+
+
+def test_caps_long_deadlines(service):
+    asked = []
+    lookup_user = service.engine.lookup_user
+    
+    def recording_lookup(*args, **kwargs):
+        asked.append(kwargs['deadline_seconds'])
+        return lookup_user(*args, **kwargs)
+    
+    service.engine.lookup_user = recording_lookup
+    status, payload = service.handle("/user/user1?deadline=1e9")
+    assert status == 200 and payload['user']['id'] == 1
+    assert asked == [SERVICE_MAX_DEADLINE]
@@ -0,0 +1,34 @@
+from roblox_lookup import UsernameIndex
+
+
+def test_similar_finds_variations_through_minhash_buckets(index_path):
+    index = UsernameIndex(index_path)
+    index.add([(1, 'DragonSlayer'), (2, 'DragonSlayer_99'), (3, 'dragonslayerr'), (4, 'PizzaTime')])
+    found = index.similar('DragonSlayer')
+    assert [match.id for match in found][:1] == [2]
+    assert {match.id for match in found} == {2, 3}
+    assert found[0].same_base
+    assert index.similar('DragonSlayer', exclude={2, 3}) == []
+
+
+def test_index_find_and_rename(index_path):
+    index = UsernameIndex(index_path)
+    index.add([(1, 'OldName')])
+    index.set_created([(1, 1600000000)])
+    assert index.find('oldname') == (1, 1600000000)
+    index.add([(1, 'NewName')])
+    assert index.find('OldName') is None
+    assert index.find('newname') == (1, 1600000000)
+    assert [match.id for match in index.similar('NewName1')] == [1]
+    assert index.similar('OldName1') == []
+
+
+def test_rename_from_name_without_letters(index_path):
+    index = UsernameIndex(index_path)
+    index.add([(1, '12345'), (2, '___')])
+    index.add([(1, 'NewName'), (2, 'OtherName')])
+    assert index.find('newname') == (1, None)
+    assert index.find('12345') is None
+    assert [match.id for match in index.similar('NewName1')] == [1]
+    index.add([(1, '999')])
+    assert index.similar('NewName1') == []